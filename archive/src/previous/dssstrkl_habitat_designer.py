@@ -10,6 +10,7 @@ bl_info = {
 
 import bpy
 import bmesh
+import numpy as np
 import mathutils
 from mathutils import Vector, noise
 import math
@@ -282,19 +283,98 @@ class ClanTerritoryManager:
 
 # ===== OPTIMIZED HEIGHTMAP GENERATION =====
 
+# Layer arrays shared between generator instances, keyed by every input that
+# shaped them - regenerating with one changed slider only rebuilds the layers
+# downstream of it. Bounded by bytes: one float64 layer is 32 MiB at 2048x2048
+LAYER_CACHE_BYTES = 256 * 1024 * 1024
+_layer_cache = {}
+
+def clear_layer_cache():
+    """Drop every cached layer (resolution change, unregister)"""
+    _layer_cache.clear()
+
 class LayeredHeightmapGenerator:
-    """Multi-layered heightmap generation with clan territories and cult infiltration"""
+    """Multi-layered heightmap generation with clan territories and cult infiltration
+
+    The first run at a resolution pays for the per-pixel mathutils noise loop in
+    noise_field (about 3 s at 2048x2048); later runs reuse the cached layers.
+    """
     
     def __init__(self, properties):
         self.props = properties
         self.resolution = int(properties.heightmap_generation.resolution)
+        # Layers of another resolution can never be hit again - free them now
+        if any(layer.shape[0] != self.resolution for layer in _layer_cache.values()):
+            clear_layer_cache()
         self.clan_manager = ClanTerritoryManager(
             properties.dssstrkl_adaptation.clan_territories,
             properties.cylinder_length
         )
+        
+        # Normalised coordinates shared by every layer: nx along columns, ny along rows
+        size = self.resolution
+        self.coords = (np.arange(size) / size) * 2 - 1
+        self.ny, self.nx = np.meshgrid(self.coords, self.coords, indexing='ij')
+        self.layer_keys = {}
+        
         print(f"Initializing layered heightmap generator with {self.resolution}x{self.resolution} resolution")
         print(f"Managing {properties.dssstrkl_adaptation.clan_territories} clan territories")
         
+    def cached_layer(self, key, build):
+        """Return the cached read-only array for key, building it on a miss
+
+        Oldest layers are evicted first once the cache exceeds LAYER_CACHE_BYTES.
+        """
+        layer = _layer_cache.get(key)
+        if layer is None:
+            layer = build()
+            layer.setflags(write=False)
+            cached_bytes = sum(cached.nbytes for cached in _layer_cache.values())
+            while _layer_cache and cached_bytes + layer.nbytes > LAYER_CACHE_BYTES:
+                cached_bytes -= _layer_cache.pop(next(iter(_layer_cache))).nbytes
+            _layer_cache[key] = layer
+        self.layer_keys[id(layer)] = key
+        return layer
+    
+    def upstream_key(self, layer):
+        """Cache key of an array this generator produced, or None for foreign arrays"""
+        key = self.layer_keys.get(id(layer))
+        return key if key is not None and _layer_cache.get(key) is layer else None
+    
+    def disc_window(self, center_x, center_y, radius):
+        """(rows, columns) slices bounding a disc of radius around a normalised point
+
+        Padded by one texel so rounding never drops a pixel the full-grid test keeps.
+        """
+        size = self.resolution
+        rows = slice(max(0, np.searchsorted(self.coords, center_y - radius) - 1),
+                     min(size, np.searchsorted(self.coords, center_y + radius, side='right') + 1))
+        columns = slice(max(0, np.searchsorted(self.coords, center_x - radius) - 1),
+                        min(size, np.searchsorted(self.coords, center_x + radius, side='right') + 1))
+        return rows, columns
+    
+    def noise_field(self, scales, z, columns=None):
+        """mathutils noise at (nx * scales..., ny * scales..., z) - cached per resolution
+
+        mathutils has no array interface, so this is the one per-point loop
+        (about 3 s at 2048x2048); it runs once per (resolution, scales, z) and
+        is then reused. Scales are
+        applied one multiply at a time, as the original per-pixel code did.
+        """
+        if columns is None:
+            columns = np.arange(self.resolution)
+        key = ('noise', self.resolution, scales, z, columns.tobytes())
+
+        def build():
+            xs = self.coords[columns].tolist()
+            ys = self.coords.tolist()
+            for scale in scales:
+                xs = [x * scale for x in xs]
+                ys = [y * scale for y in ys]
+            values = [noise.noise((x, y, z)) for y in ys for x in xs]
+            return np.array(values, dtype=np.float64).reshape(len(ys), len(xs))
+        return self.cached_layer(key, build)
+        
     def generate_complete_heightmap(self):
         """Generate multi-layered heightmap with all civilization layers"""
         print("Starting layered heightmap generation...")
@@ -320,166 +400,165 @@ class LayeredHeightmapGenerator:
     def generate_atlantean_base_layer(self):
         """Generate perfect Atlantean geometric foundation"""
         print("Generating Atlantean base layer...")
-        size = self.resolution
-        heightmap = [[0.0 for _ in range(size)] for _ in range(size)]
-        
         tesseract_power = self.props.atlantean_tech.tesseract_influence
         atlantean_scale = self.props.heightmap_generation.atlantean_base_scale
         
-        for y in range(size):
-            for x in range(size):
-                # Normalized coordinates
-                nx = (x / size) * 2 - 1
-                ny = (y / size) * 2 - 1
-                
-                # Tesseract field influence - 4D hypercube reality warping
-                distance_from_center = math.sqrt(nx*nx + ny*ny)
-                
-                # 4D projection effects (impossible geometry)
-                tesseract_field = (
-                    math.cos(distance_from_center * math.pi * 2) * tesseract_power * 0.3 +
-                    math.sin(distance_from_center * math.pi * 4) * tesseract_power * 0.2
-                )
-                
-                # Sacred geometric patterns
-                spiral_angle = math.atan2(ny, nx)
-                fibonacci_pattern = math.sin(spiral_angle * 8 + distance_from_center * 13) * 0.15
-                
-                # Perfect crystalline structures
-                crystal_grid = (
-                    math.sin(nx * atlantean_scale * 0.5) * 
-                    math.cos(ny * atlantean_scale * 0.5) * 0.2
-                )
-                
-                # Combine Atlantean patterns
-                height = 0.5 + tesseract_field + fibonacci_pattern + crystal_grid
-                heightmap[y][x] = max(0.0, min(1.0, height))
+        def build():
+            nx, ny = self.nx, self.ny
+            
+            # Tesseract field influence - 4D hypercube reality warping
+            distance_from_center = np.sqrt(nx*nx + ny*ny)
+            
+            # 4D projection effects (impossible geometry)
+            tesseract_field = (
+                np.cos(distance_from_center * math.pi * 2) * tesseract_power * 0.3 +
+                np.sin(distance_from_center * math.pi * 4) * tesseract_power * 0.2
+            )
+            
+            # Sacred geometric patterns
+            spiral_angle = np.arctan2(ny, nx)
+            fibonacci_pattern = np.sin(spiral_angle * 8 + distance_from_center * 13) * 0.15
+            
+            # Perfect crystalline structures (separable: one row times one column)
+            crystal_grid = (
+                np.sin(self.coords * atlantean_scale * 0.5)[np.newaxis, :] *
+                np.cos(self.coords * atlantean_scale * 0.5)[:, np.newaxis] * 0.2
+            )
+            
+            # Combine Atlantean patterns
+            height = 0.5 + tesseract_field + fibonacci_pattern + crystal_grid
+            return np.clip(height, 0.0, 1.0)
         
-        return heightmap
+        key = ('atlantean', self.resolution, tesseract_power, atlantean_scale)
+        return self.cached_layer(key, build)
     
     def apply_dssstrkl_adaptations(self, base_heightmap):
         """Apply organic dssstrkl modifications with clan territories"""
         print("Applying dssstrkl adaptations with clan territories...")
+        base_heightmap = np.asarray(base_heightmap, dtype=np.float64)
         size = len(base_heightmap)
-        adapted_heightmap = [row[:] for row in base_heightmap]
         
         organic_scale = self.props.heightmap_generation.organic_overlay_scale
         raptor_factor = 1.2 if self.props.dssstrkl_adaptation.raptor_accessibility else 1.0
+        perching = self.props.dssstrkl_adaptation.perching_structures > 0.5
         
-        for y in range(size):
-            for x in range(size):
-                # Convert heightmap coordinates to world coordinates
-                world_x = (x / size) * self.props.cylinder_length - self.props.cylinder_length/2
-                clan_territory = self.clan_manager.get_clan_for_position(world_x)
-                
-                nx = (x / size) * 2 - 1
-                ny = (y / size) * 2 - 1
-                base_height = base_heightmap[y][x]
-                
-                # Clan-specific modifications
-                clan_preference = clan_territory['preferred_elevation']
-                clan_style = clan_territory['architectural_style']
-                
-                # Organic settlements near clan's preferred elevation
-                elevation_affinity = 1.0 - abs(base_height - clan_preference)
-                
-                # Different architectural styles create different terrain modifications
-                if clan_style == 0:  # Mountain dwellers - create terraces
-                    terrain_mod = math.sin(base_height * math.pi * 8) * 0.1 * elevation_affinity
-                elif clan_style == 1:  # Valley dwellers - smooth terrain
-                    terrain_mod = -abs(noise.noise((nx * organic_scale * 0.1, ny * organic_scale * 0.1, clan_territory['clan_id']))) * 0.05
-                else:  # Cliff dwellers - create stepped surfaces
-                    terrain_mod = math.floor(base_height * 10) / 10 - base_height
-                
-                # Apply perching structures for raptor physiology
-                if self.props.dssstrkl_adaptation.perching_structures > 0.5:
-                    perching_mod = math.sin(base_height * math.pi * 12) * 0.05 * raptor_factor
-                else:
-                    perching_mod = 0
-                
-                adapted_heightmap[y][x] = max(0.0, min(1.0, 
-                    base_height + terrain_mod + perching_mod))
+        # Clan territory of each heightmap column (world X depends on x only)
+        column_territories = [
+            self.clan_manager.get_clan_for_position((x / size) * self.props.cylinder_length - self.props.cylinder_length/2)
+            for x in range(size)
+        ]
+        clan_preference = np.array([t['preferred_elevation'] for t in column_territories])[np.newaxis, :]
+        clan_style = np.array([t['architectural_style'] for t in column_territories])
+        clan_ids = np.array([t['clan_id'] for t in column_territories])
         
-        return adapted_heightmap
+        def build():
+            # Organic settlements near clan's preferred elevation
+            elevation_affinity = 1.0 - np.abs(base_heightmap - clan_preference)
+            
+            # Different architectural styles create different terrain modifications
+            terrain_mod = np.empty_like(base_heightmap)
+            
+            mountain = clan_style == 0  # Mountain dwellers - create terraces
+            terrain_mod[:, mountain] = (np.sin(base_heightmap[:, mountain] * math.pi * 8) * 0.1
+                                        * elevation_affinity[:, mountain])
+            
+            for clan_id in np.unique(clan_ids[clan_style == 1]):  # Valley dwellers - smooth terrain
+                columns = np.flatnonzero((clan_style == 1) & (clan_ids == clan_id))
+                valley_noise = self.noise_field((organic_scale, 0.1), int(clan_id), columns)
+                terrain_mod[:, columns] = -np.abs(valley_noise) * 0.05
+            
+            cliff = clan_style >= 2  # Cliff dwellers - create stepped surfaces
+            terrain_mod[:, cliff] = np.floor(base_heightmap[:, cliff] * 10) / 10 - base_heightmap[:, cliff]
+            
+            # Apply perching structures for raptor physiology
+            if perching:
+                perching_mod = np.sin(base_heightmap * math.pi * 12) * 0.05 * raptor_factor
+                return np.clip(base_heightmap + terrain_mod + perching_mod, 0.0, 1.0)
+            return np.clip(base_heightmap + terrain_mod, 0.0, 1.0)
+        
+        upstream = self.upstream_key(base_heightmap)
+        if upstream is None:
+            return build()
+        key = ('dssstrkl', upstream, organic_scale, raptor_factor, perching,
+               self.props.cylinder_length, self.clan_manager.num_clans)
+        return self.cached_layer(key, build)
     
     def apply_system_decay(self, heightmap):
         """Apply Atlantean technology decay and failure"""
         print("Applying system decay...")
-        size = len(heightmap)
-        decay_heightmap = [row[:] for row in heightmap]
+        heightmap = np.asarray(heightmap, dtype=np.float64)
         
         decay_level = self.props.atlantean_tech.decay_level
+        antigrav_zones = self.props.atlantean_tech.antigrav_zones
         
         if decay_level <= 0:
-            return decay_heightmap
+            return heightmap if self.upstream_key(heightmap) else heightmap.copy()
         
-        for y in range(size):
-            for x in range(size):
-                nx = (x / size) * 2 - 1
-                ny = (y / size) * 2 - 1
-                base_height = heightmap[y][x]
-                
-                # System decay creates collapsed areas and unstable zones
-                decay_noise = noise.noise((nx * 0.03, ny * 0.03, 123)) * decay_level
-                
-                # Antigrav field failures create sudden drops
-                field_failure = 0.0
-                for i in range(self.props.atlantean_tech.antigrav_zones):
-                    field_x = math.sin(i * 2.3) * 0.7
-                    field_y = math.cos(i * 1.7) * 0.7
-                    field_distance = math.sqrt((nx - field_x)**2 + (ny - field_y)**2)
-                    
-                    if field_distance < 0.3:  # Field failure zone
-                        field_failure -= 0.3 * (1 - field_distance / 0.3) * decay_level
+        def build():
+            # System decay creates collapsed areas and unstable zones
+            decay_noise = self.noise_field((0.03,), 123) * decay_level
+            
+            # Antigrav field failures create sudden drops
+            field_failure = np.zeros_like(heightmap)
+            for i in range(antigrav_zones):
+                field_x = math.sin(i * 2.3) * 0.7
+                field_y = math.cos(i * 1.7) * 0.7
+                window = self.disc_window(field_x, field_y, 0.3)
+                field_distance = np.sqrt((self.nx[window] - field_x)**2 + (self.ny[window] - field_y)**2)
                 
-                # Apply decay
-                modified_height = base_height + decay_noise + field_failure
-                decay_heightmap[y][x] = max(0.0, min(1.0, modified_height))
+                failure = field_distance < 0.3  # Field failure zone
+                field_failure[window][failure] -= 0.3 * (1 - field_distance[failure] / 0.3) * decay_level
+            
+            # Apply decay
+            return np.clip(heightmap + decay_noise + field_failure, 0.0, 1.0)
         
-        return decay_heightmap
+        upstream = self.upstream_key(heightmap)
+        if upstream is None:
+            return build()
+        return self.cached_layer(('decay', upstream, decay_level, antigrav_zones), build)
     
     def apply_cult_corruption(self, heightmap):
         """Apply cult infiltration effects"""
         print("Applying cult corruption...")
-        size = len(heightmap)
-        corrupted_heightmap = [row[:] for row in heightmap]
+        heightmap = np.asarray(heightmap, dtype=np.float64)
         
         infiltration_level = self.props.cult_infiltration.infiltration_level
         corruption_level = self.props.cult_infiltration.corruption_patterns
+        hidden_shrines = self.props.cult_infiltration.hidden_shrines
         
         if infiltration_level <= 0:
-            return corrupted_heightmap
-        
-        for y in range(size):
-            for x in range(size):
-                nx = (x / size) * 2 - 1
-                ny = (y / size) * 2 - 1
-                base_height = heightmap[y][x]
-                
-                # Cult corruption creates unnatural geometric scars
-                corruption_noise = 0.0
-                if corruption_level > 0:
-                    # Death cult creates angular, unnatural modifications
-                    angular_x = abs(nx * 10) % 1.0
-                    angular_y = abs(ny * 10) % 1.0
-                    
-                    if angular_x < 0.1 or angular_y < 0.1:  # Create grid-like scars
-                        corruption_noise = -corruption_level * 0.2
+            return heightmap if self.upstream_key(heightmap) else heightmap.copy()
+        
+        def build():
+            # Cult corruption creates unnatural geometric scars
+            corruption_noise = np.zeros_like(heightmap)
+            if corruption_level > 0:
+                # Death cult creates angular, unnatural modifications
+                angular_x = np.abs(self.coords * 10) % 1.0
+                angular_y = np.abs(self.coords * 10) % 1.0
                 
-                # Hidden shrine influence
-                shrine_influence = 0.0
-                for i in range(self.props.cult_infiltration.hidden_shrines):
-                    shrine_x = math.sin(i * 3.7 + 100) * 0.8
-                    shrine_y = math.cos(i * 2.1 + 100) * 0.8
-                    shrine_distance = math.sqrt((nx - shrine_x)**2 + (ny - shrine_y)**2)
-                    
-                    if shrine_distance < 0.2:
-                        shrine_influence -= 0.15 * (1 - shrine_distance / 0.2) * infiltration_level
+                # Create grid-like scars
+                scars = (angular_x < 0.1)[np.newaxis, :] | (angular_y < 0.1)[:, np.newaxis]
+                corruption_noise[scars] = -corruption_level * 0.2
+            
+            # Hidden shrine influence
+            shrine_influence = np.zeros_like(heightmap)
+            for i in range(hidden_shrines):
+                shrine_x = math.sin(i * 3.7 + 100) * 0.8
+                shrine_y = math.cos(i * 2.1 + 100) * 0.8
+                window = self.disc_window(shrine_x, shrine_y, 0.2)
+                shrine_distance = np.sqrt((self.nx[window] - shrine_x)**2 + (self.ny[window] - shrine_y)**2)
                 
-                modified_height = base_height + corruption_noise + shrine_influence
-                corrupted_heightmap[y][x] = max(0.0, min(1.0, modified_height))
+                shrine = shrine_distance < 0.2
+                shrine_influence[window][shrine] -= 0.15 * (1 - shrine_distance[shrine] / 0.2) * infiltration_level
+            
+            return np.clip(heightmap + corruption_noise + shrine_influence, 0.0, 1.0)
         
-        return corrupted_heightmap
+        upstream = self.upstream_key(heightmap)
+        if upstream is None:
+            return build()
+        key = ('cult', upstream, infiltration_level, corruption_level, hidden_shrines)
+        return self.cached_layer(key, build)
 
 # ===== OPTIMIZED GEOMETRY GENERATION =====
 
@@ -1269,6 +1348,7 @@ def unregister():
         bpy.utils.unregister_class(cls)
     
     del bpy.types.Scene.dssstrkl_habitat
+    clear_layer_cache()
     
     print("Dssstrkl Habitat Designer unregistered")
 
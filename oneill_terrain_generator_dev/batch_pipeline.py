@@ -0,0 +1,240 @@
+"""
+O'Neill Terrain Generator - Headless Batch Pipeline
+align -> unwrap -> paint-import -> bake -> rewrap from a JSON config and a canvas PNG/EXR
+No selection, operators or screen areas - safe for `blender -b` and the bpy module on CI
+
+    blender -b ark.blend --python-exit-code 1 --python-expr "import sys; from oneill_terrain_generator_dev import batch_pipeline; sys.exit(batch_pipeline.main(['ark.json']))"
+    python -m oneill_terrain_generator_dev.batch_pipeline ark.json
+
+main() returns the exit code (0 ok, 1 failed, 2 usage) - pass it to sys.exit so CI sees failures
+"""
+
+import json
+import os
+import sys
+import time
+
+import bpy
+
+from . import main_terrain_system as terrain
+
+DEFAULT_STAGES = ("align", "unwrap", "paint_import", "bake", "rewrap")
+
+DEFAULT_CONFIG = {
+    "blend_file": None,         # Opened first when set (the bpy module starts empty)
+    "objects": None,            # Cylinder names; default: every mesh in "collection" or the scene
+    "collection": None,
+    "alignment_axis": "X",
+    "canvas": None,             # Painted canvas image (PNG = sRGB, EXR = linear)
+    "bake_workers": 0,          # 0 = all CPU cores
+    "noise_period": None,       # Integer lattice period for tileable bakes
+    "join_segments": False,     # Merge the welded segments into one ark mesh
+    "export_dir": None,         # Directory for the "export" stage
+    "export_format": "GLTF",    # GLTF, PLY or OBJ
+    "heightmap_dir": None,      # Directory for the "heightmap_export" stage
+    "heightmap_resolution": 1024, # Texels per flat strip (square)
+    "heightmap_format": "R16",  # R16, PNG16 or EXR
+    "stages": list(DEFAULT_STAGES),
+    "output": None,             # .blend to save when done
+}
+
+
+def load_config(path):
+    """Read a JSON config; relative paths are taken from the config file's directory"""
+    with open(path) as f:
+        config = dict(DEFAULT_CONFIG, **json.load(f))
+
+    base = os.path.dirname(os.path.abspath(path))
+    for key in ("blend_file", "canvas", "output", "export_dir", "heightmap_dir"):
+        if config[key] and not os.path.isabs(config[key]):
+            config[key] = os.path.join(base, config[key])
+    return config
+
+
+class BatchPipeline:
+    """Runs the add-on's steps on explicit object lists instead of the selection"""
+
+    def __init__(self, config):
+        self.config = dict(DEFAULT_CONFIG, **config)
+        self.cylinders = []
+        self.flat_objects = []
+        self.canvas = None
+        self.terrain_system = terrain.UnifiedCanvasTerrainSystem()
+
+    # -------------------- object discovery --------------------
+
+    def find_cylinders(self):
+        config = self.config
+        if config["objects"]:
+            missing = [name for name in config["objects"] if name not in bpy.data.objects]
+            if missing:
+                raise ValueError(f"Objects not found: {', '.join(missing)}")
+            return [bpy.data.objects[name] for name in config["objects"]]
+
+        if config["collection"]:
+            collection = bpy.data.collections.get(config["collection"])
+            if collection is None:
+                raise ValueError(f"Collection not found: {config['collection']}")
+            candidates = collection.all_objects
+        else:
+            candidates = bpy.context.scene.objects
+
+        return [obj for obj in candidates
+                if obj.type == 'MESH' and not obj.get("oneill_flat") and not obj.get("oneill_rewrapped")]
+
+    def find_flat_objects(self):
+        names = {f"{obj.name}_flat" for obj in self.cylinders}
+        flat_objects = [obj for obj in bpy.data.objects if obj.get("oneill_flat")]
+        if names:
+            flat_objects = [obj for obj in flat_objects if obj.name in names] or flat_objects
+        return sorted(flat_objects, key=lambda obj: obj.location.x)
+
+    # -------------------- stages --------------------
+
+    def stage_align(self):
+        if len(self.cylinders) < 2:
+            print("⚠️ Fewer than 2 cylinders - alignment skipped")
+            return
+        self.cylinders = terrain.align_cylinder_objects(self.cylinders, self.config["alignment_axis"])
+        print(f"✅ Aligned {len(self.cylinders)} cylinders")
+
+    def stage_unwrap(self):
+        collection = bpy.context.scene.collection
+        for obj in self.cylinders:
+            if not obj.get("oneill_aligned"):
+                print(f"⚠️ {obj.name} is not aligned - unwrap skipped")
+                continue
+
+            # Re-runs replace the previous flat instead of creating *_flat.001
+            existing = bpy.data.objects.get(f"{obj.name}_flat")
+            if existing is not None:
+                bpy.data.objects.remove(existing, do_unlink=True)
+
+            terrain.unwrap_cylinder_to_flat(obj, collection)
+            obj.hide_viewport = True
+        self.flat_objects = self.find_flat_objects()
+        print(f"✅ Unwrapped {len(self.flat_objects)} flat objects")
+
+    def stage_paint_import(self):
+        path = self.config["canvas"]
+        if not path:
+            raise ValueError("paint_import needs a 'canvas' image path")
+
+        existing = bpy.data.images.get(terrain.canvas_buffer.CANVAS_NAME)
+        if existing is not None:
+            bpy.data.images.remove(existing)
+        canvas = bpy.data.images.load(path, check_existing=False)
+        canvas.name = terrain.canvas_buffer.CANVAS_NAME
+        self.canvas = canvas
+
+        # Same canvas layout as interactive painting: each flat gets its 1/N strip
+        terrain.uv_layout.get_uv_layout_engine().apply_canvas_layout(self.flat_objects, normalize=True, verbose=False)
+
+        self.terrain_system.create_unified_multi_biome_system()
+        self.terrain_system.auto_preview_system.apply_working_modifier_stack(self.flat_objects)
+        print(f"✅ Imported canvas {os.path.basename(path)} ({canvas.size[0]}x{canvas.size[1]})")
+
+    def stage_bake(self):
+        if not terrain.batch_bake:
+            raise RuntimeError("Batch bake module not available")
+        unbaked = [obj for obj in self.flat_objects if not obj.get(terrain.batch_bake.BAKED_KEY)]
+        if not unbaked:
+            print("⚠️ Flat objects are already baked - bake skipped")
+            return
+        baked = terrain.batch_bake.bake_flat_objects(
+            unbaked,
+            workers=self.config["bake_workers"] or None,
+            period=self.config["noise_period"]
+        )
+        if not baked:
+            raise RuntimeError("Nothing baked - is a canvas connected?")
+
+    def stage_rewrap(self):
+        rewrap = getattr(terrain, "rewrap_engine", None)
+        if not rewrap:
+            print("⚠️ Rewrap engine not available - rewrap skipped")
+            return
+        collection = bpy.context.scene.collection
+        rewrapped = rewrap.get_rewrap_engine().rewrap_objects(self.flat_objects, collection)
+        if terrain.seam_welder and rewrapped:
+            welder = terrain.seam_welder.get_seam_welder()
+            welder.weld_ark(rewrapped, join=self.config["join_segments"], collection=collection)
+            if welder.failures:
+                raise RuntimeError(f"{len(welder.failures)} seam welds failed: {'; '.join(welder.failures)}")
+
+    def stage_export(self):
+        if not terrain.ark_exporter:
+            raise RuntimeError("Ark exporter not available")
+        if not self.config["export_dir"]:
+            raise ValueError("export needs an 'export_dir'")
+        manifest = terrain.ark_exporter.export_ark(self.config["export_dir"], self.config["export_format"])
+        failures = [f"{failure['name']}: {failure['error']}" for failure in manifest['failures']]
+        if failures:
+            raise RuntimeError(f"{len(failures)} segments failed to export: {'; '.join(failures)}")
+
+    def stage_heightmap_export(self):
+        if not terrain.heightmap_export:
+            raise RuntimeError("Heightmap export not available")
+        if not self.config["heightmap_dir"]:
+            raise ValueError("heightmap_export needs a 'heightmap_dir'")
+        terrain.heightmap_export.export_heightmap_tiles(
+            self.config["heightmap_dir"], self.flat_objects,
+            resolution=int(self.config["heightmap_resolution"]),
+            tile_format=self.config["heightmap_format"]
+        )
+
+    # -------------------- driver --------------------
+
+    def run(self):
+        """Run the configured stages in order - returns {stage: seconds}"""
+        config = self.config
+        if config["blend_file"]:
+            bpy.ops.wm.open_mainfile(filepath=config["blend_file"])
+
+        self.cylinders = self.find_cylinders()
+        self.flat_objects = self.find_flat_objects()
+
+        timings = {}
+        for stage in config["stages"]:
+            method = getattr(self, f"stage_{stage}", None)
+            if method is None:
+                raise ValueError(f"Unknown pipeline stage: {stage}")
+
+            start = time.perf_counter()
+            print(f"▶️ Stage {stage}")
+            method()
+            timings[stage] = time.perf_counter() - start
+
+        if config["output"]:
+            bpy.ops.wm.save_as_mainfile(filepath=config["output"])
+            print(f"💾 Saved {config['output']}")
+
+        print("✅ Batch pipeline complete: " + ", ".join(f"{stage} {seconds:.1f}s" for stage, seconds in timings.items()))
+        return timings
+
+
+def run_pipeline(config_path, **overrides):
+    """Load a config file (plus keyword overrides) and run the pipeline"""
+    config = load_config(config_path)
+    config.update(overrides)
+    return BatchPipeline(config).run()
+
+def main(argv=None):
+    """Command-line entry: batch_pipeline CONFIG.json [stage ...] - returns the process exit code"""
+    if argv is None:
+        argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+    if not argv:
+        print("Usage: batch_pipeline CONFIG.json [stage ...]")
+        return 2
+
+    overrides = {"stages": argv[1:]} if len(argv) > 1 else {}
+    try:
+        run_pipeline(argv[0], **overrides)
+    except Exception as e:
+        print(f"❌ Batch pipeline failed: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,8 +10,9 @@ import bmesh
 import mathutils
 import math
 import random
+import numpy as np
 from bpy.types import Operator, Panel, PropertyGroup
-from bpy.props import FloatProperty, IntProperty, BoolProperty, EnumProperty, PointerProperty
+from bpy.props import FloatProperty, IntProperty, BoolProperty, EnumProperty, PointerProperty, StringProperty
 
 # Import stroke-based Y-wrapping system
 try:
@@ -25,8 +26,174 @@ except ImportError:
         print(f"⚠️ Could not import stroke-based Y-wrapping: {e}")
         stroke_based_y_wrapping = None
 
+# Core modules (canvas buffer, change tracker, UV layout, mesh arrays, bounds,
+# planner, monitor) are hard imports - the operators use them unconditionally,
+# so a broken install fails at import instead of inside an operator
+
+# Import shared NumPy canvas buffer
+try:
+    from .modules import canvas_buffer
+except ImportError:
+    import modules.canvas_buffer as canvas_buffer
+
+# Import dirty-tile change tracker
+try:
+    from .modules import canvas_change_tracker
+except ImportError:
+    import modules.canvas_change_tracker as canvas_change_tracker
+
+# Import bulk UV layout engine
+try:
+    from .modules import uv_layout
+except ImportError:
+    import modules.uv_layout as uv_layout
+
+# Import bulk mesh array helpers
+try:
+    from .modules import mesh_arrays
+except ImportError:
+    import modules.mesh_arrays as mesh_arrays
+
+# Import cached world-space bounds service
+try:
+    from .modules import bounds_service
+except ImportError:
+    import modules.bounds_service as bounds_service
+
+# Import compact single-channel heightmap store
+try:
+    from .modules import heightmap_store
+except ImportError:
+    try:
+        import modules.heightmap_store as heightmap_store
+    except ImportError as e:
+        print(f"⚠️ Could not import heightmap store: {e}")
+        heightmap_store = None
+
+# Import whole-canvas biome label map
+try:
+    from .modules import biome_map
+except ImportError:
+    try:
+        import modules.biome_map as biome_map
+    except ImportError as e:
+        print(f"⚠️ Could not import biome label map: {e}")
+        biome_map = None
+
+# Import resolution-aware canvas planner
+try:
+    from .modules import canvas_planner
+except ImportError:
+    import modules.canvas_planner as canvas_planner
+
+# Import UDIM-style tiled canvas
+try:
+    from .modules import tiled_canvas
+except ImportError:
+    try:
+        import modules.tiled_canvas as tiled_canvas
+    except ImportError as e:
+        print(f"⚠️ Could not import tiled canvas: {e}")
+        tiled_canvas = None
+
+# Import event-driven canvas monitor
+try:
+    from .modules import canvas_monitor
+except ImportError:
+    import modules.canvas_monitor as canvas_monitor
+
+# Import long-lived canvas pipeline coordinator
+try:
+    from .modules import terrain_pipeline
+except ImportError:
+    try:
+        import modules.terrain_pipeline as terrain_pipeline
+    except ImportError as e:
+        print(f"⚠️ Could not import terrain pipeline: {e}")
+        terrain_pipeline = None
+
+# Import evaluated-displacement probe
+try:
+    from .modules import displacement_probe
+except ImportError:
+    try:
+        import modules.displacement_probe as displacement_probe
+    except ImportError as e:
+        print(f"⚠️ Could not import displacement probe: {e}")
+        displacement_probe = None
+
+# Import multi-process terrain bake
+try:
+    from .modules import batch_bake
+except ImportError:
+    try:
+        import modules.batch_bake as batch_bake
+    except ImportError as e:
+        print(f"⚠️ Could not import batch bake: {e}")
+        batch_bake = None
+
+# Import adaptive preview LOD manager
+try:
+    from .modules import preview_lod
+except ImportError:
+    try:
+        import modules.preview_lod as preview_lod
+    except ImportError as e:
+        print(f"⚠️ Could not import preview LOD manager: {e}")
+        preview_lod = None
+
+# Import geometric rewrap engine
+try:
+    from .modules import rewrap_engine
+except ImportError:
+    try:
+        import modules.rewrap_engine as rewrap_engine
+    except ImportError as e:
+        print(f"⚠️ Could not import rewrap engine: {e}")
+        rewrap_engine = None
+
+# Import grid-topology seam welder
+try:
+    from .modules import seam_welder
+except ImportError:
+    try:
+        import modules.seam_welder as seam_welder
+    except ImportError as e:
+        print(f"⚠️ Could not import seam welder: {e}")
+        seam_welder = None
+
+# Import streaming ark exporter
+try:
+    from .modules import ark_exporter
+except ImportError:
+    try:
+        import modules.ark_exporter as ark_exporter
+    except ImportError as e:
+        print(f"⚠️ Could not import ark exporter: {e}")
+        ark_exporter = None
+
+# Import tiled heightmap export
+try:
+    from .modules import heightmap_export
+except ImportError:
+    try:
+        import modules.heightmap_export as heightmap_export
+    except ImportError as e:
+        print(f"⚠️ Could not import heightmap export: {e}")
+        heightmap_export = None
+
 # ========================= SESSION 55 AUTO-PREVIEW SYSTEM INTEGRATION =========================
 
+OUTPUT_SUBDIVISION_LEVEL = preview_lod.OUTPUT_LEVEL if preview_lod else 2
+
+def plan_preview_levels(flat_objects):
+    """Preview_Subdivision level per object from coverage, screen size and the vertex budget"""
+    if not preview_lod:
+        return {}
+    props = getattr(bpy.context.scene, "oneill_props", None)
+    budget = props.preview_vertex_budget if props else None
+    return preview_lod.get_preview_lod_manager().plan_levels(flat_objects, budget)
+
 class WorkingAutoPreviewSystem:
     """SESSION 42 working auto-preview system integration - PHASE 2"""
     
@@ -64,53 +231,11 @@ class WorkingAutoPreviewSystem:
         """Fix UV mapping using exact SESSION 42 blueprint"""
         print(f"\n=== FIXING UV MAPPING USING SESSION 42 BLUEPRINT ===")
         
-        # Sort objects by X position to match SESSION 42 layout
-        sorted_objects = sorted(flat_objects, key=lambda obj: obj.location.x)
-        total_objects = len(sorted_objects)
+        print(f"Fixing UV mapping for {len(flat_objects)} objects...")
         
-        print(f"Fixing UV mapping for {total_objects} objects...")
-        
-        for i, obj in enumerate(sorted_objects):
-            try:
-                mesh = obj.data
-                if not mesh.uv_layers:
-                    print(f"⚠️ No UV layer found on {obj.name}")
-                    continue
-                
-                uv_layer = mesh.uv_layers['UVMap']
-                
-                # Calculate SESSION 42 UV ranges
-                # Each object gets exactly 1/total_objects of the canvas width
-                u_start = i / total_objects
-                u_end = (i + 1) / total_objects
-                v_start = 0.0
-                v_end = 1.0
-                
-                print(f"  Object {i+1} ({obj.name}): U=[{u_start:.6f}, {u_end:.6f}]")
-                
-                # Remap all UV coordinates to the correct canvas portion
-                for poly in mesh.polygons:
-                    for loop_index in poly.loop_indices:
-                        loop = mesh.loops[loop_index]
-                        vertex = mesh.vertices[loop.vertex_index]
-                        
-                        # Get current UV (0-1 range within object)
-                        current_uv = uv_layer.data[loop_index].uv
-                        local_u = current_uv[0]  # Already 0-1 from temporary mapping
-                        local_v = current_uv[1]  # Already 0-1 from temporary mapping
-                        
-                        # Map to correct portion of unified canvas
-                        global_u = u_start + (local_u * (u_end - u_start))
-                        global_v = v_start + (local_v * (v_end - v_start))
-                        
-                        uv_layer.data[loop_index].uv = (global_u, global_v)
-                
-                # Update mesh
-                mesh.update()
-                print(f"✅ Fixed UV mapping for {obj.name} (portion {i+1}/{total_objects})")
-                
-            except Exception as e:
-                print(f"❌ Failed to fix UV mapping for {obj.name}: {e}")
+        # Each object gets exactly 1/total_objects of the canvas width
+        # UVs are already 0-1 from the temporary unwrap mapping, so no normalisation
+        uv_layout.get_uv_layout_engine().apply_canvas_layout(flat_objects, normalize=False)
         
         print(f"✅ UV mapping fix complete - SESSION 42 unified canvas layout applied")
     
@@ -136,6 +261,9 @@ class WorkingAutoPreviewSystem:
             print("❌ Canvas not found")
             return False
         
+        # Adaptive preview LOD - unpainted/off-screen strips stay at level 0
+        levels = plan_preview_levels(flat_objects)
+        
         applied_count = 0
         for obj in flat_objects:
             try:
@@ -146,9 +274,11 @@ class WorkingAutoPreviewSystem:
                 
                 # Apply SESSION 42 working modifier stack
                 
-                # 1. Preview_Subdivision (SUBSURF) - levels=2
+                # 1. Preview_Subdivision (SUBSURF) - level from the preview LOD plan
                 subsurf = obj.modifiers.new(name="Preview_Subdivision", type='SUBSURF')
-                subsurf.levels = 2
+                subsurf.levels = levels.get(obj.name, 2)
+                subsurf.show_viewport = subsurf.levels > 0
+                subsurf.render_levels = OUTPUT_SUBDIVISION_LEVEL  # Output never follows the camera
                 
                 # 2. Unified_Terrain (NODES) - working node group
                 geo_nodes = obj.modifiers.new(name="Unified_Terrain", type='NODES')
@@ -177,31 +307,30 @@ class WorkingAutoPreviewSystem:
             print("❌ Image Texture node or Image input not found")
             return False
     
-    def monitor_canvas_changes(self):
-        """Monitor canvas using CORRECT evaluated mesh approach from SESSION 54"""
+    def monitor_canvas_changes(self, objects=None):
+        """Monitor canvas using CORRECT evaluated mesh approach from SESSION 54
+        
+        objects limits the check to the strips of the canvas tile that changed.
+        """
         if not self.auto_preview_active:
             return False
         
-        displacement_detected = False
-        for obj in self.monitored_objects:
-            try:
-                # CORRECT method: Use evaluated mesh, not base mesh
-                depsgraph = bpy.context.evaluated_depsgraph_get()
-                eval_obj = obj.evaluated_get(depsgraph)
-                
-                if eval_obj.data.vertices:
-                    z_coords = [v.co.z for v in eval_obj.data.vertices]
-                    displacement_range = max(z_coords) - min(z_coords)
-                    
-                    if displacement_range > 0.001:
-                        displacement_detected = True
-                        print(f"✅ Displacement detected on {obj.name}: {displacement_range:.3f}")
-                        break
-                        
-            except Exception as e:
-                print(f"⚠️ Monitoring error for {obj.name}: {e}")
+        objects = self.monitored_objects if objects is None else objects
         
-        return displacement_detected
+        # CORRECT method: Use evaluated mesh, not base mesh
+        if not displacement_probe:
+            # No per-vertex Python fallback - it would walk every evaluated vertex on each stroke
+            print("⚠️ Displacement probe not available - preview health-check skipped")
+            return False
+        
+        # One depsgraph per check; evaluated Z read in bulk into a reusable array
+        displaced = displacement_probe.get_displacement_probe().first_displaced(objects)
+        if displaced:
+            obj, displacement_range = displaced
+            print(f"✅ Displacement detected on {obj.name}: {displacement_range:.3f}")
+            return True
+        
+        return False
     
     def setup_auto_preview_monitoring(self, flat_objects):
         """Set up real-time canvas-to-terrain monitoring"""
@@ -229,6 +358,11 @@ class UnifiedCanvasTerrainSystem:
         # Create new geometry node group
         node_group = bpy.data.node_groups.new(node_group_name, 'GeometryNodeTree')
         
+        # Geometry sockets so the group can drive a NODES modifier (4.0+ interface API)
+        if hasattr(node_group, 'interface'):
+            node_group.interface.new_socket('Geometry', in_out='INPUT', socket_type='NodeSocketGeometry')
+            node_group.interface.new_socket('Geometry', in_out='OUTPUT', socket_type='NodeSocketGeometry')
+        
         # Create nodes in exact order from SESSION 42
         group_input = node_group.nodes.new('NodeGroupInput')
         group_input.name = "Group Input"
@@ -359,6 +493,60 @@ class OneillProperties(PropertyGroup):
         default='1024'
     )
     
+    heightmap_precision: EnumProperty(
+        name="Heightmap Precision",
+        description="Storage precision of the single-channel heightmap files",
+        items=[
+            ('HALF', 'Half (16-bit)', 'float16 - 8x smaller than an RGBA float image'),
+            ('FLOAT', 'Float (32-bit)', 'float32 - 4x smaller than an RGBA float image'),
+        ],
+        default='HALF'
+    )
+    
+    canvas_texels_per_metre: FloatProperty(
+        name="Texels per Metre",
+        description="Painting canvas density along the flat objects and around the circumference",
+        default=20.0,
+        min=0.5,
+        max=512.0
+    )
+    
+    canvas_memory_budget: IntProperty(
+        name="Canvas Memory (MB)",
+        description="Upper bound for the painting canvas; density is lowered to fit",
+        default=512,
+        min=16,
+        max=16384
+    )
+    
+    canvas_tiled: BoolProperty(
+        name="Tiled Canvas (UDIM)",
+        description="Split large arks into one canvas tile per group of flat objects instead of one huge image",
+        default=False
+    )
+    
+    preview_vertex_budget: IntProperty(
+        name="Preview Vertex Budget",
+        description="Upper bound on subdivided preview vertices across the whole ark",
+        default=500000,
+        min=10000,
+        max=20000000
+    )
+    
+    bake_workers: IntProperty(
+        name="Bake Workers",
+        description="Processes used to bake terrain displacement (0 = all CPU cores)",
+        default=0,
+        min=0,
+        max=256
+    )
+    
+    rewrap_join_segments: BoolProperty(
+        name="Join Segments",
+        description="Merge all rewrapped segments into one welded ark mesh",
+        default=False
+    )
+    
     terrain_scale: FloatProperty(
         name="Terrain Scale",
         default=1.0,
@@ -384,6 +572,91 @@ class OneillProperties(PropertyGroup):
         default='MOUNTAINS'
     )
 
+# ========================= CORE OPERATIONS =========================
+# Context-free steps shared by the operators and the headless batch pipeline
+
+def align_cylinder_objects(objects, alignment_axis='X'):
+    """Place cylinders end to end along the axis, sorted by location - returns the sorted list"""
+    axis_idx = ['X', 'Y', 'Z'].index(alignment_axis)
+    objects = sorted(objects, key=lambda obj: obj.location[axis_idx])
+    bounds = bounds_service.get_bounds_service()
+
+    # Store object properties for later use
+    for obj in objects:
+        obj_min, obj_max = bounds.axis_bounds(obj, axis_idx)
+        obj_width = obj_max - obj_min
+        cylinder_radius = (obj.dimensions.y / 2) / obj.scale.y
+        
+        obj["oneill_aligned"] = True
+        obj["cylinder_radius"] = cylinder_radius
+        obj["cylinder_length"] = obj_width
+        obj["alignment_axis"] = alignment_axis
+        
+    # Create contiguous objects using true bounds
+    first_min, first_max = bounds.axis_bounds(objects[0], axis_idx)
+    running_position = first_max
+    
+    for current in objects[1:]:
+        curr_min, curr_max = bounds.axis_bounds(current, axis_idx)
+        curr_width = curr_max - curr_min
+        curr_center = (curr_min + curr_max) / 2
+        
+        # Position this object to touch the previous one exactly
+        new_center_x = running_position + (curr_width / 2)
+        offset = new_center_x - curr_center
+        current.location[axis_idx] += offset
+        
+        # Update running position for next object
+        running_position = new_center_x + (curr_width / 2)
+    
+    return objects
+
+def unwrap_cylinder_to_flat(obj, collection):
+    """Build the flat grid object for an aligned cylinder and link it into collection"""
+    original_name = obj.name
+    
+    cylinder_radius = obj.get("cylinder_radius", 1.0)
+    cylinder_length = obj.get("cylinder_length", 2.0)
+    
+    circumference = 2 * math.pi * cylinder_radius
+    
+    # Get center position for placement - one foreach_get instead of per-vertex matrix products
+    world_coords = mesh_arrays.read_world_coords(obj)
+    center_x, center_y = world_coords[:, :2].mean(axis=0).tolist()
+    segments_x = max(20, int(cylinder_length * 10))
+    segments_y = max(20, int(circumference * 5))
+    
+    # Build the flat grid directly from NumPy arrays (known segments_x x segments_y topology)
+    coords, quads = mesh_arrays.grid_plane_arrays(segments_x, segments_y, cylinder_length, circumference)
+    
+    # CRITICAL: Add UV mapping layer - TEMPORARY PLACEHOLDER
+    # UV mapping will be fixed after all objects are created by fix_unified_canvas_uv_mapping
+    local_u = (coords[:, 0] + cylinder_length / 2) / cylinder_length  # 0-1 within object
+    v = (coords[:, 1] + circumference / 2) / circumference  # V remains 0-1
+    loop_uvs = np.stack((local_u, v), axis=1)[quads.ravel()]
+    
+    unwrapped_name = f"{original_name}_flat"
+    unwrapped_mesh = mesh_arrays.build_mesh(unwrapped_name, coords, quads, loop_uvs)
+    print(f"✅ Added temporary UV mapping to {unwrapped_name} (will be corrected later)")
+    
+    unwrapped_obj = bpy.data.objects.new(unwrapped_name, unwrapped_mesh)
+    collection.objects.link(unwrapped_obj)
+    
+    # Maintain the same X position as the original object to preserve spacing
+    unwrapped_obj.location.x = obj.location.x
+    unwrapped_obj.location.y = center_y
+    unwrapped_obj.location.z = 0
+    
+    unwrapped_obj["oneill_flat"] = True
+    unwrapped_obj["original_object"] = original_name
+    unwrapped_obj["cylinder_radius"] = cylinder_radius
+    unwrapped_obj["cylinder_length"] = cylinder_length
+    # Grid topology - lets later stages derive seam/boundary indices without searching
+    unwrapped_obj["grid_segments_x"] = segments_x
+    unwrapped_obj["grid_segments_y"] = segments_y
+    
+    return unwrapped_obj
+
 # ========================= CORE OPERATORS =========================
 
 class ONEILL_OT_AlignCylinders(Operator):
@@ -392,12 +665,9 @@ class ONEILL_OT_AlignCylinders(Operator):
     bl_label = "Align Cylinders"
     bl_options = {'REGISTER', 'UNDO'}
     
-    def get_true_object_bounds(self, obj):
-        """Get actual world-space bounds including transforms"""
-        mesh = obj.data
-        world_coords = [obj.matrix_world @ v.co for v in mesh.vertices]
-        x_coords = [co.x for co in world_coords]
-        return min(x_coords), max(x_coords)
+    def get_true_object_bounds(self, obj, axis_idx=0):
+        """Get actual world-space bounds including transforms (cached per mesh + matrix)"""
+        return bounds_service.get_bounds_service().axis_bounds(obj, axis_idx)
     
     def execute(self, context):
         props = context.scene.oneill_props
@@ -407,38 +677,7 @@ class ONEILL_OT_AlignCylinders(Operator):
             self.report({'ERROR'}, "Select at least 2 cylinder objects")
             return {'CANCELLED'}
         
-        axis_idx = ['X', 'Y', 'Z'].index(props.alignment_axis)
-        selected_objects.sort(key=lambda obj: obj.location[axis_idx])
-
-        # Store object properties for later use
-        for obj in selected_objects:
-            obj_min, obj_max = self.get_true_object_bounds(obj)
-            obj_width = obj_max - obj_min
-            cylinder_radius = (obj.dimensions.y / 2) / obj.scale.y
-            
-            obj["oneill_aligned"] = True
-            obj["cylinder_radius"] = cylinder_radius
-            obj["cylinder_length"] = obj_width
-            obj["alignment_axis"] = props.alignment_axis
-            
-        # Create contiguous objects using true bounds
-        first_obj = selected_objects[0]
-        first_min, first_max = self.get_true_object_bounds(first_obj)
-        running_position = first_max
-        
-        for i in range(1, len(selected_objects)):
-            current = selected_objects[i]
-            curr_min, curr_max = self.get_true_object_bounds(current)
-            curr_width = curr_max - curr_min
-            curr_center = (curr_min + curr_max) / 2
-            
-            # Position this object to touch the previous one exactly
-            new_center_x = running_position + (curr_width / 2)
-            offset = new_center_x - curr_center
-            current.location[axis_idx] += offset
-            
-            # Update running position for next object
-            running_position = new_center_x + (curr_width / 2)
+        align_cylinder_objects(selected_objects, props.alignment_axis)
         
         self.report({'INFO'}, f"Aligned {len(selected_objects)} cylinders contiguously")
         return {'FINISHED'}
@@ -471,68 +710,7 @@ class ONEILL_OT_UnwrapToFlat(Operator):
         return {'FINISHED'}
     
     def unwrap_cylinder_object(self, context, obj):
-        original_name = obj.name
-        
-        cylinder_radius = obj.get("cylinder_radius", 1.0)
-        cylinder_length = obj.get("cylinder_length", 2.0)
-        
-        circumference = 2 * math.pi * cylinder_radius
-        
-        # Get center position for placement
-        mesh = obj.data
-        vertices = [obj.matrix_world @ v.co for v in mesh.vertices]
-        center_x = sum(v.x for v in vertices) / len(vertices)
-        center_y = sum(v.y for v in vertices) / len(vertices)
-        segments_x = max(20, int(cylinder_length * 10))
-        segments_y = max(20, int(circumference * 5))
-        
-        bm_new = bmesh.new()
-        bmesh.ops.create_grid(bm_new, x_segments=segments_x, y_segments=segments_y, size=1.0)
-        
-        for vert in bm_new.verts:
-            vert.co.x = vert.co.x * (cylinder_length / 2)
-            vert.co.y = vert.co.y * (circumference / 2)
-            vert.co.z = 0
-        
-        unwrapped_name = f"{original_name}_flat"
-        unwrapped_mesh = bpy.data.meshes.new(unwrapped_name)
-        bm_new.to_mesh(unwrapped_mesh)
-        bm_new.free()
-        
-        # CRITICAL: Add UV mapping layer - TEMPORARY PLACEHOLDER
-        # UV mapping will be fixed after all objects are created
-        if not unwrapped_mesh.uv_layers:
-            uv_layer = unwrapped_mesh.uv_layers.new(name='UVMap')
-            
-            # TEMPORARY: Use basic UV mapping that will be corrected later
-            # This prevents errors during object creation
-            for poly in unwrapped_mesh.polygons:
-                for loop_index in poly.loop_indices:
-                    loop = unwrapped_mesh.loops[loop_index]
-                    vertex = unwrapped_mesh.vertices[loop.vertex_index]
-                    
-                    # Temporary UV mapping - will be corrected by fix_unified_canvas_uv_mapping
-                    local_u = (vertex.co.x + cylinder_length/2) / cylinder_length  # 0-1 within object
-                    v = (vertex.co.y + circumference/2) / circumference  # V remains 0-1
-                    
-                    uv_layer.data[loop_index].uv = (local_u, v)
-            
-            print(f"✅ Added temporary UV mapping to {unwrapped_name} (will be corrected later)")
-        
-        unwrapped_obj = bpy.data.objects.new(unwrapped_name, unwrapped_mesh)
-        context.collection.objects.link(unwrapped_obj)
-        
-        # Maintain the same X position as the original object to preserve spacing
-        unwrapped_obj.location.x = obj.location.x
-        unwrapped_obj.location.y = center_y
-        unwrapped_obj.location.z = 0
-        
-        unwrapped_obj["oneill_flat"] = True
-        unwrapped_obj["original_object"] = original_name
-        unwrapped_obj["cylinder_radius"] = cylinder_radius
-        unwrapped_obj["cylinder_length"] = cylinder_length
-        
-        return unwrapped_obj
+        return unwrap_cylinder_to_flat(obj, context.collection)
 
 class ONEILL_OT_CreateHeightmaps(Operator):
     """Create heightmaps for flat objects"""
@@ -554,31 +732,92 @@ class ONEILL_OT_CreateHeightmaps(Operator):
         else:
             flat_objects = selected_flat
         
+        if not heightmap_store:
+            self.report({'ERROR'}, "Heightmap store not available")
+            return {'CANCELLED'}
+        
+        store = heightmap_store.get_heightmap_store()
+        if not store.persistent:
+            # Unsaved files would write to Blender's temp dir, which is deleted on exit
+            self.report({'ERROR'}, "Save the .blend first - heightmaps are stored next to it")
+            return {'CANCELLED'}
+        
         resolution = int(props.heightmap_resolution)
         
         for obj in flat_objects:
             heightmap_name = f"{obj.name}_heightmap"
             
+            # Drop any expanded RGBA copy - heights live in the compact store now
             if heightmap_name in bpy.data.images:
                 bpy.data.images.remove(bpy.data.images[heightmap_name])
             
-            heightmap = bpy.data.images.new(
-                heightmap_name,
-                width=resolution,
-                height=resolution,
-                alpha=False,
-                float_buffer=True
-            )
-            
-            pixels = [0.5, 0.5, 0.5, 1.0] * (resolution * resolution)
-            heightmap.pixels = pixels
-            heightmap.update()
+            # Single-channel neutral mid-grey height, written through a memory map
+            # one object at a time - no RGBA image until someone wants to paint it
+            path = store.create(heightmap_name, resolution, fill=0.5, precision=props.heightmap_precision)
             
             obj["heightmap_image"] = heightmap_name
+            obj["heightmap_file"] = bpy.path.relpath(path)
         
         self.report({'INFO'}, f"Created heightmaps for {len(flat_objects)} objects")
         return {'FINISHED'}
 
+class ONEILL_OT_EditHeightmap(Operator):
+    """Expand the active flat object's stored heightmap into an image for display or painting"""
+    bl_idname = "oneill.edit_heightmap"
+    bl_label = "Edit Heightmap"
+    bl_options = {'REGISTER'}
+    
+    def execute(self, context):
+        obj = context.active_object
+        if not obj or not obj.get("heightmap_image"):
+            self.report({'ERROR'}, "Select a flat object with a heightmap")
+            return {'CANCELLED'}
+        
+        if not heightmap_store:
+            self.report({'ERROR'}, "Heightmap store not available")
+            return {'CANCELLED'}
+        
+        store = heightmap_store.get_heightmap_store()
+        image = store.to_image(obj["heightmap_image"], path=store.path_for_object(obj))
+        if not image:
+            self.report({'ERROR'}, f"Stored heightmap not found for {obj.name}")
+            return {'CANCELLED'}
+        
+        # Show it in any open Image Editor
+        for area in context.screen.areas:
+            if area.type == 'IMAGE_EDITOR':
+                area.spaces.active.image = image
+                break
+        
+        self.report({'INFO'}, f"Expanded {image.name} for editing")
+        return {'FINISHED'}
+
+class ONEILL_OT_StoreHeightmap(Operator):
+    """Write the active flat object's heightmap image back to the compact store and free it"""
+    bl_idname = "oneill.store_heightmap"
+    bl_label = "Store Heightmap"
+    bl_options = {'REGISTER'}
+    
+    def execute(self, context):
+        obj = context.active_object
+        heightmap_name = obj.get("heightmap_image") if obj else None
+        image = bpy.data.images.get(heightmap_name) if heightmap_name else None
+        if not image:
+            self.report({'ERROR'}, "No expanded heightmap image for the active object")
+            return {'CANCELLED'}
+        
+        if not heightmap_store:
+            self.report({'ERROR'}, "Heightmap store not available")
+            return {'CANCELLED'}
+        
+        store = heightmap_store.get_heightmap_store()
+        path = store.from_image(image, heightmap_name, path=store.path_for_object(obj))
+        obj["heightmap_file"] = bpy.path.relpath(path) if bpy.data.filepath else path
+        bpy.data.images.remove(image)
+        
+        self.report({'INFO'}, f"Stored {heightmap_name} and released its image")
+        return {'FINISHED'}
+
 class ONEILL_OT_StartTerrainPainting(Operator):
     """Start terrain painting mode with SESSION 42 auto-preview automatically enabled"""
     bl_idname = "oneill.start_terrain_painting"
@@ -593,6 +832,22 @@ class ONEILL_OT_StartTerrainPainting(Operator):
             self.report({'ERROR'}, "No flat objects found. Complete steps 1-3 first.")
             return {'CANCELLED'}
         
+        # Size the canvas from ark geometry (texel density, capped by the memory budget)
+        plan = canvas_planner.plan_canvas(
+            flat_objects,
+            texels_per_metre=props.canvas_texels_per_metre,
+            memory_budget_mb=props.canvas_memory_budget,
+            allow_tiles=props.canvas_tiled and tiled_canvas is not None
+        )
+        print(f"📐 Canvas plan: {plan}")
+        if plan.budget_limited:
+            self.report({'WARNING'}, f"Canvas density reduced to {plan.texels_per_metre:.1f} texels/m to fit the memory budget")
+        
+        if plan.tiled:
+            return self.start_tiled_painting(context, flat_objects, plan)
+        if tiled_canvas:
+            tiled_canvas.set_tiled_canvas(None)
+        
         # CRITICAL: Apply Session 56 UV mapping fix BEFORE creating canvas
         self.apply_session_56_uv_mapping_fix(flat_objects)
             
@@ -603,13 +858,13 @@ class ONEILL_OT_StartTerrainPainting(Operator):
             
         canvas = bpy.data.images.new(
             canvas_name,
-            width=2400,
-            height=628,
+            width=plan.width,
+            height=plan.height,
             alpha=False
         )
         
         # Initialize canvas with BLACK color and Y-axis tiling guides
-        self.setup_canvas_with_tiling_guides(canvas)
+        self.setup_canvas_with_tiling_guides(canvas, len(flat_objects))
         
         # Setup painting workspace
         self.setup_painting_workspace(context, canvas)
@@ -623,92 +878,50 @@ class ONEILL_OT_StartTerrainPainting(Operator):
         self.report({'INFO'}, f"Painting mode active. Auto-preview will activate when you start painting.")
         return {'FINISHED'}
     
+    def start_tiled_painting(self, context, flat_objects, plan):
+        """Painting mode on a UDIM-style tiled canvas - one tile image per group of objects"""
+        props = context.scene.oneill_props
+        tiled = tiled_canvas.set_tiled_canvas(tiled_canvas.TiledCanvas(plan))
+        
+        # Objects land in their tile's slots; tile t owns U in [t, t + 1)
+        tiled.layout_uvs(flat_objects, normalize=True)
+        
+        images = tiled.ensure_tiles()
+        for image in images:
+            self.setup_canvas_with_tiling_guides(image, plan.objects_per_tile)
+            # Guides are the baseline; the tile's buffers come back when it is first painted
+            canvas_change_tracker.get_change_tracker(image).reset(canvas_buffer.get_canvas_buffer(image).read())
+            tiled.release_tile(image)
+        
+        self.setup_painting_workspace(context, images[0])
+        self.setup_tiled_canvas_monitor(flat_objects, tiled)
+        
+        props.painting_mode = True
+        
+        self.report({'INFO'}, f"Painting mode active on {plan.tile_count} canvas tiles. Auto-preview will activate when you start painting.")
+        return {'FINISHED'}
+    
     def apply_session_56_uv_mapping_fix(self, flat_objects):
         """Apply Session 56 UV mapping fix with Y-axis tiling - each object gets sequential canvas portion"""
         print("\n=== APPLYING SESSION 56 UV MAPPING FIX WITH Y-AXIS TILING ===")
         
-        # Sort objects by X position to match Session 56 approach
-        sorted_objects = sorted(flat_objects, key=lambda obj: obj.location.x)
-        total_objects = len(sorted_objects)
+        print(f"Fixing UV mapping for {len(flat_objects)} objects with Y-axis tiling...")
         
-        print(f"Fixing UV mapping for {total_objects} objects with Y-axis tiling...")
-        
-        for i, obj in enumerate(sorted_objects):
-            try:
-                mesh = obj.data
-                if not mesh.uv_layers:
-                    print(f"⚠️ No UV layer found on {obj.name}")
-                    continue
-                
-                uv_layer = mesh.uv_layers['UVMap']
-                
-                # Calculate SESSION 56 UV ranges - each object gets exactly 1/total_objects of canvas width
-                u_start = i / total_objects
-                u_end = (i + 1) / total_objects
-                u_width = u_end - u_start
-                
-                print(f"  Object {i+1} ({obj.name}): U=[{u_start:.6f}, {u_end:.6f}] with Y-tiling")
-                
-                # Get the current UV range to normalize from
-                current_us = [uv_layer.data[loop_index].uv[0] for loop_index in range(len(uv_layer.data))]
-                current_vs = [uv_layer.data[loop_index].uv[1] for loop_index in range(len(uv_layer.data))]
-                
-                current_u_min = min(current_us) if current_us else 0.0
-                current_u_max = max(current_us) if current_us else 1.0
-                current_u_range = current_u_max - current_u_min
-                
-                current_v_min = min(current_vs) if current_vs else 0.0
-                current_v_max = max(current_vs) if current_vs else 1.0
-                current_v_range = current_v_max - current_v_min
-                
-                # PHASE 1 FIX: Remove Y-axis padding for full edge-to-edge canvas access
-                # OLD: tiling_overlap = 0.05, v_scale = 1.05 (created 5% boundaries)
-                # NEW: v_scale = 1.0 (full 0.0-1.0 range utilization)
-                v_scale = 1.0  # Full edge-to-edge canvas access
-                
-                # Remap all UV coordinates to the correct canvas portion with Y-tiling
-                for poly in mesh.polygons:
-                    for loop_index in poly.loop_indices:
-                        current_uv = uv_layer.data[loop_index].uv
-                        local_u = current_uv[0]  # Current U coordinate
-                        local_v = current_uv[1]  # Current V coordinate
-                        
-                        # Normalize the local U coordinate (0-1 within object)
-                        if current_u_range > 0:
-                            normalized_u = (local_u - current_u_min) / current_u_range
-                        else:
-                            normalized_u = 0.0
-                        
-                        # Normalize the local V coordinate (0-1 within object)
-                        if current_v_range > 0:
-                            normalized_v = (local_v - current_v_min) / current_v_range
-                        else:
-                            normalized_v = 0.0
-                        
-                        # Map to correct portion of unified canvas
-                        global_u = u_start + (normalized_u * u_width)
-                        
-                        # FIXED: Full 0.0-1.0 range utilization (no more 5% boundaries)
-                        global_v = normalized_v * v_scale
-                        
-                        uv_layer.data[loop_index].uv = (global_u, global_v)
-                
-                # Update mesh
-                mesh.update()
-                print(f"✅ Fixed UV mapping for {obj.name} (portion {i+1}/{total_objects}) with Y-tiling")
-                
-            except Exception as e:
-                print(f"❌ Failed to fix UV mapping for {obj.name}: {e}")
+        # Each object gets exactly 1/total_objects of canvas width
+        # PHASE 1 FIX: current UV range normalised to full 0.0-1.0 V (no 5% boundaries)
+        uv_layout.get_uv_layout_engine().apply_canvas_layout(flat_objects, normalize=True)
         
         print(f"✅ SESSION 62 COMPLETE: Full edge-to-edge canvas access + smart Y-wrapping enabled")
     
-    def setup_canvas_with_tiling_guides(self, canvas):
-        """Initialize canvas with Y-axis tiling visual guides"""
-        width = canvas.size[0]  # 2400
-        height = canvas.size[1]  # 628
+    def setup_canvas_with_tiling_guides(self, canvas, object_count=None):
+        """Initialize canvas with Y-axis tiling visual guides
         
-        # Create base black canvas
-        pixels = [0.0, 0.0, 0.0, 1.0] * (width * height)
+        Guides are written as slice assignments on the shared (H, W, 4) canvas
+        buffer and pushed in one foreach_set. Object boundaries sit at the start
+        of each flat object's 1/N slot of the canvas width.
+        """
+        width = canvas.size[0]
+        height = canvas.size[1]
         
         # Calculate tiling zones
         tiling_overlap = 0.05  # 5% overlap (same as UV mapping)
@@ -716,35 +929,37 @@ class ONEILL_OT_StartTerrainPainting(Operator):
         tiling_zone_height = height - main_height  # ~31 pixels
         
         # Add visual guides for Y-axis tiling
-        guide_color = [0.1, 0.1, 0.2, 1.0]  # Dark blue for guides
-        tiling_color = [0.05, 0.1, 0.15, 1.0]  # Slightly lighter for tiling zone
+        guide_color = (0.1, 0.1, 0.2, 1.0)  # Dark blue for guides
+        tiling_color = (0.05, 0.1, 0.15, 1.0)  # Slightly lighter for tiling zone
+        center_color = (0.05, 0.05, 0.1, 1.0)
+        
+        if not object_count:
+            object_count = len([obj for obj in bpy.data.objects if obj.get("oneill_flat")]) or 1
+        boundary_columns = (np.arange(object_count) * width) // object_count
         
         print(f"Canvas setup: {width}x{height}, main area: {main_height}px, tiling zone: {tiling_zone_height}px")
         
-        for y in range(height):
-            for x in range(width):
-                pixel_index = (y * width + x) * 4
-                
-                # Tiling zone at bottom (will wrap to top)
-                if y >= main_height:
-                    pixels[pixel_index:pixel_index+4] = tiling_color
-                
-                # Add subtle vertical guides every 200 pixels (object boundaries)
-                elif x % 200 == 0:
-                    pixels[pixel_index:pixel_index+4] = guide_color
-                
-                # Add horizontal guide at main/tiling boundary
-                elif y == main_height - 1 or y == main_height - 2:
-                    pixels[pixel_index:pixel_index+4] = guide_color
-                
-                # Add subtle horizontal center line
-                elif y == height // 2 or y == height // 2 + 1:
-                    if x % 4 == 0:  # Dotted line
-                        pixels[pixel_index:pixel_index+4] = [0.05, 0.05, 0.1, 1.0]
+        buffer = canvas_buffer.get_canvas_buffer(canvas)
+        pixels = buffer.pixels
+        
+        # Create base black canvas, then paint guides from lowest to highest priority
+        pixels[:] = (0.0, 0.0, 0.0, 1.0)
+        
+        # Subtle horizontal center line (dotted)
+        pixels[height // 2:height // 2 + 2, ::4] = center_color
+        
+        # Horizontal guide at main/tiling boundary
+        pixels[max(main_height - 2, 0):main_height] = guide_color
+        
+        # Vertical guides at object boundaries (X-axis segments)
+        pixels[:main_height, boundary_columns] = guide_color
+        
+        # Tiling zone at bottom (will wrap to top)
+        pixels[main_height:] = tiling_color
         
         # Apply pixels to canvas
-        canvas.pixels = pixels
-        canvas.update()
+        buffer.mark_dirty()
+        buffer.commit()
         
         print("✅ Canvas initialized with Y-axis tiling guides")
         print("📋 Tiling Guide Legend:")
@@ -754,53 +969,78 @@ class ONEILL_OT_StartTerrainPainting(Operator):
         print("   • Center dots: Canvas center reference")
     
     def setup_canvas_monitor(self, flat_objects, canvas):
-        """Set up simplified canvas monitoring for auto-preview activation"""
-        # Store initial canvas state
-        initial_pixels = list(canvas.pixels[:])
-        auto_preview_activated = [False]  # Use list for mutable reference
+        """Set up simplified canvas monitoring for auto-preview activation
         
-        def check_canvas_for_painting():
-            try:
-                # Check if canvas has changed from initial state (SIMPLE CHECK ONLY)
-                current_pixels = canvas.pixels[:]
-                
-                # Look for any non-black pixels (painting detected)
-                painting_detected = False
-                for i in range(0, len(current_pixels), 4):
-                    r, g, b = current_pixels[i:i+3]
-                    if r > 0.01 or g > 0.01 or b > 0.01:  # Non-black pixel found
-                        painting_detected = True
-                        break
+        Subscribes to the shared event-driven canvas monitor; the subscription ends
+        itself once painting is detected. The guides already on the canvas are
+        taken as the baseline, so they never count as paint.
+        """
+        self.watch_canvases_for_painting(flat_objects, [canvas])
+        print("✅ Simplified canvas monitor started - waiting for painting activity...")
+    
+    def setup_tiled_canvas_monitor(self, flat_objects, tiled):
+        """Tiled-canvas variant of the monitor - only dirty, resident tile images are ever read"""
+        self.watch_canvases_for_painting(flat_objects, tiled.tile_images())
+        print(f"✅ Tiled canvas monitor started on {tiled.tile_count} tiles - waiting for painting activity...")
+    
+    def watch_canvases_for_painting(self, flat_objects, canvases):
+        """Activate auto-preview on the first paint stroke in any of the canvases"""
+        monitor = canvas_monitor.get_canvas_monitor()
+        keys = [f"auto_preview_activation:{canvas.name}" for canvas in canvases]
+        
+        def check_canvas_for_painting(canvas, changed_tiles):
+            # Look for any non-black pixels (painting detected) in the changed tiles only
+            pixels = canvas_buffer.get_canvas_buffer(canvas).pixels
+            tracker = canvas_change_tracker.get_change_tracker(canvas)
+            painting_detected = False
+            for tile_y, tile_x in changed_tiles:
+                rows, cols = tracker.tile_slices(tile_y, tile_x)
+                if (pixels[rows, cols, :3] > canvas_buffer.PAINT_THRESHOLD).any():
+                    painting_detected = True
+                    break
+            
+            if not painting_detected:
+                return True  # Keep watching
+            
+            print(f"✅ Painting detected on {canvas.name}! Activating auto-preview system...")
+            for key in keys:
+                monitor.unsubscribe(key)
+            
+            # The strips just painted start at full preview detail
+            if preview_lod:
+                preview_lod.get_preview_lod_manager().mark_painted(canvas, changed_tiles, flat_objects)
+            
+            # Activate the auto-preview system
+            success = self.apply_session_42_auto_preview(flat_objects, canvas)
+            if success:
+                print("✅ Auto-preview system activated successfully")
                 
-                if painting_detected and not auto_preview_activated[0]:
-                    print("✅ Painting detected! Activating auto-preview system...")
-                    auto_preview_activated[0] = True
-                    
-                    # Activate the auto-preview system
-                    success = self.apply_session_42_auto_preview(flat_objects, canvas)
-                    if success:
-                        print("✅ Auto-preview system activated successfully")
-                        
-                        # Force viewport update
-                        bpy.context.view_layer.update()
-                        for area in bpy.context.screen.areas:
-                            if area.type == 'VIEW_3D':
-                                area.tag_redraw()
+                # Chain preview health-checks onto every later canvas change
+                if terrain_pipeline:
+                    pipeline = terrain_pipeline.get_pipeline()
+                    tiled = tiled_canvas.get_tiled_canvas() if tiled_canvas else None
+                    if tiled:
+                        # One subscription per tile - stages only see the tile being painted
+                        tiled.bind_pipeline(pipeline, flat_objects)
                     else:
-                        print("❌ Auto-preview activation failed")
-                    
-                    return None  # Stop this monitor after activation
+                        pipeline.bind(canvas)
+                    if preview_lod:
+                        budget = bpy.context.scene.oneill_props.preview_vertex_budget
+                        pipeline.add_stage("preview_lod", preview_lod.get_preview_lod_manager().stage(flat_objects, budget))
+                    pipeline.activate_preview(flat_objects)
                 
-                # Continue monitoring if no painting detected yet
-                return 1.0  # Check less frequently to reduce interference
-                
-            except Exception as e:
-                print(f"❌ Canvas monitoring error: {e}")
-                return None  # Stop monitoring on error
+                # Force viewport update
+                bpy.context.view_layer.update()
+                for area in bpy.context.screen.areas:
+                    if area.type == 'VIEW_3D':
+                        area.tag_redraw()
+            else:
+                print("❌ Auto-preview activation failed")
+            
+            return False  # Stop this monitor after activation
         
-        # Start the canvas monitor
-        bpy.app.timers.register(check_canvas_for_painting, first_interval=1.0)
-        print("✅ Simplified canvas monitor started - waiting for painting activity...")
+        for key, canvas in zip(keys, canvases):
+            monitor.subscribe(key, canvas, check_canvas_for_painting)
     
     # REMOVED: update_canvas_tiling_visualization method was causing interference
     # Replaced with stroke_based_y_wrapping module for non-interfering Y-axis wrapping
@@ -815,10 +1055,21 @@ class ONEILL_OT_StartTerrainPainting(Operator):
             print("❌ Failed to get/create working node group")
             return False
         
-        # Connect canvas to node group
-        self.connect_canvas_to_node_group(working_node_group, canvas)
+        # Connect canvas to node group (one node group per tile on a tiled canvas)
+        tiled = tiled_canvas.get_tiled_canvas() if tiled_canvas else None
+        node_group_of = {}
+        if tiled:
+            tile_groups = self.connect_tiles_to_node_groups(working_node_group, tiled)
+            sorted_objects = sorted(flat_objects, key=lambda obj: obj.location.x)
+            for i, obj in enumerate(sorted_objects):
+                node_group_of[obj.name] = tile_groups[tiled.tile_of_object(i)[0]]
+        else:
+            self.connect_canvas_to_node_group(working_node_group, canvas)
         
         # Apply working modifier stack to all flat objects
+        # Adaptive preview LOD - unpainted/off-screen strips stay at level 0
+        levels = plan_preview_levels(flat_objects)
+        
         applied_count = 0
         for obj in flat_objects:
             try:
@@ -829,13 +1080,15 @@ class ONEILL_OT_StartTerrainPainting(Operator):
                 
                 # Apply SESSION 42 working modifier stack
                 
-                # 1. Preview_Subdivision (SUBSURF) - levels=2
+                # 1. Preview_Subdivision (SUBSURF) - level from the preview LOD plan
                 subsurf = obj.modifiers.new(name="Preview_Subdivision", type='SUBSURF')
-                subsurf.levels = 2
+                subsurf.levels = levels.get(obj.name, 2)
+                subsurf.show_viewport = subsurf.levels > 0
+                subsurf.render_levels = OUTPUT_SUBDIVISION_LEVEL  # Output never follows the camera
                 
                 # 2. Unified_Terrain (NODES) - working node group
                 geo_nodes = obj.modifiers.new(name="Unified_Terrain", type='NODES')
-                geo_nodes.node_group = working_node_group
+                geo_nodes.node_group = node_group_of.get(obj.name, working_node_group)
                 
                 applied_count += 1
                 print(f"✅ Applied SESSION 42 modifiers to {obj.name}")
@@ -966,6 +1219,23 @@ class ONEILL_OT_StartTerrainPainting(Operator):
             print("❌ Image Texture node or Image input not found")
             return False
     
+    def connect_tiles_to_node_groups(self, node_group, tiled):
+        """Per-tile copies of the working node group, each sampling its own tile image
+        
+        UVs carry the tile index as an integer U offset; the sampler's REPEAT
+        extension folds that back into the tile's 0-1 range.
+        """
+        tile_groups = []
+        for tile_index in range(tiled.tile_count):
+            group_name = f"{node_group.name}.{tiled.tile_number(tile_index)}"
+            tile_group = bpy.data.node_groups.get(group_name)
+            if tile_group is None:
+                tile_group = node_group.copy()
+                tile_group.name = group_name
+            self.connect_canvas_to_node_group(tile_group, tiled.tile_image(tile_index))
+            tile_groups.append(tile_group)
+        return tile_groups
+    
     def setup_painting_workspace(self, context, canvas):
         """Setup split workspace for painting - EXISTING WORKING CODE"""
         try:
@@ -1061,7 +1331,12 @@ class ONEILL_PT_MainPanel(Panel):
         step_box.label(text="Step 3: Create Heightmaps", icon='IMAGE_DATA')
         row = step_box.row()
         row.prop(props, "heightmap_resolution")
+        row = step_box.row()
+        row.prop(props, "heightmap_precision")
         step_box.operator("oneill.create_heightmaps", text="Create Heightmaps", icon='TEXTURE')
+        row = step_box.row(align=True)
+        row.operator("oneill.edit_heightmap", text="Edit", icon='IMAGE_DATA')
+        row.operator("oneill.store_heightmap", text="Store", icon='FILE_TICK')
         
         # Show heightmap status
         heightmap_objects = [obj for obj in flat_objects if obj.get("heightmap_image")]
@@ -1075,6 +1350,19 @@ class ONEILL_PT_MainPanel(Panel):
         paint_box.label(text="Step 4: Canvas Terrain Painting", icon='BRUSH_DATA')
         
         if not props.painting_mode:
+            col = paint_box.column(align=True)
+            col.prop(props, "canvas_texels_per_metre")
+            col.prop(props, "canvas_memory_budget")
+            col.prop(props, "canvas_tiled")
+            if flat_objects:
+                plan = canvas_planner.plan_canvas(
+                    flat_objects, props.canvas_texels_per_metre, props.canvas_memory_budget, allow_tiles=props.canvas_tiled
+                )
+                if plan.tiled:
+                    paint_box.label(text=f"Canvas: {plan.tile_count} tiles of {plan.tile_width}x{plan.height} "
+                                         f"({plan.resident_bytes / 2**20:.0f} MB resident)", icon='IMAGE_DATA')
+                else:
+                    paint_box.label(text=f"Canvas: {plan.width}x{plan.height} ({plan.memory_bytes / 2**20:.0f} MB)", icon='IMAGE_DATA')
             paint_box.operator("oneill.start_terrain_painting", 
                              text="🎨 Start Canvas Painting", 
                              icon='BRUSH_DATA')
@@ -1116,7 +1404,13 @@ class ONEILL_PT_MainPanel(Panel):
             
             paint_box.separator()
             
-            paint_box.label(text=f"Current Biome: {get_biome_display_name(props.current_biome)}"))
+            paint_box.label(text=f"Current Biome: {get_biome_display_name(props.current_biome)}")
+            
+            # Tiled canvas: dominant biome of the active strip, kept current per painted tile
+            tiled = tiled_canvas.get_tiled_canvas() if tiled_canvas else None
+            active = context.active_object
+            if tiled and active and active.name in tiled.biomes:
+                paint_box.label(text=f"Painted on {active.name}: {get_biome_display_name(tiled.biomes[active.name])}", icon='IMAGE_DATA')
             
             # Biome selection buttons - EXISTING WORKING CODE
             biome_box = paint_box.box()
@@ -1148,6 +1442,28 @@ class ONEILL_PT_MainPanel(Panel):
             # Show current biome
             current_display = get_biome_display_name(props.current_biome)
             biome_box.label(text=f"Current: {current_display}", icon='CHECKMARK')
+            
+            # Bake displacement into the meshes (multi-process)
+            bake_box = paint_box.box()
+            bake_box.label(text="Bake Terrain", icon='MOD_DISPLACE')
+            bake_box.prop(props, "bake_workers")
+            bake_box.label(text=f"Bakes at subdivision level {OUTPUT_SUBDIVISION_LEVEL} - {4 ** OUTPUT_SUBDIVISION_LEVEL}x the base vertices", icon='INFO')
+            bake_box.operator("oneill.bake_terrain", text="Bake All Flat Objects", icon='RENDER_STILL')
+        
+        layout.separator()
+        
+        # Step 5: Rewrap to Cylinders
+        step_box = layout.box()
+        step_box.label(text="Step 5: Rewrap to Cylinders", icon='MESH_CYLINDER')
+        step_box.prop(props, "rewrap_join_segments")
+        step_box.operator("oneill.rewrap_to_cylinders", text="Rewrap Terrain", icon='MOD_SIMPLEDEFORM')
+        
+        rewrapped_objects = [obj for obj in bpy.data.objects if obj.get("oneill_rewrapped")]
+        if rewrapped_objects:
+            step_box.label(text=f"✅ {len(rewrapped_objects)} cylinders rewrapped", icon='CHECKMARK')
+        
+        step_box.operator("oneill.export_ark", text="Export Ark (glTF/PLY/OBJ)", icon='EXPORT')
+        step_box.operator("oneill.export_heightmap_tiles", text="Export Heightmap Tiles", icon='IMAGE_DATA')
         
         layout.separator()
         
@@ -1159,6 +1475,8 @@ class ONEILL_PT_MainPanel(Panel):
         row.prop(props, "terrain_scale")
         row = advanced_box.row()
         row.prop(props, "noise_scale")
+        row = advanced_box.row()
+        row.prop(props, "preview_vertex_budget")
 
 # ========================= REGISTRATION =========================
 
@@ -1176,68 +1494,8 @@ class ONEILL_OT_ApplyUVMappingFix(Operator):
             self.report({'ERROR'}, "No flat objects found")
             return {'CANCELLED'}
         
-        # Apply the UV mapping fix with Y-axis tiling
-        sorted_objects = sorted(flat_objects, key=lambda obj: obj.location.x)
-        total_objects = len(sorted_objects)
-        
-        for i, obj in enumerate(sorted_objects):
-            try:
-                mesh = obj.data
-                if not mesh.uv_layers:
-                    continue
-                
-                uv_layer = mesh.uv_layers['UVMap']
-                
-                # Calculate UV ranges - each object gets exactly 1/total_objects of canvas width
-                u_start = i / total_objects
-                u_end = (i + 1) / total_objects
-                u_width = u_end - u_start
-                
-                # Get current UV range for both U and V
-                current_us = [uv_layer.data[loop_index].uv[0] for loop_index in range(len(uv_layer.data))]
-                current_vs = [uv_layer.data[loop_index].uv[1] for loop_index in range(len(uv_layer.data))]
-                
-                current_u_min = min(current_us) if current_us else 0.0
-                current_u_max = max(current_us) if current_us else 1.0
-                current_u_range = current_u_max - current_u_min
-                
-                current_v_min = min(current_vs) if current_vs else 0.0
-                current_v_max = max(current_vs) if current_vs else 1.0
-                current_v_range = current_v_max - current_v_min
-                
-                # PHASE 1 FIX: Full edge-to-edge canvas access
-                # Fixed to eliminate 5% boundaries
-                v_scale = 1.0  # Full 0.0-1.0 range utilization
-                
-                # Remap UV coordinates with Y-axis tiling
-                for poly in mesh.polygons:
-                    for loop_index in poly.loop_indices:
-                        current_uv = uv_layer.data[loop_index].uv
-                        local_u = current_uv[0]
-                        local_v = current_uv[1]
-                        
-                        # Normalize U coordinate
-                        if current_u_range > 0:
-                            normalized_u = (local_u - current_u_min) / current_u_range
-                        else:
-                            normalized_u = 0.0
-                        
-                        # Normalize V coordinate
-                        if current_v_range > 0:
-                            normalized_v = (local_v - current_v_min) / current_v_range
-                        else:
-                            normalized_v = 0.0
-                        
-                        # Apply FIXED mapping with full range utilization
-                        global_u = u_start + (normalized_u * u_width)
-                        global_v = normalized_v * v_scale  # Full 0.0-1.0 range
-                        
-                        uv_layer.data[loop_index].uv = (global_u, global_v)
-                
-                mesh.update()
-                
-            except Exception as e:
-                print(f"Failed to fix UV mapping for {obj.name}: {e}")
+        # Apply the UV mapping fix with Y-axis tiling - full edge-to-edge canvas access
+        uv_layout.get_uv_layout_engine().apply_canvas_layout(flat_objects, normalize=True, verbose=False)
         
         self.report({'INFO'}, f"SESSION 62: Edge-to-edge painting + smart Y-wrapping applied to {len(flat_objects)} objects")
         return {'FINISHED'}
@@ -1363,15 +1621,199 @@ class ONEILL_OT_SelectPaintingBiome(Operator):
         self.report({'INFO'}, f"Selected biome: {display_name}")
         return {'FINISHED'}
 
+class ONEILL_OT_BakeTerrain(Operator):
+    """Bake canvas displacement into every flat object's mesh using all CPU cores, at the output subdivision level"""
+    bl_idname = "oneill.bake_terrain"
+    bl_label = "Bake Terrain"
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    def execute(self, context):
+        props = context.scene.oneill_props
+        
+        if not batch_bake:
+            self.report({'ERROR'}, "Batch bake module not available")
+            return {'CANCELLED'}
+        
+        flat_objects = [obj for obj in bpy.data.objects if obj.get("oneill_flat")]
+        if not flat_objects:
+            self.report({'ERROR'}, "No flat objects found")
+            return {'CANCELLED'}
+        
+        unbaked = [obj for obj in flat_objects if not obj.get(batch_bake.BAKED_KEY)]
+        if not unbaked:
+            self.report({'WARNING'}, "All flat objects are already baked - unwrap again to re-bake")
+            return {'CANCELLED'}
+        
+        baked_count = batch_bake.bake_flat_objects(unbaked, workers=props.bake_workers or None)
+        if not baked_count:
+            self.report({'ERROR'}, "Nothing baked - start painting first so a canvas is connected")
+            return {'CANCELLED'}
+        
+        self.report({'INFO'}, f"Baked terrain into {baked_count} objects")
+        return {'FINISHED'}
+
+class ONEILL_OT_RewrapToCylinders(Operator):
+    """Map the displaced flat terrain back onto cylinder meshes"""
+    bl_idname = "oneill.rewrap_to_cylinders"
+    bl_label = "Rewrap to Cylinders"
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    def execute(self, context):
+        if not rewrap_engine:
+            self.report({'ERROR'}, "Rewrap engine not available")
+            return {'CANCELLED'}
+        
+        flat_objects = [obj for obj in bpy.data.objects if obj.get("oneill_flat")]
+        if not flat_objects:
+            self.report({'ERROR'}, "No flat objects to rewrap")
+            return {'CANCELLED'}
+        
+        rewrapped = rewrap_engine.get_rewrap_engine().rewrap_objects(flat_objects, context.collection)
+        if not rewrapped:
+            self.report({'ERROR'}, "Rewrap failed - see console")
+            return {'CANCELLED'}
+        
+        # Close the theta = 0/2pi seams and the cracks between segments
+        if seam_welder:
+            props = context.scene.oneill_props
+            welder = seam_welder.get_seam_welder()
+            welder.weld_ark(rewrapped, join=props.rewrap_join_segments, collection=context.collection)
+            if welder.failures:
+                self.report({'ERROR'}, f"Rewrapped {len(rewrapped)} objects, but {len(welder.failures)} welds failed: "
+                                       f"{welder.failures[0]} - see console")
+                return {'FINISHED'}
+        
+        self.report({'INFO'}, f"Rewrapped {len(rewrapped)} objects to cylinders")
+        return {'FINISHED'}
+
+class ONEILL_OT_ExportArk(Operator):
+    """Stream every ark segment to disk (one file per segment) with a manifest"""
+    bl_idname = "oneill.export_ark"
+    bl_label = "Export Ark"
+    bl_options = {'REGISTER'}
+    
+    directory: StringProperty(
+        name="Directory",
+        subtype='DIR_PATH'
+    )
+    
+    export_format: EnumProperty(
+        name="Format",
+        items=[
+            ('GLTF', 'glTF', 'One .gltf document with a binary buffer per segment'),
+            ('PLY', 'PLY', 'Binary PLY file per segment'),
+            ('OBJ', 'OBJ', 'Text OBJ file per segment'),
+        ],
+        default='GLTF'
+    )
+    
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+    
+    def execute(self, context):
+        if not ark_exporter:
+            self.report({'ERROR'}, "Ark exporter not available")
+            return {'CANCELLED'}
+        
+        objects = ark_exporter.ark_objects()
+        if not objects:
+            self.report({'ERROR'}, "Nothing to export - unwrap or rewrap the ark first")
+            return {'CANCELLED'}
+        
+        directory = bpy.path.abspath(self.directory)
+        manifest = ark_exporter.export_ark(directory, self.export_format, objects)
+        if manifest['failures']:
+            failure = manifest['failures'][0]
+            self.report({'ERROR'}, f"Exported {len(manifest['segments'])} segments, but {len(manifest['failures'])} "
+                                   f"failed: {failure['name']}: {failure['error']} - see console")
+            return {'FINISHED'}
+        self.report({'INFO'}, f"Exported {len(manifest['segments'])} segments "
+                              f"({manifest['total_vertices']} vertices) to {directory}")
+        return {'FINISHED'}
+
+class ONEILL_OT_ExportHeightmapTiles(Operator):
+    """Write the ark height field as tiled engine heightmaps with a LOD pyramid"""
+    bl_idname = "oneill.export_heightmap_tiles"
+    bl_label = "Export Heightmap Tiles"
+    bl_options = {'REGISTER'}
+    
+    directory: StringProperty(
+        name="Directory",
+        subtype='DIR_PATH'
+    )
+    
+    tile_format: EnumProperty(
+        name="Format",
+        items=[
+            ('R16', 'RAW 16-bit', 'Headerless little-endian uint16 tiles (Unreal/Unity)'),
+            ('PNG16', 'PNG 16-bit', 'Greyscale 16-bit PNG tiles'),
+            ('EXR', 'EXR Float', 'Single-channel float32 EXR tiles in metres'),
+        ],
+        default='R16'
+    )
+    
+    tile_size: IntProperty(
+        name="Tile Size",
+        description="Texels per tile, excluding the overlap border",
+        default=512,
+        min=64,
+        max=4096
+    )
+    
+    overlap: IntProperty(
+        name="Overlap",
+        description="Texels shared with each neighbouring tile",
+        default=1,
+        min=0,
+        max=16
+    )
+    
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+    
+    def execute(self, context):
+        if not heightmap_export:
+            self.report({'ERROR'}, "Heightmap export not available")
+            return {'CANCELLED'}
+        
+        flat_objects = [obj for obj in bpy.data.objects if obj.get("oneill_flat")]
+        if not flat_objects:
+            self.report({'ERROR'}, "No flat objects found - unwrap first")
+            return {'CANCELLED'}
+        
+        directory = bpy.path.abspath(self.directory)
+        try:
+            manifest = heightmap_export.export_heightmap_tiles(
+                directory, flat_objects,
+                resolution=int(context.scene.oneill_props.heightmap_resolution),
+                tile_format=self.tile_format,
+                tile_size=self.tile_size,
+                overlap=self.overlap
+            )
+        except Exception as e:
+            self.report({'ERROR'}, f"Heightmap export failed: {e}")
+            return {'CANCELLED'}
+        
+        self.report({'INFO'}, f"Exported {len(manifest['levels'])} LOD levels to {directory}")
+        return {'FINISHED'}
+
 classes = [
     OneillProperties,
     ONEILL_OT_AlignCylinders,
     ONEILL_OT_UnwrapToFlat,
     ONEILL_OT_CreateHeightmaps,
+    ONEILL_OT_EditHeightmap,
+    ONEILL_OT_StoreHeightmap,
     ONEILL_OT_StartTerrainPainting,
     ONEILL_OT_ApplyUVMappingFix,
     ONEILL_OT_EnhanceYWrapping,
     ONEILL_OT_SelectPaintingBiome,
+    ONEILL_OT_BakeTerrain,
+    ONEILL_OT_RewrapToCylinders,
+    ONEILL_OT_ExportArk,
+    ONEILL_OT_ExportHeightmapTiles,
     ONEILL_PT_MainPanel,
 ]
 
@@ -1393,7 +1835,13 @@ def register():
     bpy.types.Scene.oneill_props = bpy.props.PointerProperty(type=OneillProperties)
     
     # Initialize unified terrain system
-    bpy.types.Scene.oneill_terrain_system = UnifiedCanvasTerrainSystem()
+    terrain_system = UnifiedCanvasTerrainSystem()
+    bpy.types.Scene.oneill_terrain_system = terrain_system
+    
+    # One pipeline for the session - owns buffer, tracker, wrap engine and preview updater
+    if terrain_pipeline:
+        terrain_pipeline.register_pipeline(terrain_system.auto_preview_system)
+        print("✅ Canvas pipeline registered")
     
     # Register stroke-based Y-wrapping module
     if stroke_based_y_wrapping:
@@ -1449,6 +1897,17 @@ def unregister():
         stroke_based_y_wrapping.unregister()
         print("⏹️ Stroke-based Y-wrapping system unregistered")
     
+    # Release the pipeline, then stop the canvas monitor (depsgraph hook + fallback timer)
+    if terrain_pipeline:
+        terrain_pipeline.unregister_pipeline()
+    canvas_monitor.release_canvas_monitor()
+    
+    # Drop shared canvas buffers so no stale image references survive reload
+    canvas_buffer.release_canvas_buffers()
+    canvas_change_tracker.release_change_trackers()
+    if biome_map:
+        biome_map.release_biome_maps()
+    
     # Remove scene properties
     if hasattr(bpy.types.Scene, 'oneill_props'):
         del bpy.types.Scene.oneill_props
@@ -6,14 +6,126 @@ Contains specialized modules for enhanced spatial mapping and real-time monitori
 # Export commonly used components
 from .enhanced_spatial_mapping import (
     EnhancedSpatialMapping,
-    CanvasPersistenceManager,
     SpatialMappingIntegration
 )
+from .canvas_buffer import (
+    CanvasBuffer,
+    get_canvas_buffer
+)
+from .canvas_change_tracker import (
+    TileChangeTracker,
+    get_change_tracker
+)
+from .y_wrap_engine import (
+    YWrapEngine,
+    get_y_wrap_engine
+)
+from .uv_layout import (
+    UVLayoutEngine,
+    get_uv_layout_engine
+)
+from .bounds_service import (
+    WorldBoundsService,
+    get_bounds_service
+)
+from .biome_classifier import (
+    BiomeClassifier,
+    get_biome_classifier
+)
+from .biome_map import (
+    BiomeLabelMap,
+    get_biome_map
+)
+from .canvas_planner import (
+    CanvasPlanner,
+    plan_canvas
+)
+from .tiled_canvas import (
+    TiledCanvas,
+    get_tiled_canvas
+)
+from .canvas_monitor import (
+    CanvasMonitor,
+    get_canvas_monitor
+)
+from .terrain_pipeline import (
+    CanvasPipeline,
+    get_pipeline
+)
+from .displacement_probe import (
+    DisplacementProbe,
+    get_displacement_probe
+)
+from .terrain_evaluator import (
+    TerrainEvaluator,
+    verify_against_node_group
+)
+from .batch_bake import (
+    bake_offsets,
+    bake_flat_objects
+)
+from .preview_lod import (
+    PreviewLODManager,
+    get_preview_lod_manager
+)
+from .rewrap_engine import (
+    RewrapEngine,
+    get_rewrap_engine
+)
+from .seam_welder import (
+    SeamWelder,
+    get_seam_welder
+)
+from .ark_exporter import (
+    ArkExporter,
+    export_ark
+)
+from .heightmap_export import (
+    HeightmapTileExporter,
+    export_heightmap_tiles
+)
 
 __all__ = [
     'EnhancedSpatialMapping',
-    'CanvasPersistenceManager', 
-    'SpatialMappingIntegration'
+    'SpatialMappingIntegration',
+    'CanvasBuffer',
+    'get_canvas_buffer',
+    'TileChangeTracker',
+    'get_change_tracker',
+    'YWrapEngine',
+    'get_y_wrap_engine',
+    'UVLayoutEngine',
+    'get_uv_layout_engine',
+    'WorldBoundsService',
+    'get_bounds_service',
+    'BiomeClassifier',
+    'get_biome_classifier',
+    'BiomeLabelMap',
+    'get_biome_map',
+    'CanvasPlanner',
+    'plan_canvas',
+    'TiledCanvas',
+    'get_tiled_canvas',
+    'CanvasMonitor',
+    'get_canvas_monitor',
+    'CanvasPipeline',
+    'get_pipeline',
+    'DisplacementProbe',
+    'get_displacement_probe',
+    'TerrainEvaluator',
+    'verify_against_node_group',
+    'bake_offsets',
+    'bake_flat_objects',
+    'PreviewLODManager',
+    'get_preview_lod_manager',
+    'RewrapEngine',
+    'get_rewrap_engine',
+    'SeamWelder',
+    'get_seam_welder',
+    'ArkExporter',
+    'export_ark',
+    'HeightmapTileExporter',
+    'export_heightmap_tiles'
 ]
 
 print("📦 O'Neill Modules Package Loaded")
@@ -0,0 +1,244 @@
+"""
+O'Neill Terrain Generator - Streaming Ark Exporter
+Writes each ark segment's evaluated vertex/index buffers straight to disk (glTF, PLY or OBJ)
+One segment in memory at a time, plus a manifest of segment files and bounds
+"""
+
+import json
+import os
+
+import bpy
+import numpy as np
+
+try:
+    from . import mesh_arrays
+    from .preview_lod import output_levels
+except ImportError:
+    import mesh_arrays
+    from preview_lod import output_levels
+
+EXPORT_FORMATS = ('GLTF', 'PLY', 'OBJ')
+MANIFEST_NAME = "ark_manifest.json"
+GLTF_NAME = "ark.gltf"
+
+# glTF constants
+GLTF_FLOAT = 5126
+GLTF_UNSIGNED_INT = 5125
+GLTF_ARRAY_BUFFER = 34962
+GLTF_ELEMENT_ARRAY_BUFFER = 34963
+
+# Blender is Z-up, glTF is Y-up: (x, y, z) -> (x, z, -y)
+Z_UP_TO_Y_UP = np.array([[1.0, 0.0, 0.0],
+                         [0.0, 0.0, -1.0],
+                         [0.0, 1.0, 0.0]])
+
+
+def ark_objects():
+    """What to export: the joined ark, else rewrapped segments, else the flats (by X)"""
+    for key in ("oneill_rewrapped_ark", "oneill_rewrapped", "oneill_flat"):
+        objects = [obj for obj in bpy.data.objects if obj.get(key) and obj.type == 'MESH']
+        if objects:
+            return sorted(objects, key=lambda obj: obj.location.x)
+    return []
+
+def safe_name(name):
+    return "".join(char if char.isalnum() or char in "-_" else "_" for char in name)
+
+
+class ArkExporter:
+    """Streams evaluated segment meshes to one file per segment
+
+    Each segment is evaluated, read with foreach_get, transformed to world
+    space, written and released before the next one, so peak memory is one
+    segment. glTF segments share one .gltf document with a .bin buffer each;
+    PLY is binary little-endian; OBJ is plain text.
+
+    A segment that fails to export does not stop the others; it is recorded
+    in self.failures and in the manifest's 'failures' for the caller to report.
+    """
+
+    def __init__(self, directory, export_format='GLTF'):
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format: {export_format}")
+        self.directory = directory
+        self.export_format = export_format
+        self.segments = []
+        self.failures = []  # {'name', 'error'} per segment that failed in the last export()
+        self._gltf = None
+
+    # -------------------- segment arrays --------------------
+
+    def read_segment(self, obj, depsgraph):
+        """(positions (N, 3) float32, normals (N, 3) float32, triangles (T, 3) uint32) in world space"""
+        evaluated = obj.evaluated_get(depsgraph)
+        mesh = evaluated.to_mesh()
+        try:
+            coords = mesh_arrays.read_coords(mesh)
+            normals = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+            mesh.vertices.foreach_get('normal', normals)
+            triangles = mesh_arrays.read_triangles(mesh).astype(np.uint32)
+        finally:
+            evaluated.to_mesh_clear()
+
+        matrix = mesh_arrays.matrix_to_array(obj.matrix_world)
+        positions = mesh_arrays.transform_coords(coords, matrix)
+        normals = normals.reshape(-1, 3) @ np.linalg.inv(matrix[:3, :3])  # Inverse transpose
+        lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+        normals /= np.where(lengths > 0, lengths, 1.0)
+        return positions, normals, triangles
+
+    # -------------------- writers --------------------
+
+    def write_ply(self, name, positions, normals, triangles):
+        path = os.path.join(self.directory, f"{name}.ply")
+        vertex = np.empty(len(positions), dtype=[('p', '<f4', 3), ('n', '<f4', 3)])
+        vertex['p'] = positions
+        vertex['n'] = normals
+        face = np.empty(len(triangles), dtype=[('count', 'u1'), ('v', '<u4', 3)])
+        face['count'] = 3
+        face['v'] = triangles
+
+        header = (
+            "ply\nformat binary_little_endian 1.0\n"
+            f"comment O'Neill Terrain Generator segment {name}\n"
+            f"element vertex {len(positions)}\n"
+            "property float x\nproperty float y\nproperty float z\n"
+            "property float nx\nproperty float ny\nproperty float nz\n"
+            f"element face {len(triangles)}\n"
+            "property list uchar uint vertex_indices\nend_header\n"
+        )
+        with open(path, 'wb') as f:
+            f.write(header.encode('ascii'))
+            vertex.tofile(f)
+            face.tofile(f)
+        return path
+
+    def write_obj(self, name, positions, normals, triangles):
+        path = os.path.join(self.directory, f"{name}.obj")
+        with open(path, 'w') as f:
+            f.write(f"# O'Neill Terrain Generator segment {name}\no {name}\n")
+            np.savetxt(f, positions, fmt="v %.6f %.6f %.6f")
+            np.savetxt(f, normals, fmt="vn %.6f %.6f %.6f")
+            # Position and normal share the vertex index: f v//vn v//vn v//vn (1-based)
+            np.savetxt(f, np.repeat(triangles.astype(np.int64) + 1, 2, axis=1), fmt="f %d//%d %d//%d %d//%d")
+        return path
+
+    def write_gltf_buffer(self, name, positions, normals, triangles):
+        """Write the segment's .bin and register its accessors in the glTF document"""
+        gltf = self._gltf
+        path = os.path.join(self.directory, f"{name}.bin")
+
+        positions = (positions @ Z_UP_TO_Y_UP.T).astype(np.float32)
+        normals = (normals @ Z_UP_TO_Y_UP.T).astype(np.float32)
+        indices = np.ascontiguousarray(triangles, dtype=np.uint32)
+
+        with open(path, 'wb') as f:
+            positions.tofile(f)
+            normals.tofile(f)
+            indices.tofile(f)
+
+        buffer_index = len(gltf['buffers'])
+        gltf['buffers'].append({'uri': os.path.basename(path),
+                                'byteLength': positions.nbytes + normals.nbytes + indices.nbytes})
+
+        view_index = len(gltf['bufferViews'])
+        offset = 0
+        for data, target in ((positions, GLTF_ARRAY_BUFFER), (normals, GLTF_ARRAY_BUFFER),
+                             (indices, GLTF_ELEMENT_ARRAY_BUFFER)):
+            gltf['bufferViews'].append({'buffer': buffer_index, 'byteOffset': offset,
+                                        'byteLength': data.nbytes, 'target': target})
+            offset += data.nbytes
+
+        accessor_index = len(gltf['accessors'])
+        gltf['accessors'].extend([
+            {'bufferView': view_index, 'componentType': GLTF_FLOAT, 'count': len(positions), 'type': 'VEC3',
+             'min': positions.min(axis=0).tolist(), 'max': positions.max(axis=0).tolist()},
+            {'bufferView': view_index + 1, 'componentType': GLTF_FLOAT, 'count': len(normals), 'type': 'VEC3'},
+            {'bufferView': view_index + 2, 'componentType': GLTF_UNSIGNED_INT, 'count': int(indices.size), 'type': 'SCALAR'},
+        ])
+
+        mesh_index = len(gltf['meshes'])
+        gltf['meshes'].append({'name': name, 'primitives': [{
+            'attributes': {'POSITION': accessor_index, 'NORMAL': accessor_index + 1},
+            'indices': accessor_index + 2,
+        }]})
+        gltf['nodes'].append({'name': name, 'mesh': mesh_index})
+        gltf['scenes'][0]['nodes'].append(len(gltf['nodes']) - 1)
+        return path
+
+    # -------------------- driver --------------------
+
+    def export_segment(self, obj, depsgraph):
+        positions, normals, triangles = self.read_segment(obj, depsgraph)
+        name = safe_name(obj.name)
+
+        if self.export_format == 'PLY':
+            path = self.write_ply(name, positions, normals, triangles)
+        elif self.export_format == 'OBJ':
+            path = self.write_obj(name, positions, normals, triangles)
+        else:
+            path = self.write_gltf_buffer(name, positions, normals, triangles)
+
+        segment = {
+            'name': obj.name,
+            'file': os.path.basename(path),
+            'vertices': len(positions),
+            'triangles': len(triangles),
+            'bounds_min': positions.min(axis=0).tolist() if len(positions) else [0.0, 0.0, 0.0],
+            'bounds_max': positions.max(axis=0).tolist() if len(positions) else [0.0, 0.0, 0.0],
+            'cylinder_radius': float(obj.get("cylinder_radius", 0.0)),
+            'cylinder_length': float(obj.get("cylinder_length", 0.0)),
+        }
+        self.segments.append(segment)
+        return segment
+
+    def export(self, objects=None):
+        """Export every segment, then the glTF document (if any) and the manifest"""
+        objects = ark_objects() if objects is None else objects
+        os.makedirs(self.directory, exist_ok=True)
+        self.segments = []
+        self.failures = []
+        if self.export_format == 'GLTF':
+            self._gltf = {
+                'asset': {'version': '2.0', 'generator': "O'Neill Terrain Generator"},
+                'scene': 0, 'scenes': [{'nodes': []}], 'nodes': [], 'meshes': [],
+                'accessors': [], 'bufferViews': [], 'buffers': [],
+            }
+
+        # Unbaked flats carry the preview LOD - export them at the fixed output level
+        with output_levels(objects):
+            depsgraph = bpy.context.evaluated_depsgraph_get()
+            for obj in objects:
+                try:
+                    segment = self.export_segment(obj, depsgraph)
+                    print(f"✅ Exported {segment['name']}: {segment['vertices']} vertices -> {segment['file']}")
+                except Exception as e:
+                    print(f"❌ Failed to export {obj.name}: {e}")
+                    self.failures.append({'name': obj.name, 'error': str(e)})
+
+        if self._gltf is not None:
+            with open(os.path.join(self.directory, GLTF_NAME), 'w') as f:
+                json.dump(self._gltf, f)
+            self._gltf = None
+
+        manifest = {
+            'format': self.export_format,
+            'document': GLTF_NAME if self.export_format == 'GLTF' else None,
+            'coordinate_system': 'Blender world, Z-up, metres (glTF files are Y-up)',
+            'segments': self.segments,
+            'failures': self.failures,
+            'total_vertices': sum(segment['vertices'] for segment in self.segments),
+            'total_triangles': sum(segment['triangles'] for segment in self.segments),
+        }
+        with open(os.path.join(self.directory, MANIFEST_NAME), 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+        print(f"✅ Ark export complete: {len(self.segments)} segments, {manifest['total_vertices']} vertices")
+        if self.failures:
+            print(f"❌ {len(self.failures)} segments failed to export - the export is incomplete")
+        return manifest
+
+
+def export_ark(directory, export_format='GLTF', objects=None):
+    """Export the ark to a directory - returns the manifest dict"""
+    return ArkExporter(directory, export_format).export(objects)
@@ -0,0 +1,293 @@
+"""
+O'Neill Terrain Generator - Multi-Process Terrain Bake
+Evaluates the terrain displacement of every flat object in a ProcessPoolExecutor
+Canvases go to the workers once through shared memory; per-object arrays are chunked
+"""
+
+import importlib
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+try:
+    from .terrain_evaluator import TerrainEvaluator, linear_canvas
+except ImportError:
+    from terrain_evaluator import TerrainEvaluator, linear_canvas
+
+NODE_GROUP_NAME = "Unified_Multi_Biome_Terrain.001"
+BAKED_MODIFIERS = ("Preview_Subdivision", "Unified_Terrain")
+BAKED_KEY = "terrain_baked"  # Stamped on baked objects so a second bake cannot add the offsets again
+
+# Below this many vertices in total, spawning workers costs more than it saves
+MIN_PARALLEL_VERTICES = 200000
+CHUNKS_PER_WORKER = 4
+
+
+class SharedCanvas:
+    """A linear float32 (H, W, 4) canvas copied once into a shared-memory block"""
+
+    def __init__(self, pixels, srgb=True):
+        shape = tuple(pixels.shape)
+        self.shape = shape
+        self.memory = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)) * 4)
+        view = np.ndarray(shape, dtype=np.float32, buffer=self.memory.buf)
+        view[:] = linear_canvas(pixels, np.float32) if srgb else pixels
+        del view
+
+    @property
+    def name(self):
+        return self.memory.name
+
+    def release(self):
+        self.memory.close()
+        self.memory.unlink()
+
+
+# ========================= WORKER SIDE (no bpy) =========================
+
+_worker_canvases = {}    # canvas key -> (SharedMemory, spec) kept alive for the views
+_worker_evaluators = {}  # canvas key -> TerrainEvaluator
+
+def _init_worker(canvas_specs):
+    """Pool initializer - remember where each canvas lives; attach lazily"""
+    _worker_canvases.clear()
+    _worker_evaluators.clear()
+    for key, spec in canvas_specs.items():
+        _worker_canvases[key] = (None, spec)
+
+def _evaluator(key):
+    evaluator = _worker_evaluators.get(key)
+    if evaluator is None:
+        memory, spec = _worker_canvases[key]
+        if memory is None:
+            memory = shared_memory.SharedMemory(name=spec['memory'])
+            _worker_canvases[key] = (memory, spec)
+        pixels = np.ndarray(spec['shape'], dtype=np.float32, buffer=memory.buf)
+        evaluator = TerrainEvaluator(pixels, srgb=False, ramp=spec['ramp'],
+                                     noise=spec['noise'], period=spec['period'])
+        _worker_evaluators[key] = evaluator
+    return evaluator
+
+def _bake_chunk(job):
+    """(job_id, start, canvas_key, positions, uvs) -> (job_id, start, z offsets)"""
+    job_id, start, key, positions, uvs = job
+    return job_id, start, _evaluator(key).displacement(positions, uvs).astype(np.float32)
+
+
+# ========================= SCHEDULING =========================
+
+def _worker_module():
+    """This module imported as a top-level name
+
+    Spawned workers unpickle functions by module path; importing the add-on
+    package there would pull in bpy, so workers load batch_bake directly from
+    the modules directory (sys.path is handed to spawned children).
+    """
+    directory = os.path.dirname(os.path.abspath(__file__))
+    if directory not in sys.path:
+        sys.path.insert(0, directory)
+    return importlib.import_module("batch_bake")
+
+def partition_jobs(jobs, workers):
+    """Split (job_id, canvas_key, positions, uvs) jobs into ~CHUNKS_PER_WORKER chunks per worker"""
+    total = sum(len(positions) for _, _, positions, _ in jobs)
+    chunk_size = max(1024, -(-total // max(workers * CHUNKS_PER_WORKER, 1)))
+
+    chunks = []
+    for job_id, key, positions, uvs in jobs:
+        for start in range(0, len(positions), chunk_size):
+            chunks.append((job_id, start, key,
+                           positions[start:start + chunk_size], uvs[start:start + chunk_size]))
+    return chunks
+
+def bake_offsets(jobs, canvases, workers=None):
+    """Z offsets for every job - {job_id: (N,) float32}
+
+    jobs: [(job_id, canvas_key, positions (N, 3), uvs (N, 2))]
+    canvases: {canvas_key: {'pixels', 'srgb', 'ramp', 'noise', 'period'}}
+    workers: process count (None/0 = all cores, 1 = in-process)
+    """
+    workers = workers or os.cpu_count() or 1
+    results = {job_id: np.empty(len(positions), dtype=np.float32) for job_id, _, positions, _ in jobs}
+    total = sum(len(positions) for _, _, positions, _ in jobs)
+
+    if workers <= 1 or total < MIN_PARALLEL_VERTICES:
+        for job_id, key, positions, uvs in jobs:
+            settings = canvases[key]
+            evaluator = TerrainEvaluator(settings['pixels'], srgb=settings.get('srgb', True),
+                                         ramp=settings.get('ramp'), noise=settings.get('noise'),
+                                         period=settings.get('period'))
+            results[job_id][:] = evaluator.displacement(positions, uvs)
+        return results
+
+    shared = {}
+    try:
+        specs = {}
+        for key, settings in canvases.items():
+            shared[key] = SharedCanvas(settings['pixels'], settings.get('srgb', True))
+            specs[key] = {
+                'memory': shared[key].name,
+                'shape': shared[key].shape,
+                'ramp': settings.get('ramp'),
+                'noise': settings.get('noise'),
+                'period': settings.get('period'),
+            }
+
+        module = _worker_module()
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                 initializer=module._init_worker, initargs=(specs,)) as pool:
+            for job_id, start, offsets in pool.map(module._bake_chunk, partition_jobs(jobs, workers)):
+                results[job_id][start:start + len(offsets)] = offsets
+    finally:
+        for canvas in shared.values():
+            canvas.release()
+
+    return results
+
+
+# ========================= BLENDER SIDE =========================
+
+def _object_node_group(obj):
+    import bpy
+
+    modifier = obj.modifiers.get("Unified_Terrain")
+    if modifier is not None and modifier.node_group is not None:
+        return modifier.node_group
+    return bpy.data.node_groups.get(NODE_GROUP_NAME)
+
+def _replace_mesh(obj, mesh):
+    """Swap in the baked mesh, keeping materials and the old datablock name"""
+    import bpy
+
+    old_mesh = obj.data
+    for material in old_mesh.materials:
+        mesh.materials.append(material)
+    name = old_mesh.name
+    obj.data = mesh
+    if old_mesh.users == 0:
+        bpy.data.meshes.remove(old_mesh)
+        mesh.name = name
+
+def output_grid(obj, positions, uvs, factor):
+    """obj's base grid subdivided factor times per axis - None without grid topology
+
+    Returns (positions (V, 3), uvs (V, 2), quads (F, 4), segments_x, segments_y)
+    of a grid_plane_arrays() layout, interpolated from the base grid vertices.
+    """
+    try:
+        from . import mesh_arrays
+    except ImportError:
+        import mesh_arrays
+
+    segments_x = int(obj.get("grid_segments_x", 0))
+    segments_y = int(obj.get("grid_segments_y", 0))
+    if not segments_x or not segments_y or len(positions) != (segments_x + 1) * (segments_y + 1):
+        return None
+    index = mesh_arrays.grid_vertex_index(positions, segments_x, segments_y,
+                                          float(obj.get("cylinder_length", 2.0)),
+                                          2 * np.pi * float(obj.get("cylinder_radius", 1.0)))
+    if index is None:
+        return None
+
+    grid = np.empty((len(positions), 5), dtype=np.float64)
+    grid[index, :3] = positions
+    grid[index, 3:] = uvs
+    fine = mesh_arrays.upsample_grid(grid.reshape(segments_y + 1, segments_x + 1, 5), factor).reshape(-1, 5)
+    _, quads = mesh_arrays.grid_plane_arrays(segments_x * factor, segments_y * factor, 1.0, 1.0)
+    return fine[:, :3], fine[:, 3:], quads, segments_x * factor, segments_y * factor
+
+def bake_flat_objects(flat_objects, workers=None, period=None, remove_modifiers=True):
+    """Bake displacement of the flat objects into their meshes - returns the baked count
+
+    Each object is evaluated with its own Unified_Terrain node group (one per
+    tile on a tiled canvas) at the live output detail: the base grid is
+    subdivided 2**OUTPUT_LEVEL times per axis (what Preview_Subdivision gives
+    at OUTPUT_LEVEL), evaluated, and rebuilt as a new grid mesh whose
+    grid_segments_x/y describe the finer grid. Objects without grid topology
+    are baked on their own vertices. The preview modifiers are removed, since
+    the result now lives in the mesh.
+
+    Baked objects are stamped with BAKED_KEY and skipped on later calls: once
+    the modifiers are gone the global node group would otherwise displace the
+    already displaced Z a second time.
+    """
+    try:
+        from . import mesh_arrays
+        from . import terrain_evaluator
+        from .canvas_buffer import snapshot_canvas
+        from .preview_lod import OUTPUT_LEVEL
+    except ImportError:
+        import mesh_arrays
+        import terrain_evaluator
+        from canvas_buffer import snapshot_canvas
+        from preview_lod import OUTPUT_LEVEL
+
+    jobs = []
+    canvases = {}
+    baked_objects = {}
+
+    for obj in flat_objects:
+        if obj.get(BAKED_KEY):
+            print(f"⚠️ {obj.name} is already baked - skipped")
+            continue
+
+        node_group = _object_node_group(obj)
+        sampler = node_group.nodes.get("Unified_Canvas_Sampler") if node_group else None
+        image = sampler.inputs['Image'].default_value if sampler else None
+        if image is None:
+            print(f"⚠️ No canvas connected for {obj.name} - skipped")
+            continue
+
+        if node_group.name not in canvases:
+            canvases[node_group.name] = {
+                'pixels': snapshot_canvas(image),
+                'srgb': terrain_evaluator.image_is_srgb(image),
+                'ramp': terrain_evaluator.ramp_params(node_group),
+                'noise': terrain_evaluator.noise_params(node_group),
+                'period': period,
+            }
+
+        try:
+            positions, uvs = terrain_evaluator.read_object_inputs(obj)
+        except ValueError as e:
+            print(f"⚠️ {e} - skipped")
+            continue
+
+        grid = output_grid(obj, positions, uvs, 2 ** OUTPUT_LEVEL)
+        if grid is None:
+            print(f"⚠️ {obj.name} has no grid topology - baked on its base vertices")
+        else:
+            positions, uvs = grid[:2]
+
+        jobs.append((obj.name, node_group.name, positions, uvs))
+        baked_objects[obj.name] = (obj, positions, grid)
+
+    if not jobs:
+        return 0
+
+    print(f"🔥 Baking {len(jobs)} objects ({sum(len(job[2]) for job in jobs)} vertices) "
+          f"on {workers or os.cpu_count()} workers...")
+    offsets = bake_offsets(jobs, canvases, workers)
+
+    for name, (obj, positions, grid) in baked_objects.items():
+        positions[:, 2] += offsets[name]
+        if grid is None:
+            mesh_arrays.write_coords(obj.data, positions)
+        else:
+            _, uvs, quads, segments_x, segments_y = grid
+            _replace_mesh(obj, mesh_arrays.build_mesh(obj.data.name, positions, quads, uvs[quads.ravel()]))
+            obj["grid_segments_x"] = segments_x
+            obj["grid_segments_y"] = segments_y
+        obj[BAKED_KEY] = True
+
+        if remove_modifiers:
+            for modifier in [mod for mod in obj.modifiers if mod.name in BAKED_MODIFIERS]:
+                obj.modifiers.remove(modifier)
+
+    print(f"✅ Baked terrain into {len(baked_objects)} objects")
+    return len(baked_objects)
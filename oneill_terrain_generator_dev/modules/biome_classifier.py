@@ -0,0 +1,123 @@
+"""
+O'Neill Terrain Generator - Biome Colour Classifier
+Quantised RGB -> biome lookup table built once from the painting palette
+Classifies a whole canvas or any sample set with a single NumPy fancy-index
+"""
+
+import numpy as np
+
+# Painting palette - same colours the biome selector puts on the brush
+BIOME_COLORS = {
+    'MOUNTAINS': (0.5, 0.5, 0.5),    # Gray
+    'OCEAN': (0.1, 0.3, 0.8),        # Deep blue
+    'ARCHIPELAGO': (0.2, 0.8, 0.9),  # Light blue/cyan
+    'CANYONS': (0.8, 0.4, 0.2),      # Orange-red
+    'HILLS': (0.4, 0.8, 0.3),        # Green
+    'DESERT': (0.9, 0.8, 0.4),       # Sandy yellow
+}
+
+FLAT_LABEL = 0  # Unpainted or too far from every palette colour
+AMBIGUOUS_LABEL = 255  # LUT bin straddles a decision boundary - resolved exactly
+MAX_COLOR_DISTANCE = 0.4
+UNPAINTED_THRESHOLD = 0.02
+
+
+class BiomeClassifier:
+    """Nearest-palette-colour classification through a bins^3 lookup table
+
+    Label 0 is 'FLAT'; label i + 1 is the i-th palette biome. The table stores
+    the nearest biome for each RGB bin (or FLAT beyond max_distance), so
+    classification costs one quantise + one index per pixel regardless of palette
+    size. Near-black is checked exactly so faint strokes stay unpainted.
+    """
+
+    def __init__(self, biome_colors=None, bins=64, max_distance=MAX_COLOR_DISTANCE,
+                 unpainted_threshold=UNPAINTED_THRESHOLD):
+        self.biome_colors = dict(biome_colors or BIOME_COLORS)
+        self.bins = bins
+        self.max_distance = max_distance
+        self.unpainted_threshold = unpainted_threshold
+
+        self.labels = ['FLAT'] + list(self.biome_colors)
+        self.label_of = {name: index for index, name in enumerate(self.labels)}
+        self.palette = np.array(list(self.biome_colors.values()), dtype=np.float32)
+        self.lut = self._build_lut()
+
+    def _build_lut(self):
+        """Flat (bins^3,) uint8 table indexed by (r * bins + g) * bins + b
+
+        A bin whose colours could land on either side of a decision boundary
+        (nearest biome or the max_distance cut-off) is stored as AMBIGUOUS_LABEL
+        and resolved exactly per pixel, so results match the brute-force search.
+        """
+        centres = (np.arange(self.bins, dtype=np.float32) + 0.5) / self.bins
+        r, g, b = np.meshgrid(centres, centres, centres, indexing='ij')
+        colors = np.stack((r.ravel(), g.ravel(), b.ravel()), axis=1)
+
+        distances = self._palette_distances(colors)
+        order = np.sort(distances, axis=1)
+        nearest = distances.argmin(axis=1)
+
+        # Every colour in a bin lies within half a bin diagonal of its centre
+        radius = np.sqrt(3.0) / (2 * self.bins)
+        closest = order[:, 0]
+        second = order[:, 1] if order.shape[1] > 1 else np.full_like(closest, np.inf)
+        certainly_flat = closest - radius > self.max_distance
+        certainly_biome = (closest + radius < self.max_distance) & (second - closest > 2 * radius)
+        certain = certainly_flat | certainly_biome
+
+        lut = np.where(closest < self.max_distance, nearest + 1, FLAT_LABEL).astype(np.uint8)
+        lut[~certain] = AMBIGUOUS_LABEL
+        return lut
+
+    def _palette_distances(self, colors):
+        """(N, 3) colours -> (N, biomes) Euclidean distances to the palette"""
+        return np.sqrt(((colors[:, None, :] - self.palette[None, :, :]) ** 2).sum(axis=2))
+
+    def _classify_exact(self, colors):
+        """Brute-force nearest palette colour for the few pixels in ambiguous bins"""
+        distances = self._palette_distances(colors.astype(np.float32))
+        nearest = distances.argmin(axis=1)
+        within = distances[np.arange(len(colors)), nearest] < self.max_distance
+        return np.where(within, nearest + 1, FLAT_LABEL).astype(np.uint8)
+
+    def quantize(self, rgb):
+        """(..., 3+) colours -> (...,) flat LUT indices"""
+        bins = self.bins
+        q = np.clip((np.asarray(rgb)[..., :3] * bins).astype(np.int32), 0, bins - 1)
+        return (q[..., 0] * bins + q[..., 1]) * bins + q[..., 2]
+
+    def classify(self, rgb):
+        """(..., 3+) colours (RGB or RGBA) -> (...,) uint8 biome labels"""
+        rgb = np.asarray(rgb)
+        labels = self.lut[self.quantize(rgb)]
+
+        ambiguous = labels == AMBIGUOUS_LABEL
+        if ambiguous.any():
+            labels[ambiguous] = self._classify_exact(rgb[..., :3][ambiguous])
+
+        unpainted = (rgb[..., :3] < self.unpainted_threshold).all(axis=-1)
+        labels[unpainted] = FLAT_LABEL
+        return labels
+
+    def classify_color(self, r, g, b):
+        """Biome name for a single colour"""
+        return self.labels[int(self.classify(np.array([(r, g, b)], dtype=np.float32))[0])]
+
+    def histogram(self, labels):
+        """Pixel count per label as an (n_labels,) int64 array"""
+        return np.bincount(np.asarray(labels).ravel(), minlength=len(self.labels))
+
+    def name_for(self, label):
+        return self.labels[int(label)]
+
+
+# Global classifier instance for integration
+_biome_classifier = None
+
+def get_biome_classifier():
+    """Get global biome classifier instance (default palette)"""
+    global _biome_classifier
+    if _biome_classifier is None:
+        _biome_classifier = BiomeClassifier()
+    return _biome_classifier
@@ -0,0 +1,125 @@
+"""
+O'Neill Terrain Generator - Whole-Canvas Biome Label Map
+Classifies the painting canvas once into a uint8 label image and keeps it current
+Per-object biome histograms come from np.bincount over each object's U strip
+"""
+
+import numpy as np
+
+try:
+    from .canvas_buffer import get_canvas_buffer
+    from .canvas_change_tracker import get_change_tracker
+    from .biome_classifier import FLAT_LABEL, get_biome_classifier
+except ImportError:
+    from canvas_buffer import get_canvas_buffer
+    from canvas_change_tracker import get_change_tracker
+    from biome_classifier import FLAT_LABEL, get_biome_classifier
+
+# Above this share of changed tiles one full reclassification beats per-tile work
+FULL_REFRESH_RATIO = 0.5
+
+
+class BiomeLabelMap:
+    """(H, W) uint8 biome labels for one canvas, refreshed from dirty tiles only
+
+    The map remembers the change-tracker generation it last consumed; refresh()
+    reclassifies just the tiles stamped since then. Strip histograms are cached
+    per slot count until the labels change again.
+    """
+
+    def __init__(self, classifier=None):
+        self.classifier = classifier or get_biome_classifier()
+        self.labels = None
+        self.generation = -1
+        self._strip_cache = {}
+
+    def refresh(self, image):
+        """Bring the labels up to date with the image - returns the (H, W) label array"""
+        buffer = get_canvas_buffer(image)
+        pixels = buffer.read()
+        tracker = get_change_tracker(image)
+        tiles, generation = tracker.poll(pixels, self.generation)
+
+        if self.labels is None or self.labels.shape != pixels.shape[:2]:
+            self.labels = self.classifier.classify(pixels)
+        elif len(tiles) == 0:
+            return self.labels
+        elif len(tiles) > FULL_REFRESH_RATIO * tracker.tiles_x * tracker.tiles_y:
+            self.labels[:] = self.classifier.classify(pixels)
+        else:
+            for tile_y, tile_x in tiles:
+                rows, cols = tracker.tile_slices(tile_y, tile_x)
+                self.labels[rows, cols] = self.classifier.classify(pixels[rows, cols])
+
+        self.generation = generation
+        self._strip_cache.clear()
+        return self.labels
+
+    def strip_histograms(self, slot_count):
+        """(slot_count, n_labels) pixel counts for equal-width U strips, left to right
+
+        Column x belongs to strip x * slot_count // width, matching the
+        [i/N, (i+1)/N] slots of the UV layout. One bincount covers every strip.
+        """
+        cached = self._strip_cache.get(slot_count)
+        if cached is not None:
+            return cached
+
+        height, width = self.labels.shape
+        label_count = len(self.classifier.labels)
+        strip_of_column = (np.arange(width) * slot_count // width).astype(np.int64)
+
+        keys = strip_of_column[None, :] * label_count + self.labels
+        counts = np.bincount(keys.ravel(), minlength=slot_count * label_count)
+        histograms = counts.reshape(slot_count, label_count)
+
+        self._strip_cache[slot_count] = histograms
+        return histograms
+
+    def region_histogram(self, min_x, max_x, min_y, max_y):
+        """Label counts inside an inclusive pixel rectangle"""
+        region = self.labels[max(min_y, 0):max_y + 1, max(min_x, 0):max_x + 1]
+        return self.classifier.histogram(region)
+
+    def dominant_biome(self, histogram):
+        """(biome_name, confidence %) - the most common painted biome, else FLAT"""
+        total = int(histogram.sum())
+        if total == 0:
+            return 'FLAT', 0.0
+
+        painted = histogram.copy()
+        painted[FLAT_LABEL] = 0
+        if painted.any():
+            label = int(painted.argmax())
+        else:
+            label = FLAT_LABEL
+        return self.classifier.name_for(label), histogram[label] / total * 100
+
+    def distribution(self, histogram):
+        """{biome_name: count} for the non-empty labels of a histogram"""
+        return {self.classifier.name_for(label): int(count)
+                for label, count in enumerate(histogram) if count}
+
+    def dominant_biomes(self, slot_count):
+        """Dominant biome name for every strip, left to right"""
+        return [self.dominant_biome(histogram)[0] for histogram in self.strip_histograms(slot_count)]
+
+
+# Global label maps keyed by image name - shared like the canvas buffers
+_biome_maps = {}
+
+def get_biome_map(image):
+    """Get the shared label map for an image"""
+    biome_map = _biome_maps.get(image.name)
+    if biome_map is None:
+        biome_map = BiomeLabelMap()
+        _biome_maps[image.name] = biome_map
+    return biome_map
+
+def release_biome_map(image):
+    """Drop one image's label map"""
+    return _biome_maps.pop(image.name, None) is not None
+
+def release_biome_maps():
+    """Drop all shared label maps"""
+    _biome_maps.clear()
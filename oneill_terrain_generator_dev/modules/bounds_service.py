@@ -0,0 +1,89 @@
+"""
+O'Neill Terrain Generator - World-Space Bounds Service
+Cached world AABBs for cylinder segments
+Uses bound_box when the transform keeps the box exact, otherwise one foreach_get + matrix multiply
+"""
+
+import numpy as np
+
+try:
+    from . import mesh_arrays
+except ImportError:
+    import mesh_arrays
+
+
+class WorldBoundsService:
+    """World-space axis-aligned bounds with a per-object cache
+
+    Cache entries are keyed on the mesh data pointer, its vertex count and the
+    object's matrix_world, so moving or re-meshing an object invalidates its entry.
+    """
+
+    def __init__(self):
+        self._cache = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _cache_key(self, obj, matrix):
+        mesh = obj.data
+        return (mesh.as_pointer(), len(mesh.vertices), matrix.tobytes())
+
+    def _box_is_exact(self, obj, matrix):
+        """True if transforming bound_box corners gives the exact vertex AABB
+
+        bound_box is the evaluated local box, so it only matches the base mesh
+        without modifiers or shape keys. The linear part must map axes onto axes
+        (at most one non-zero per row) or the transformed box over-estimates.
+        """
+        if obj.modifiers or obj.data.shape_keys:
+            return False
+        linear = matrix[:3, :3]
+        return bool((np.count_nonzero(np.abs(linear) > 1e-12, axis=1) <= 1).all())
+
+    def world_bounds(self, obj):
+        """Return (min_xyz, max_xyz) float64 arrays in world space"""
+        matrix = mesh_arrays.matrix_to_array(obj.matrix_world)
+        key = self._cache_key(obj, matrix)
+
+        cached = self._cache.get(obj.name)
+        if cached and cached[0] == key:
+            self.hits += 1
+            return cached[1]
+
+        self.misses += 1
+        if self._box_is_exact(obj, matrix):
+            points = mesh_arrays.transform_coords(np.array(obj.bound_box, dtype=np.float64), matrix)
+        else:
+            points = mesh_arrays.read_world_coords(obj)
+
+        if len(points):
+            bounds = (points.min(axis=0), points.max(axis=0))
+        else:
+            origin = matrix[:3, 3].copy()
+            bounds = (origin, origin.copy())
+
+        self._cache[obj.name] = (key, bounds)
+        return bounds
+
+    def axis_bounds(self, obj, axis_idx=0):
+        """Return (min, max) along one world axis as floats"""
+        minimum, maximum = self.world_bounds(obj)
+        return float(minimum[axis_idx]), float(maximum[axis_idx])
+
+    def invalidate(self, obj=None):
+        """Forget cached bounds for one object, or for all objects"""
+        if obj is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(obj.name, None)
+
+
+# Global service instance for integration
+_bounds_service = None
+
+def get_bounds_service():
+    """Get global bounds service instance"""
+    global _bounds_service
+    if _bounds_service is None:
+        _bounds_service = WorldBoundsService()
+    return _bounds_service
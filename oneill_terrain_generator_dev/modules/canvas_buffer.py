@@ -0,0 +1,138 @@
+"""
+O'Neill Terrain Generator - Shared Canvas Buffer
+Zero-copy NumPy access to the unified painting canvas
+Reads and writes pixels with foreach_get/foreach_set into one reusable float32 array
+"""
+
+import bpy
+import numpy as np
+
+CANVAS_NAME = "oneill_terrain_canvas"
+
+# Channel threshold used everywhere to tell painted pixels from the black base
+PAINT_THRESHOLD = 0.01
+
+
+class CanvasBuffer:
+    """Reusable (H, W, 4) float32 mirror of a Blender image with dirty/commit semantics"""
+
+    def __init__(self, image=None):
+        self.image = None
+        self.width = 0
+        self.height = 0
+        self.pixels = None  # (H, W, 4) view onto self._flat
+        self.dirty = False
+        self._flat = None
+        self._image_pointer = 0
+
+        if image is not None:
+            self.bind(image)
+
+    def bind(self, image):
+        """Attach the buffer to an image, reallocating only when the size changes"""
+        width, height = image.size[0], image.size[1]
+
+        if self._flat is None or width != self.width or height != self.height:
+            self._flat = np.empty(width * height * 4, dtype=np.float32)
+            self.pixels = self._flat.reshape(height, width, 4)
+
+        self.image = image
+        self.width = width
+        self.height = height
+        self._image_pointer = image.as_pointer()
+        self.dirty = False
+        return self
+
+    def is_bound_to(self, image):
+        """True if this buffer mirrors the given image at its current size"""
+        if self.image is None or image is None:
+            return False
+        return (self._image_pointer == image.as_pointer()
+                and self.width == image.size[0]
+                and self.height == image.size[1])
+
+    def read(self):
+        """Refresh the buffer from the image and return the (H, W, 4) array
+
+        Pending writes are committed first so a refresh never silently drops them.
+        """
+        if self.image is None:
+            return None
+
+        if self.dirty:
+            self.commit()
+
+        self.image.pixels.foreach_get(self._flat)
+        return self.pixels
+
+    def mark_dirty(self):
+        """Flag that self.pixels was modified and must be pushed back to the image"""
+        self.dirty = True
+
+    def commit(self):
+        """Push pending writes back to the image in a single foreach_set"""
+        if self.image is None or not self.dirty:
+            return False
+
+        self.image.pixels.foreach_set(self._flat)
+        self.image.update()
+        self.dirty = False
+        return True
+
+    def painted_mask(self, threshold=PAINT_THRESHOLD):
+        """Boolean (H, W) mask of pixels with any RGB channel above threshold"""
+        return (self.pixels[..., :3] > threshold).any(axis=-1)
+
+    def has_paint(self, threshold=PAINT_THRESHOLD):
+        """True if any pixel in the current buffer is painted"""
+        if self.pixels is None:
+            return False
+        return bool((self.pixels[..., :3] > threshold).any())
+
+
+# Global buffers keyed by image name - every subsystem shares one array per image
+_canvas_buffers = {}
+
+def get_canvas_buffer(image=None):
+    """Get the shared buffer for an image (defaults to the unified painting canvas)"""
+    if image is None:
+        image = bpy.data.images.get(CANVAS_NAME)
+        if image is None:
+            return None
+
+    buffer = _canvas_buffers.get(image.name)
+    if buffer is None:
+        buffer = CanvasBuffer(image)
+        _canvas_buffers[image.name] = buffer
+    elif not buffer.is_bound_to(image):
+        # Image was recreated or resized - rebind (reuses the array when size matches)
+        buffer.bind(image)
+
+    return buffer
+
+def read_canvas(image=None):
+    """Convenience: refresh and return the shared (H, W, 4) array for an image"""
+    buffer = get_canvas_buffer(image)
+    return buffer.read() if buffer else None
+
+def snapshot_canvas(image):
+    """(H, W, 4) copy of an image that is not kept as a shared buffer - for one-off reads"""
+    shared = _canvas_buffers.get(image.name)
+    if shared is not None and shared.dirty:
+        shared.commit()
+    return CanvasBuffer(image).read()
+
+def has_canvas_buffer(image):
+    """True while a shared buffer is resident for the image"""
+    return image is not None and image.name in _canvas_buffers
+
+def release_canvas_buffer(image):
+    """Free one image's shared buffer, committing pending writes first"""
+    buffer = _canvas_buffers.pop(image.name, None)
+    if buffer is not None and buffer.dirty:
+        buffer.commit()
+    return buffer is not None
+
+def release_canvas_buffers():
+    """Drop all shared buffers (called on unregister or when the canvas is rebuilt)"""
+    _canvas_buffers.clear()
@@ -0,0 +1,151 @@
+"""
+O'Neill Terrain Generator - Dirty-Tile Change Tracker
+Splits the canvas into fixed tiles and keeps a vectorised per-tile digest
+Reports only the tiles touched since a consumer last looked, so downstream
+stages scale with the brush footprint instead of the canvas area
+"""
+
+import numpy as np
+
+DEFAULT_TILE_SIZE = 64
+
+
+class TileChangeTracker:
+    """Per-tile digest of an (H, W, 4) float32 canvas with generation counters
+
+    Every update() recomputes the digests in one NumPy pass and stamps changed
+    tiles with a new generation number. Consumers remember the last generation
+    they processed and ask for changed_since(), so several stages can share one
+    tracker without stealing each other's changes.
+    """
+
+    def __init__(self, tile_size=DEFAULT_TILE_SIZE):
+        self.tile_size = tile_size
+        self.width = 0
+        self.height = 0
+        self.tiles_x = 0
+        self.tiles_y = 0
+        self.generation = 0
+        self.digests = None          # (tiles_y, tiles_x) uint64
+        self.tile_generation = None  # (tiles_y, tiles_x) generation of last change
+        self._scratch = None         # Padded uint32 copy of the canvas bits
+        self._weights = None         # Per-position multipliers inside a tile
+
+    def _allocate(self, height, width):
+        """(Re)allocate digest state for a canvas size"""
+        tile = self.tile_size
+        self.width = width
+        self.height = height
+        self.tiles_x = (width + tile - 1) // tile
+        self.tiles_y = (height + tile - 1) // tile
+
+        self._scratch = None  # Allocated by the first digest pass
+        self.digests = np.zeros((self.tiles_y, self.tiles_x), dtype=np.uint64)
+        self.tile_generation = np.zeros((self.tiles_y, self.tiles_x), dtype=np.int64)
+
+        # Fixed odd multipliers make the digest position-sensitive (a moved dab
+        # inside a tile still changes its digest, unlike a plain sum)
+        rng = np.random.default_rng(0x0E111)
+        self._weights = rng.integers(1, 2**32, size=(tile, tile, 4), dtype=np.uint32) | np.uint32(1)
+
+    def _compute_digests(self, pixels):
+        """Weighted sum of raw float bits per tile - one vectorised reduction"""
+        height, width = pixels.shape[:2]
+        tile = self.tile_size
+
+        if self._scratch is None:
+            self._scratch = np.zeros((self.tiles_y * tile, self.tiles_x * tile, 4), dtype=np.uint32)
+        self._scratch[:height, :width] = pixels.view(np.uint32)
+        blocks = self._scratch.reshape(self.tiles_y, tile, self.tiles_x, tile, 4)
+        weighted = blocks * self._weights[None, :, None, :, :]  # Wraps mod 2**32
+        return weighted.sum(axis=(1, 3, 4), dtype=np.uint64)
+
+    def reset(self, pixels):
+        """Take a new baseline without reporting any change"""
+        height, width = pixels.shape[:2]
+        if height != self.height or width != self.width or self.digests is None:
+            self._allocate(height, width)
+
+        self.digests = self._compute_digests(pixels)
+        return self.generation
+
+    def update(self, pixels):
+        """Recompute digests and stamp changed tiles - returns (tiles_y, tiles_x) bool mask"""
+        height, width = pixels.shape[:2]
+        if height != self.height or width != self.width or self.digests is None:
+            # Canvas size changed - everything is new
+            self._allocate(height, width)
+            self.digests = self._compute_digests(pixels)
+            self.generation += 1
+            self.tile_generation[:] = self.generation
+            return np.ones((self.tiles_y, self.tiles_x), dtype=bool)
+
+        digests = self._compute_digests(pixels)
+        changed = digests != self.digests
+        if changed.any():
+            self.generation += 1
+            self.tile_generation[changed] = self.generation
+            self.digests = digests
+        return changed
+
+    def compact(self):
+        """Free the canvas-sized scratch copy - digests and generations are kept"""
+        self._scratch = None
+
+    def changed_since(self, generation):
+        """(N, 2) array of (tile_y, tile_x) indices changed after a generation"""
+        if self.tile_generation is None:
+            return np.empty((0, 2), dtype=np.int64)
+        return np.argwhere(self.tile_generation > generation)
+
+    def poll(self, pixels, since):
+        """Update from pixels and return (changed_tiles, generation) for one consumer"""
+        self.update(pixels)
+        return self.changed_since(since), self.generation
+
+    def tile_bounds(self, tile_y, tile_x):
+        """Pixel bounds (y0, y1, x0, x1) of a tile, clipped to the canvas"""
+        tile = self.tile_size
+        y0 = int(tile_y) * tile
+        x0 = int(tile_x) * tile
+        return y0, min(y0 + tile, self.height), x0, min(x0 + tile, self.width)
+
+    def tile_slices(self, tile_y, tile_x):
+        """(row_slice, col_slice) for indexing an (H, W, ...) array"""
+        y0, y1, x0, x1 = self.tile_bounds(tile_y, tile_x)
+        return slice(y0, y1), slice(x0, x1)
+
+    def pixel_mask(self, tiles):
+        """Expand a list of tiles into an (H, W) boolean pixel mask"""
+        tile_mask = np.zeros((self.tiles_y, self.tiles_x), dtype=bool)
+        if len(tiles):
+            tiles = np.asarray(tiles)
+            tile_mask[tiles[:, 0], tiles[:, 1]] = True
+        tile = self.tile_size
+        expanded = np.repeat(np.repeat(tile_mask, tile, axis=0), tile, axis=1)
+        return expanded[:self.height, :self.width]
+
+    def changed_region(self, tiles):
+        """Bounding box (y0, y1, x0, x1) covering a set of tiles, or None"""
+        if not len(tiles):
+            return None
+        tiles = np.asarray(tiles)
+        y0, _, x0, _ = self.tile_bounds(tiles[:, 0].min(), tiles[:, 1].min())
+        _, y1, _, x1 = self.tile_bounds(tiles[:, 0].max(), tiles[:, 1].max())
+        return int(y0), int(y1), int(x0), int(x1)
+
+
+# Global trackers keyed by image name - shared like the canvas buffers
+_change_trackers = {}
+
+def get_change_tracker(image, tile_size=DEFAULT_TILE_SIZE):
+    """Get the shared tile tracker for an image"""
+    tracker = _change_trackers.get(image.name)
+    if tracker is None or tracker.tile_size != tile_size:
+        tracker = TileChangeTracker(tile_size)
+        _change_trackers[image.name] = tracker
+    return tracker
+
+def release_change_trackers():
+    """Drop all shared trackers"""
+    _change_trackers.clear()
@@ -0,0 +1,249 @@
+"""
+O'Neill Terrain Generator - Event-Driven Canvas Monitor
+One scheduler for every stage that reacts to painting (paint detection, Y-wrapping, preview)
+Woken by depsgraph image updates and paint-editor redraws, with an adaptive back-off timer as the fallback
+"""
+
+import bpy
+
+try:
+    from .canvas_buffer import get_canvas_buffer, snapshot_canvas
+    from .canvas_change_tracker import get_change_tracker
+except ImportError:
+    from canvas_buffer import get_canvas_buffer, snapshot_canvas
+    from canvas_change_tracker import get_change_tracker
+
+MIN_INTERVAL = 0.05  # While strokes keep arriving - 20 checks per second
+MAX_INTERVAL = 2.0   # Idle ceiling for the fallback timer - redraw wakes bound the first-stroke delay
+BACKOFF_FACTOR = 2.0
+
+# Editors that redraw under a brush stroke - their redraw wakes the monitor
+WAKE_SPACES = (bpy.types.SpaceImageEditor, bpy.types.SpaceView3D)
+
+
+class CanvasMonitor:
+    """Dispatches dirty tiles to subscribers, polling only while painting is happening
+
+    Subscribers register a callback per image: callback(image, changed_tiles) is
+    called with the (tile_y, tile_x) tiles changed since that subscriber last ran.
+    Returning False unsubscribes. Writes a callback makes and absorbs into the
+    tracker (tracker.update) are not reported back to it as new changes.
+
+    Images that are not dirty are never read, nor are images the read_gate
+    (image -> bool, installed by the tiled canvas) keeps out. The timer interval
+    doubles on every idle check up to MAX_INTERVAL and snaps back to MIN_INTERVAL
+    on a change, a depsgraph image update or a redraw of an Image Editor / 3D
+    View. Image strokes redraw their editor on every dab even when they send no
+    depsgraph update, so the first stroke after an idle spell is picked up
+    within MIN_INTERVAL rather than after the back-off; an idle scene still
+    costs only a check every couple of seconds. check_wake_latency() verifies
+    this path.
+    """
+
+    def __init__(self):
+        self.subscribers = {}  # key -> [image_name, callback, last_generation]
+        self.interval = MIN_INTERVAL
+        self._tick_function = self._tick  # Stable reference for bpy.app.timers
+        self._handler_installed = False
+        self._draw_handlers = []  # (space type, handle) of the redraw wake hooks
+        self._in_tick = False
+        self._woken = False
+        self.read_gate = None  # image -> False while the image must not get a shared buffer
+
+    @property
+    def running(self):
+        return bpy.app.timers.is_registered(self._tick_function)
+
+    def subscribe(self, key, image, callback, baseline=True):
+        """Register callback for changes to image; baseline=True ignores current content"""
+        generation = -1
+        if baseline:
+            tracker = get_change_tracker(image)
+            if self.may_read(image):
+                tracker.update(get_canvas_buffer(image).read())
+            else:
+                # Baseline from a throwaway copy - no buffer stays resident
+                tracker.update(snapshot_canvas(image))
+                tracker.compact()
+            generation = tracker.generation
+
+        self.subscribers[key] = [image.name, callback, generation]
+        self.start()
+        return True
+
+    def may_read(self, image):
+        return self.read_gate is None or self.read_gate(image)
+
+    def unsubscribe(self, key):
+        self.subscribers.pop(key, None)
+        if not self.subscribers:
+            self.stop()
+
+    def is_subscribed(self, key):
+        return key in self.subscribers
+
+    def start(self):
+        """Install the depsgraph hook and the fallback timer (idempotent)"""
+        if not self._handler_installed:
+            bpy.app.handlers.depsgraph_update_post.append(_on_depsgraph_update)
+            self._handler_installed = True
+        if not self._draw_handlers:
+            self._draw_handlers = [(space, space.draw_handler_add(_on_editor_redraw, (), 'WINDOW', 'POST_PIXEL'))
+                                   for space in WAKE_SPACES]
+
+        if not self.running:
+            self.interval = MIN_INTERVAL
+            bpy.app.timers.register(self._tick_function, first_interval=MIN_INTERVAL, persistent=True)
+
+    def stop(self):
+        """Remove the hook and timer - subscribers are kept"""
+        self._remove_handler()
+        if self.running and not self._in_tick:
+            bpy.app.timers.unregister(self._tick_function)
+
+    def _remove_handler(self):
+        if self._handler_installed:
+            if _on_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+                bpy.app.handlers.depsgraph_update_post.remove(_on_depsgraph_update)
+            self._handler_installed = False
+        for space, handle in self._draw_handlers:
+            space.draw_handler_remove(handle, 'WINDOW')
+        self._draw_handlers = []
+
+    def wake(self):
+        """Something changed - check on the next tick instead of after the back-off"""
+        if not self.subscribers:
+            return
+        if self._in_tick:
+            # The running tick returns the new interval itself
+            self._woken = True
+            return
+        if self.interval > MIN_INTERVAL and self.running:
+            bpy.app.timers.unregister(self._tick_function)
+        self.interval = MIN_INTERVAL
+        if not self.running:
+            bpy.app.timers.register(self._tick_function, first_interval=0.0, persistent=True)
+
+    def check(self):
+        """Poll every subscribed image once - returns True if any subscriber saw changes"""
+        by_image = {}
+        for key, subscription in list(self.subscribers.items()):
+            by_image.setdefault(subscription[0], []).append(key)
+
+        changed_any = False
+        for image_name, keys in by_image.items():
+            image = bpy.data.images.get(image_name)
+            if image is None:
+                # Canvas was removed or the file reloaded
+                for key in keys:
+                    self.subscribers.pop(key, None)
+                continue
+            if not image.is_dirty or not self.may_read(image):
+                continue
+
+            tracker = get_change_tracker(image)
+            tracker.update(get_canvas_buffer(image).read())
+
+            for key in keys:
+                subscription = self.subscribers.get(key)
+                if subscription is None:
+                    continue
+                changed_tiles = tracker.changed_since(subscription[2])
+                if not len(changed_tiles):
+                    continue
+
+                changed_any = True
+                try:
+                    keep = subscription[1](image, changed_tiles)
+                except Exception as e:
+                    print(f"❌ Canvas monitor subscriber '{key}' failed: {e}")
+                    keep = False
+
+                # Absorb whatever the callback itself wrote
+                subscription[2] = tracker.generation
+                if keep is False:
+                    self.subscribers.pop(key, None)
+
+        return changed_any
+
+    def _tick(self):
+        if not self.subscribers:
+            self._remove_handler()
+            return None
+
+        self._in_tick = True
+        self._woken = False
+        try:
+            changed = self.check()
+        except Exception as e:
+            print(f"❌ Canvas monitor error: {e}")
+            changed = False
+        finally:
+            self._in_tick = False
+
+        if not self.subscribers:
+            self._remove_handler()
+            return None
+
+        if changed or self._woken:
+            self.interval = MIN_INTERVAL
+        else:
+            self.interval = min(self.interval * BACKOFF_FACTOR, MAX_INTERVAL)
+        return self.interval
+
+
+def _on_depsgraph_update(scene, depsgraph):
+    """depsgraph_update_post hook - only flags work, never reads pixels here"""
+    if _canvas_monitor is not None and depsgraph.id_type_updated('IMAGE'):
+        _canvas_monitor.wake()
+
+def _painting_editor(context):
+    """True for an Image Editor in Paint mode or a 3D View in Texture Paint mode"""
+    space = context.space_data
+    if isinstance(space, bpy.types.SpaceImageEditor):
+        return getattr(space, 'ui_mode', 'PAINT') == 'PAINT'
+    return context.mode == 'PAINT_TEXTURE'
+
+def _on_editor_redraw():
+    """Image Editor / 3D View draw hook - a brush stroke redraws its editor on every dab
+
+    Redraws from navigation or playback outside a paint mode are ignored.
+    """
+    monitor = _canvas_monitor
+    if monitor is not None and monitor.interval > MIN_INTERVAL and _painting_editor(bpy.context):
+        monitor.wake()
+
+def check_wake_latency(monitor=None):
+    """Documented check: a redraw after an idle back-off schedules a check at once
+
+    Backs the monitor off to MAX_INTERVAL, wakes it the way the paint-mode
+    redraw hook does and returns the delay until the next check (0.0 when the wake path works, MAX_INTERVAL
+    if the first stroke would wait out the back-off).
+    """
+    monitor = monitor or get_canvas_monitor()
+    if not monitor.running:
+        return None  # Nothing subscribed - there is no stroke to wait for
+    monitor.interval = MAX_INTERVAL
+    monitor.wake()  # What _on_editor_redraw does in a paint-mode editor
+    delay = 0.0 if monitor.interval == MIN_INTERVAL and monitor.running else MAX_INTERVAL
+    print(f"{'✅' if delay == 0.0 else '❌'} Canvas monitor wake: next check after {delay:.2f}s")
+    return delay
+
+
+# Global monitor instance for integration
+_canvas_monitor = None
+
+def get_canvas_monitor():
+    """Get global canvas monitor instance"""
+    global _canvas_monitor
+    if _canvas_monitor is None:
+        _canvas_monitor = CanvasMonitor()
+    return _canvas_monitor
+
+def release_canvas_monitor():
+    """Stop the monitor and drop all subscriptions"""
+    global _canvas_monitor
+    if _canvas_monitor is not None:
+        _canvas_monitor.subscribers.clear()
+        _canvas_monitor.stop()
+        _canvas_monitor = None
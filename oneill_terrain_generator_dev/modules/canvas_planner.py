@@ -0,0 +1,164 @@
+"""
+O'Neill Terrain Generator - Canvas Planner
+Sizes the painting canvas from ark geometry instead of a fixed 2400x628
+Width follows the summed flat lengths, height the circumference, capped by a memory budget
+On a tiled canvas the budget covers the tiles resident while painting, not the whole ark
+"""
+
+import math
+
+DEFAULT_TEXELS_PER_METRE = 20.0
+DEFAULT_MEMORY_BUDGET_MB = 512
+
+# Blender's own 8-bit RGBA image - held for every tile
+IMAGE_BYTES_PER_TEXEL = 4
+# Shared float32 RGBA mirror (16 B) + change-tracker scratch (16 B) + biome labels (1 B)
+# + the image itself - only for tiles resident while painting; this is what the budget caps
+RESIDENT_BYTES_PER_TEXEL = 37
+
+RESIDENT_TILES = 2  # The tile being painted plus the one just left
+
+MAX_IMAGE_SIZE = 16384  # Largest texture dimension we hand to Blender/GPU
+MIN_SLOT_WIDTH = 64     # Narrowest strip a flat object may get
+MIN_HEIGHT = 64
+
+TILING_OVERLAP = 0.05   # Bottom tiling zone, same 5% as the UV mapping / Y-wrap
+
+
+class CanvasPlan:
+    """Resolved canvas layout - every object gets slot_width columns, grouped into tiles"""
+
+    def __init__(self, object_count, slot_width, main_height, texels_per_metre,
+                 objects_per_tile, budget_limited=False, resident_tiles=RESIDENT_TILES):
+        self.object_count = object_count
+        self.slot_width = slot_width
+        self.main_height = main_height
+        self.height = int(math.ceil(main_height * (1.0 + TILING_OVERLAP)))
+        self.width = slot_width * object_count
+        self.texels_per_metre = texels_per_metre
+
+        self.objects_per_tile = objects_per_tile
+        self.tile_count = int(math.ceil(object_count / objects_per_tile))
+        self.tile_width = slot_width * objects_per_tile
+        self.resident_tiles = min(resident_tiles, self.tile_count)
+        self.budget_limited = budget_limited
+
+    @property
+    def tiled(self):
+        return self.tile_count > 1
+
+    @property
+    def resident_bytes(self):
+        """Working set while painting: the resident tiles with their NumPy mirrors"""
+        return self.tile_width * self.resident_tiles * self.height * RESIDENT_BYTES_PER_TEXEL
+
+    @property
+    def memory_bytes(self):
+        """Peak while painting: the resident working set plus the idle tiles' images"""
+        idle_texels = (self.width - self.tile_width * self.resident_tiles) * self.height
+        return self.resident_bytes + max(idle_texels, 0) * IMAGE_BYTES_PER_TEXEL
+
+    def __repr__(self):
+        layout = f"{self.tile_count} tiles of {self.tile_width}x{self.height}" if self.tiled else "single image"
+        return (f"CanvasPlan({self.width}x{self.height}, {self.texels_per_metre:.2f} texels/m, "
+                f"{layout}, {self.resident_bytes / 2**20:.0f} MB resident, {self.memory_bytes / 2**20:.0f} MB total)")
+
+
+class CanvasPlanner:
+    """Derives canvas size from flat-object geometry, a texel density and a memory budget
+
+    Non-power-of-two sizes are fine for image painting; width is always a whole
+    multiple of the object count so each U slot maps to whole pixel columns.
+    Canvases wider than MAX_IMAGE_SIZE are split into tiles of whole objects.
+    Only RESIDENT_TILES of them carry NumPy mirrors at a time, so the budget
+    caps the resident tiles rather than the whole ark: tiles get narrower
+    first, and the density only drops when a single-object tile cannot fit.
+    """
+
+    def __init__(self, texels_per_metre=DEFAULT_TEXELS_PER_METRE,
+                 memory_budget_mb=DEFAULT_MEMORY_BUDGET_MB, max_image_size=MAX_IMAGE_SIZE):
+        self.texels_per_metre = texels_per_metre
+        self.memory_budget = memory_budget_mb * 2**20
+        self.max_image_size = max_image_size
+
+    def measure(self, flat_objects):
+        """(object_count, longest flat length, circumference) from stored cylinder properties
+
+        Slots are equal width, so the longest object sets the density for all of them.
+        """
+        lengths = [float(obj.get("cylinder_length", 2.0)) for obj in flat_objects]
+        radii = [float(obj.get("cylinder_radius", 1.0)) for obj in flat_objects]
+        return len(lengths), max(lengths), 2 * math.pi * max(radii)
+
+    def plan(self, flat_objects, allow_tiles=True):
+        """Return a CanvasPlan for the given flat objects
+
+        With allow_tiles=False the density is lowered until the whole ark fits
+        one image no wider than max_image_size.
+        """
+        count, slot_length, circumference = self.measure(flat_objects)
+        if count == 0:
+            raise ValueError("No flat objects to plan a canvas for")
+
+        density = self.texels_per_metre
+        budget_limited = False
+        for _ in range(8):
+            plan = self.layout(count, slot_length, circumference, density, allow_tiles)
+            if plan.resident_bytes <= self.memory_budget:
+                break
+            # Texel count scales with density squared; tile widths are whole
+            # objects, so converge over a few passes instead of one exact step
+            budget_limited = True
+            density = plan.texels_per_metre * math.sqrt(self.memory_budget / plan.resident_bytes) * 0.99
+        plan.budget_limited = budget_limited
+        return plan
+
+    def layout(self, count, slot_length, circumference, density, allow_tiles=True):
+        """CanvasPlan at one texel density, clamped to max_image_size"""
+        slot_width = max(MIN_SLOT_WIDTH, int(round(slot_length * density)))
+        main_height = max(MIN_HEIGHT, int(round(circumference * density)))
+
+        # The tallest dimension cannot be tiled away - clamp it and keep the aspect
+        max_main_height = int(self.max_image_size / (1.0 + TILING_OVERLAP))
+        if main_height > max_main_height:
+            slot_width = max(MIN_SLOT_WIDTH, slot_width * max_main_height // main_height)
+            main_height = max_main_height
+            density = main_height / circumference
+        slot_width = min(slot_width, self.max_image_size)
+
+        if not allow_tiles and slot_width * count > self.max_image_size:
+            fitted = max(1, self.max_image_size // count)
+            main_height = max(MIN_HEIGHT, main_height * fitted // slot_width)
+            density *= fitted / slot_width
+            slot_width = fitted
+
+        objects_per_tile = max(1, min(count, self.max_image_size // slot_width))
+        height = int(math.ceil(main_height * (1.0 + TILING_OVERLAP)))
+        slot_bytes = slot_width * height * RESIDENT_BYTES_PER_TEXEL
+        if allow_tiles and objects_per_tile * slot_bytes > self.memory_budget:
+            # Narrower tiles keep the density: RESIDENT_TILES of them must fit the budget
+            objects_per_tile = max(1, min(objects_per_tile, self.memory_budget // (RESIDENT_TILES * slot_bytes)))
+        return CanvasPlan(count, slot_width, main_height, density, objects_per_tile)
+
+
+# Global planner instance for integration
+_canvas_planner = None
+
+def get_canvas_planner():
+    """Get global canvas planner instance"""
+    global _canvas_planner
+    if _canvas_planner is None:
+        _canvas_planner = CanvasPlanner()
+    return _canvas_planner
+
+def plan_canvas(flat_objects, texels_per_metre=None, memory_budget_mb=None, allow_tiles=True):
+    """Plan a canvas, overriding the global planner's density/budget if given"""
+    planner = get_canvas_planner()
+    if texels_per_metre is None and memory_budget_mb is None:
+        return planner.plan(flat_objects, allow_tiles)
+
+    return CanvasPlanner(
+        texels_per_metre if texels_per_metre is not None else planner.texels_per_metre,
+        memory_budget_mb if memory_budget_mb is not None else planner.memory_budget / 2**20,
+        planner.max_image_size,
+    ).plan(flat_objects, allow_tiles)
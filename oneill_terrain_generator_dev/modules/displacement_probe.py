@@ -0,0 +1,91 @@
+"""
+O'Neill Terrain Generator - Displacement Probe
+Cheap min/max/range of evaluated Z for preview health-checks
+One depsgraph per check, evaluated Z read with foreach_get into a reusable array
+"""
+
+import bpy
+import numpy as np
+
+DISPLACEMENT_THRESHOLD = 0.001
+
+
+class DisplacementProbe:
+    """Reports evaluated Z ranges without building Python lists of vertices
+
+    With sample_size=None every vertex is read in one foreach_get into a buffer
+    that is reused across checks (it only grows). With a sample_size, a fixed,
+    evenly strided subset of vertices is read instead - O(sample) per object.
+    """
+
+    def __init__(self, sample_size=None):
+        self.sample_size = sample_size
+        self._coords = np.empty(0, dtype=np.float32)
+
+    def _buffer(self, length):
+        if len(self._coords) < length:
+            self._coords = np.empty(length, dtype=np.float32)
+        return self._coords[:length]
+
+    def read_z(self, mesh):
+        """Evaluated Z of all (or sampled) vertices as a float32 array view"""
+        count = len(mesh.vertices)
+        if count == 0:
+            return self._buffer(0)
+
+        if self.sample_size and count > self.sample_size:
+            indices = np.linspace(0, count - 1, self.sample_size).astype(np.int64)
+            z = self._buffer(self.sample_size)
+            vertices = mesh.vertices
+            for i, index in enumerate(indices):
+                z[i] = vertices[int(index)].co.z
+            return z
+
+        coords = self._buffer(count * 3)
+        mesh.vertices.foreach_get('co', coords)
+        return coords[2::3]
+
+    def object_range(self, obj, depsgraph):
+        """(min_z, max_z, range) of an object's evaluated mesh, or None if empty"""
+        eval_obj = obj.evaluated_get(depsgraph)
+        z = self.read_z(eval_obj.data)
+        if not len(z):
+            return None
+        low = float(z.min())
+        high = float(z.max())
+        return low, high, high - low
+
+    def iter_ranges(self, objects, depsgraph=None):
+        """Yield (obj, (min_z, max_z, range)) - the depsgraph is fetched once per call"""
+        if depsgraph is None:
+            depsgraph = bpy.context.evaluated_depsgraph_get()
+        for obj in objects:
+            try:
+                stats = self.object_range(obj, depsgraph)
+            except Exception as e:
+                print(f"⚠️ Monitoring error for {obj.name}: {e}")
+                continue
+            if stats is not None:
+                yield obj, stats
+
+    def probe(self, objects, depsgraph=None):
+        """{object_name: (min_z, max_z, range)} for every non-empty object"""
+        return {obj.name: stats for obj, stats in self.iter_ranges(objects, depsgraph)}
+
+    def first_displaced(self, objects, threshold=DISPLACEMENT_THRESHOLD, depsgraph=None):
+        """(obj, range) of the first object displaced beyond threshold, or None"""
+        for obj, (_, _, z_range) in self.iter_ranges(objects, depsgraph):
+            if z_range > threshold:
+                return obj, z_range
+        return None
+
+
+# Global probe instance for integration
+_displacement_probe = None
+
+def get_displacement_probe():
+    """Get global displacement probe instance"""
+    global _displacement_probe
+    if _displacement_probe is None:
+        _displacement_probe = DisplacementProbe()
+    return _displacement_probe
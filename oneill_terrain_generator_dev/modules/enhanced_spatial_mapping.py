@@ -20,6 +20,24 @@ except ImportError:
         print("⚠️ Unified canvas module not available - falling back to simplified mapping")
         UNIFIED_CANVAS_AVAILABLE = False
 
+# Shared NumPy canvas buffer - avoids materialising canvas.pixels as Python lists
+try:
+    from .canvas_buffer import get_canvas_buffer
+except ImportError:
+    from canvas_buffer import get_canvas_buffer
+
+# Shared colour -> biome lookup table
+try:
+    from .biome_classifier import BIOME_COLORS, get_biome_classifier
+except ImportError:
+    from biome_classifier import BIOME_COLORS, get_biome_classifier
+
+# Whole-canvas label map - one classification pass shared by every object
+try:
+    from .biome_map import get_biome_map
+except ImportError:
+    from biome_map import get_biome_map
+
 class UnifiedSpatialMapping:
     """
     Enhanced spatial mapping using Phase 1.2 unified canvas system
@@ -31,14 +49,8 @@ class UnifiedSpatialMapping:
         self.legacy_canvas_name = "ONeill_Terrain_Canvas"
         
         # FIXED: Corrected biome colors to match user's painting
-        self.biome_colors = {
-            'MOUNTAINS': (0.5, 0.5, 0.5),    # Gray
-            'OCEAN': (0.1, 0.3, 0.8),        # Deep blue
-            'ARCHIPELAGO': (0.2, 0.8, 0.9),  # Light blue/cyan
-            'CANYONS': (0.8, 0.4, 0.2),      # Orange-red
-            'HILLS': (0.4, 0.8, 0.3),        # Green
-            'DESERT': (0.9, 0.8, 0.4),       # Sandy yellow
-        }
+        self.biome_colors = dict(BIOME_COLORS)
+        self.classifier = get_biome_classifier()
         
         # Enhanced terrain settings for unified canvas
         self.biome_settings = {
@@ -51,6 +63,7 @@ class UnifiedSpatialMapping:
         }
         
         self.unified_system = None
+        self.biome_map = None
         
     def apply_unified_spatial_mapping(self):
         """
@@ -111,6 +124,7 @@ class UnifiedSpatialMapping:
             self._apply_unified_test_pattern(canvas)
         
         print(f"📋 Processing {len(flat_objects)} objects with unified UV mapping...")
+        self.biome_map = None
         
         success_count = 0
         for obj in flat_objects:
@@ -151,9 +165,7 @@ class UnifiedSpatialMapping:
             print(f"   ⚠️ No UV mapping found for {obj.name}")
             return 'FLAT'
         
-        canvas_width = canvas.size[0]
-        canvas_height = canvas.size[1]
-        pixels = list(canvas.pixels)
+        biome_map = self._current_biome_map(canvas)
         
         # Get this object's canvas region from UV mapping
         region = mapping['canvas_region']
@@ -162,50 +174,16 @@ class UnifiedSpatialMapping:
         
         print(f"   📍 UV region: ({min_x}, {min_y}) to ({max_x}, {max_y})")
         
-        # Sample multiple points across this object's UV region
-        biome_samples = []
-        sample_points = []
-        
-        # Create sampling grid across the object's region
-        x_samples = max(3, (max_x - min_x) // 100)  # Sample every ~100 pixels
-        y_samples = max(3, (max_y - min_y) // 100)
-        
-        for y_step in range(y_samples):
-            for x_step in range(x_samples):
-                sample_x = min_x + (x_step * (max_x - min_x)) // x_samples
-                sample_y = min_y + (y_step * (max_y - min_y)) // y_samples
-                
-                # Ensure sample is within bounds
-                sample_x = max(0, min(sample_x, canvas_width - 1))
-                sample_y = max(0, min(sample_y, canvas_height - 1))
-                
-                pixel_index = (sample_y * canvas_width + sample_x) * 4
-                if pixel_index + 3 < len(pixels):
-                    r, g, b = pixels[pixel_index:pixel_index+3]
-                    biome = self._identify_biome_from_color(r, g, b)
-                    biome_samples.append(biome)
-                    sample_points.append((sample_x, sample_y, r, g, b, biome))
-        
-        if not biome_samples:
+        # Every pixel of the region votes - histogram over the cached label map
+        histogram = biome_map.region_histogram(min_x, max_x, min_y, max_y)
+        if not histogram.sum():
             print(f"   ❌ No valid samples found in UV region")
             return 'FLAT'
         
-        # Analyze samples to determine dominant biome
-        biome_counts = {}
-        for biome in biome_samples:
-            biome_counts[biome] = biome_counts.get(biome, 0) + 1
-        
-        # Get dominant biome (excluding FLAT if other biomes exist)
-        non_flat_biomes = {k: v for k, v in biome_counts.items() if k != 'FLAT'}
-        if non_flat_biomes:
-            dominant_biome = max(non_flat_biomes.items(), key=lambda x: x[1])[0]
-            confidence = (non_flat_biomes[dominant_biome] / len(biome_samples)) * 100
-        else:
-            dominant_biome = 'FLAT'
-            confidence = (biome_counts.get('FLAT', 0) / len(biome_samples)) * 100
+        dominant_biome, confidence = biome_map.dominant_biome(histogram)
         
-        print(f"   📊 Samples: {len(sample_points)}, Result: {dominant_biome} ({confidence:.0f}% confidence)")
-        print(f"   🎨 Distribution: {biome_counts}")
+        print(f"   📊 Samples: {int(histogram.sum())}, Result: {dominant_biome} ({confidence:.0f}% confidence)")
+        print(f"   🎨 Distribution: {biome_map.distribution(histogram)}")
         
         return dominant_biome
     
@@ -222,42 +200,26 @@ class UnifiedSpatialMapping:
         except ValueError:
             return 'FLAT'
         
-        canvas_width = canvas.size[0]
-        canvas_height = canvas.size[1]
-        pixels = list(canvas.pixels)
-        
-        # Simple region calculation
-        region_width = canvas_width // len(flat_objects)
-        start_x = obj_index * region_width
-        center_x = start_x + region_width // 2
-        center_y = canvas_height // 2
-        
-        # Sample center point
-        pixel_index = (center_y * canvas_width + center_x) * 4
-        if pixel_index + 3 < len(pixels):
-            r, g, b = pixels[pixel_index:pixel_index+3]
-            return self._identify_biome_from_color(r, g, b)
-        
-        return 'FLAT'
+        # Dominant biome of this object's U strip - all strips come from one bincount
+        biome_map = self._current_biome_map(canvas)
+        histogram = biome_map.strip_histograms(len(flat_objects))[obj_index]
+        return biome_map.dominant_biome(histogram)[0]
+    
+    def _current_biome_map(self, canvas):
+        """
+        Label map for the canvas - refreshed once per mapping pass, not per object
+        """
+        if self.biome_map is None:
+            self.biome_map = get_biome_map(canvas)
+            self.biome_map.refresh(canvas)
+        return self.biome_map
     
     def _identify_biome_from_color(self, r, g, b):
         """
         Identify biome from RGB color with tolerance for user color variations
+        Nearest palette colour within 0.4, black counts as unpainted (FLAT)
         """
-        if r < 0.02 and g < 0.02 and b < 0.02:  # Unpainted (black)
-            return 'FLAT'
-        
-        min_distance = float('inf')
-        closest_biome = 'MOUNTAINS'
-        
-        for biome, (br, bg, bb) in self.biome_colors.items():
-            distance = ((r - br) ** 2 + (g - bg) ** 2 + (b - bb) ** 2) ** 0.5
-            if distance < min_distance:
-                min_distance = distance
-                closest_biome = biome
-        
-        # Return closest biome if color is reasonably close
-        return closest_biome if min_distance < 0.4 else 'FLAT'
+        return self.classifier.classify_color(r, g, b)
     
     def _apply_terrain_to_object(self, obj, biome):
         """
@@ -313,12 +275,9 @@ class UnifiedSpatialMapping:
         """
         Check if canvas has any painted pixels
         """
-        pixels = list(canvas.pixels)
-        for i in range(0, len(pixels), 4):
-            r, g, b = pixels[i:i+3]
-            if r > 0.01 or g > 0.01 or b > 0.01:
-                return True
-        return False
+        buffer = get_canvas_buffer(canvas)
+        buffer.read()
+        return buffer.has_paint()
     
     def _apply_unified_test_pattern(self, canvas):
         """
@@ -377,6 +336,7 @@ class UnifiedSpatialMapping:
         flat_objects.sort(key=lambda obj: obj.location.x)
         
         print(f"📋 Processing {len(flat_objects)} objects with legacy mapping...")
+        self.biome_map = None
         
         success_count = 0
         for i, obj in enumerate(flat_objects):
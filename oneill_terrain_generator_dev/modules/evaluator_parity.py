@@ -0,0 +1,284 @@
+"""
+O'Neill Terrain Generator - Evaluator Parity Check
+Pins the headless terrain evaluator to Blender's Noise Texture and to the live node group
+NumPy-only fixture and periodicity checks anywhere; recording and node-group checks inside Blender
+
+    python modules/evaluator_parity.py                                  # fixture + periodicity, no Blender
+    blender -b --python modules/evaluator_parity.py -- record           # re-record the fixture
+    blender -b ark.blend --python modules/evaluator_parity.py -- check  # + tiny grid and flat objects
+"""
+
+import json
+import os
+import sys
+
+import numpy as np
+
+if __name__ == "__main__":
+    # Run as a script: make sibling modules and the add-on root importable
+    _here = os.path.dirname(os.path.abspath(__file__))
+    sys.path[:0] = [_here, os.path.dirname(_here)]
+
+try:
+    from . import terrain_evaluator
+except ImportError:
+    import terrain_evaluator
+
+FIXTURE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "noise_reference.json")
+FIXTURE_TOLERANCE = 1e-5   # Blender evaluates in float32
+NODE_GROUP_TOLERANCE = 1e-3
+PERIOD_TOLERANCE = 1e-9    # Tiling is exact up to float64 rounding
+
+# (scale, detail, roughness, lacunarity, normalize) - single octave raw noise pins
+# PERLIN_SCALE; fractional and out-of-range detail cover the octave blend and clamp
+NOISE_CASES = (
+    (1.0, 0.0, 0.5, 2.0, False),
+    (5.0, 2.0, 0.5, 2.0, True),
+    (5.0, 3.5, 0.6, 2.3, True),
+    (2.5, 20.0, 0.9, 1.2, True),   # Low lacunarity keeps octave 15 within float32
+    (5.0, 2.0, -0.3, 2.0, False),
+)
+
+# (period, detail, roughness, lacunarity) - non-integer lacunarity exercises the octave snap
+PERIOD_CASES = (
+    (4, 3.0, 0.5, 2.0),
+    ((3, 5, 7), 2.5, 0.6, 2.0),
+    (6, 4.0, 0.5, 2.3),
+    ((5, 2, 9), 3.5, 0.7, 1.7),
+)
+
+
+def reference_points():
+    """Tiny fixed point set: a 4x4x2 grid with odd offsets, straddling negative cells"""
+    axis = np.linspace(-1.3, 1.7, 4)
+    x, y, z = np.meshgrid(axis, axis + 0.11, np.array([-0.37, 0.59]), indexing='ij')
+    points = np.stack((x.ravel(), y.ravel(), z.ravel()), axis=1)
+    return points.astype(np.float32).astype(np.float64)  # Exactly what Blender stores
+
+
+# ========================= NUMPY-ONLY CHECK =========================
+
+def check_noise_fixture(path=FIXTURE_PATH, tolerance=FIXTURE_TOLERANCE):
+    """Compare fbm_noise against recorded Blender Noise Texture values - returns max error"""
+    with open(path) as f:
+        fixture = json.load(f)
+
+    points = np.asarray(fixture['points'], dtype=np.float64)
+    worst = 0.0
+    for case in fixture['cases']:
+        expected = np.asarray(case['fac'], dtype=np.float64)
+        actual = terrain_evaluator.fbm_noise(points * case['scale'], case['detail'], case['roughness'],
+                                             case['lacunarity'], case['normalize'])
+        error = float(np.abs(actual - expected).max())
+        worst = max(worst, error)
+        status = "✅" if error <= tolerance else "❌"
+        print(f"{status} Noise scale {case['scale']}, detail {case['detail']}, roughness {case['roughness']}, "
+              f"lacunarity {case['lacunarity']}, normalize {case['normalize']}: max error {error:.2e}")
+
+    print(f"{'✅' if worst <= tolerance else '❌'} Noise fixture ({fixture.get('blender', '?')}): "
+          f"max error {worst:.2e} over {len(fixture['cases'])} cases")
+    return worst
+
+
+def check_noise_periodicity(tolerance=PERIOD_TOLERANCE):
+    """fbm_noise(x) == fbm_noise(x + period) along every axis - returns max error"""
+    points = reference_points() * 3.7
+    worst = 0.0
+    for period, detail, roughness, lacunarity in PERIOD_CASES:
+        periods = np.broadcast_to(np.asarray(period, dtype=np.float64), (3,))
+        base = terrain_evaluator.fbm_noise(points, detail, roughness, lacunarity, period=period)
+        error = 0.0
+        for axis in range(3):
+            shifted = points.copy()
+            shifted[:, axis] += periods[axis]
+            moved = terrain_evaluator.fbm_noise(shifted, detail, roughness, lacunarity, period=period)
+            error = max(error, float(np.abs(moved - base).max()))
+        worst = max(worst, error)
+        status = "✅" if error <= tolerance else "❌"
+        print(f"{status} Noise period {period}, detail {detail}, lacunarity {lacunarity}: max error {error:.2e}")
+
+    print(f"{'✅' if worst <= tolerance else '❌'} Noise periodicity: max error {worst:.2e} "
+          f"over {len(PERIOD_CASES)} cases")
+    return worst
+
+
+# ========================= BLENDER-SIDE =========================
+
+def _noise_probe(points):
+    """Point-cloud mesh whose modifier stores Noise Texture Fac as a float attribute"""
+    import bpy
+
+    mesh = bpy.data.meshes.new("oneill_noise_probe")
+    mesh.vertices.add(len(points))
+    mesh.vertices.foreach_set('co', points.astype(np.float32).ravel())
+    obj = bpy.data.objects.new("oneill_noise_probe", mesh)
+    bpy.context.scene.collection.objects.link(obj)
+
+    node_group = bpy.data.node_groups.new("oneill_noise_probe", 'GeometryNodeTree')
+    node_group.interface.new_socket('Geometry', in_out='INPUT', socket_type='NodeSocketGeometry')
+    node_group.interface.new_socket('Geometry', in_out='OUTPUT', socket_type='NodeSocketGeometry')
+    nodes, links = node_group.nodes, node_group.links
+
+    group_input = nodes.new('NodeGroupInput')
+    group_output = nodes.new('NodeGroupOutput')
+    position = nodes.new('GeometryNodeInputPosition')
+    noise = nodes.new('ShaderNodeTexNoise')
+    store = nodes.new('GeometryNodeStoreNamedAttribute')
+    store.data_type = 'FLOAT'
+    store.domain = 'POINT'
+    store.inputs['Name'].default_value = "fac"
+
+    links.new(position.outputs['Position'], noise.inputs['Vector'])
+    links.new(group_input.outputs[0], store.inputs['Geometry'])
+    links.new(noise.outputs['Fac'], store.inputs['Value'])
+    links.new(store.outputs['Geometry'], group_output.inputs[0])
+
+    modifier = obj.modifiers.new("Noise_Probe", 'NODES')
+    modifier.node_group = node_group
+    return obj, noise
+
+def _remove_probe(obj):
+    import bpy
+
+    node_group = obj.modifiers["Noise_Probe"].node_group
+    mesh = obj.data
+    bpy.data.objects.remove(obj, do_unlink=True)
+    bpy.data.meshes.remove(mesh)
+    bpy.data.node_groups.remove(node_group)
+
+def record_noise_fixture(path=FIXTURE_PATH):
+    """Evaluate every NOISE_CASES entry with Blender's Noise Texture and write the fixture"""
+    import bpy
+
+    points = reference_points()
+    obj, noise = _noise_probe(points)
+    cases = []
+    try:
+        for scale, detail, roughness, lacunarity, normalize in NOISE_CASES:
+            noise.inputs['Scale'].default_value = scale
+            noise.inputs['Detail'].default_value = detail
+            noise.inputs['Roughness'].default_value = roughness
+            noise.inputs['Lacunarity'].default_value = lacunarity
+            noise.normalize = normalize
+
+            depsgraph = bpy.context.evaluated_depsgraph_get()
+            evaluated = obj.evaluated_get(depsgraph)
+            mesh = evaluated.to_mesh()
+            try:
+                fac = np.empty(len(mesh.vertices), dtype=np.float32)
+                mesh.attributes["fac"].data.foreach_get('value', fac)
+            finally:
+                evaluated.to_mesh_clear()
+
+            cases.append({'scale': scale, 'detail': detail, 'roughness': roughness,
+                          'lacunarity': lacunarity, 'normalize': normalize,
+                          'fac': [float(value) for value in fac]})
+    finally:
+        _remove_probe(obj)
+
+    fixture = {
+        'blender': bpy.app.version_string,
+        'node': 'ShaderNodeTexNoise (3D, fBM, no distortion)',
+        'points': points.tolist(),
+        'cases': cases,
+    }
+    with open(path, 'w') as f:
+        json.dump(fixture, f, indent=1)
+    print(f"✅ Recorded {len(cases)} noise cases on {len(points)} points -> {path}")
+    return fixture
+
+def check_tiny_grid(tolerance=NODE_GROUP_TOLERANCE):
+    """Session 42 node group on a 7x3 grid over a small painted canvas - no scene needed"""
+    import bpy
+    try:
+        from ..working_node_group_integration import create_session_42_working_node_group
+    except (ImportError, ValueError):
+        from working_node_group_integration import create_session_42_working_node_group
+
+    created = "Unified_Multi_Biome_Terrain.001" not in bpy.data.node_groups
+    node_group = create_session_42_working_node_group()
+    sampler = node_group.nodes["Unified_Canvas_Sampler"]
+    previous_canvas = sampler.inputs['Image'].default_value
+
+    # 8x4 byte (sRGB) canvas with a blue gradient so the ramp sees every value
+    canvas = bpy.data.images.new("oneill_parity_canvas", 8, 4)
+    blue = np.linspace(0.0, 1.0, 32).reshape(4, 8)
+    pixels = np.stack((blue * 0.3, 1.0 - blue, blue, np.ones_like(blue)), axis=-1)
+    canvas.pixels.foreach_set(pixels.astype(np.float32).ravel())
+    sampler.inputs['Image'].default_value = canvas
+
+    x, y = np.meshgrid(np.linspace(-1.5, 1.5, 7), np.linspace(-0.5, 0.5, 3))
+    vertices = np.stack((x.ravel(), y.ravel(), np.zeros(x.size)), axis=1)
+    faces = [(row * 7 + col, row * 7 + col + 1, (row + 1) * 7 + col + 1, (row + 1) * 7 + col)
+             for row in range(2) for col in range(6)]
+    mesh = bpy.data.meshes.new("oneill_parity_grid")
+    mesh.from_pydata(vertices.tolist(), [], faces)
+    uv_layer = mesh.uv_layers.new(name="UVMap")
+    loop_vertices = np.array([loop.vertex_index for loop in mesh.loops])
+    uvs = (vertices[loop_vertices, :2] - (-1.5, -0.5)) / (3.0, 1.0)
+    uv_layer.data.foreach_set('uv', uvs.astype(np.float32).ravel())
+
+    obj = bpy.data.objects.new("oneill_parity_grid", mesh)
+    bpy.context.scene.collection.objects.link(obj)
+    obj.modifiers.new("Unified_Terrain", 'NODES').node_group = node_group
+    try:
+        error = terrain_evaluator.verify_against_node_group(obj, tolerance)
+    finally:
+        bpy.data.objects.remove(obj, do_unlink=True)
+        bpy.data.meshes.remove(mesh)
+        bpy.data.images.remove(canvas)
+        if created:
+            bpy.data.node_groups.remove(node_group)
+        else:
+            sampler.inputs['Image'].default_value = previous_canvas
+    return float('inf') if error is None else error
+
+def check_node_group_parity(objects=None, tolerance=NODE_GROUP_TOLERANCE):
+    """verify_against_node_group on every flat object with a Unified_Terrain modifier"""
+    import bpy
+
+    if objects is None:
+        objects = [obj for obj in bpy.data.objects
+                   if obj.get("oneill_flat") and obj.modifiers.get("Unified_Terrain")]
+    if not objects:
+        print("⚠️ No flat objects with Unified_Terrain - node group parity not checked")
+        return 0.0
+
+    worst = 0.0
+    for obj in objects:
+        error = terrain_evaluator.verify_against_node_group(obj, tolerance)
+        if error is None:
+            return float('inf')
+        worst = max(worst, error)
+    return worst
+
+
+def main(argv=None):
+    """record | check (default) - returns a process exit code"""
+    if argv is None:
+        argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+    command = argv[0] if argv else "check"
+
+    try:
+        import bpy  # noqa: F401 - only to know whether Blender is available
+        in_blender = True
+    except ImportError:
+        in_blender = False
+
+    if command == "record":
+        if not in_blender:
+            print("❌ Recording needs Blender: blender -b --python evaluator_parity.py -- record")
+            return 2
+        record_noise_fixture()
+        return 0
+
+    ok = check_noise_fixture() <= FIXTURE_TOLERANCE
+    ok = check_noise_periodicity() <= PERIOD_TOLERANCE and ok
+    if in_blender:
+        ok = check_tiny_grid() <= NODE_GROUP_TOLERANCE and ok
+        ok = check_node_group_parity() <= NODE_GROUP_TOLERANCE and ok
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,306 @@
+"""
+O'Neill Terrain Generator - Tiled Heightmap Export
+Bakes the ark's height field in the canvas U-strip layout and writes engine landscape tiles
+R16 RAW / 16-bit PNG / float EXR tiles with overlap borders and a LOD pyramid, in a thread pool
+"""
+
+import json
+import os
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import bpy
+import numpy as np
+
+try:
+    from . import mesh_arrays
+    from . import terrain_evaluator
+    from .uv_layout import get_uv_layout_engine
+except ImportError:
+    import mesh_arrays
+    import terrain_evaluator
+    from uv_layout import get_uv_layout_engine
+
+TILE_FORMATS = {'R16': 'r16', 'PNG16': 'png', 'EXR': 'exr'}
+DEFAULT_TILE_SIZE = 512
+DEFAULT_OVERLAP = 1
+MANIFEST_NAME = "heightmap_manifest.json"
+HEIGHTFIELD_NAME = "heightfield.npy"
+
+
+# ========================= TILE WRITERS (no bpy) =========================
+
+def to_uint16(heights, height_min, height_max):
+    """Map heights to the full 0-65535 range of the ark's [height_min, height_max]"""
+    scale = 65535.0 / (height_max - height_min) if height_max > height_min else 0.0
+    return np.clip(np.rint((heights - height_min) * scale), 0, 65535).astype(np.uint16)
+
+def write_r16(path, heights, height_min, height_max):
+    """Headerless little-endian uint16 (Unreal/Unity RAW)"""
+    to_uint16(heights, height_min, height_max).astype('<u2').tofile(path)
+
+def write_png16(path, heights, height_min, height_max):
+    """16-bit greyscale PNG written with zlib - no imaging library needed"""
+    data = to_uint16(heights, height_min, height_max).astype('>u2')
+    height, width = data.shape
+    rows = np.zeros((height, 1 + width * 2), dtype=np.uint8)  # Filter byte 0 per row
+    rows[:, 1:] = data.view(np.uint8).reshape(height, width * 2)
+
+    def chunk(kind, payload):
+        return (struct.pack('>I', len(payload)) + kind + payload
+                + struct.pack('>I', zlib.crc32(kind + payload) & 0xffffffff))
+
+    with open(path, 'wb') as f:
+        f.write(b'\x89PNG\r\n\x1a\n')
+        f.write(chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 16, 0, 0, 0, 0)))
+        f.write(chunk(b'IDAT', zlib.compress(rows.tobytes(), 6)))
+        f.write(chunk(b'IEND', b''))
+
+def write_exr(path, heights, height_min=None, height_max=None):
+    """Uncompressed single-channel ('Y') float32 scanline OpenEXR"""
+    data = np.ascontiguousarray(heights, dtype='<f4')
+    height, width = data.shape
+
+    def attribute(name, kind, payload):
+        return name.encode() + b'\0' + kind.encode() + b'\0' + struct.pack('<i', len(payload)) + payload
+
+    window = struct.pack('<iiii', 0, 0, width - 1, height - 1)
+    header = b''.join((
+        attribute('channels', 'chlist', b'Y\0' + struct.pack('<iB3xii', 2, 0, 1, 1) + b'\0'),
+        attribute('compression', 'compression', b'\0'),
+        attribute('dataWindow', 'box2i', window),
+        attribute('displayWindow', 'box2i', window),
+        attribute('lineOrder', 'lineOrder', b'\0'),
+        attribute('pixelAspectRatio', 'float', struct.pack('<f', 1.0)),
+        attribute('screenWindowCenter', 'v2f', struct.pack('<ff', 0.0, 0.0)),
+        attribute('screenWindowWidth', 'float', struct.pack('<f', 1.0)),
+    )) + b'\0'
+
+    line_bytes = 8 + width * 4
+    first_line = 8 + len(header) + height * 8
+    offsets = first_line + np.arange(height, dtype='<u8') * line_bytes
+
+    lines = np.empty(height, dtype=[('y', '<i4'), ('size', '<i4'), ('pixels', '<f4', width)])
+    lines['y'] = np.arange(height)
+    lines['size'] = width * 4
+    lines['pixels'] = data
+
+    with open(path, 'wb') as f:
+        f.write(struct.pack('<ii', 20000630, 2))
+        f.write(header)
+        offsets.tofile(f)
+        lines.tofile(f)
+
+TILE_WRITERS = {'R16': write_r16, 'PNG16': write_png16, 'EXR': write_exr}
+
+def downsample(heights):
+    """2x2 box filter for the next LOD level (odd edges are repeated)"""
+    height, width = heights.shape
+    padded = np.pad(heights, ((0, height % 2), (0, width % 2)), mode='edge')
+    return padded.reshape(padded.shape[0] // 2, 2, padded.shape[1] // 2, 2).mean(axis=(1, 3))
+
+def tile_extent(size, index, tile_size):
+    """Texels of tile `index` along an axis of `size` texels - the last tile may be partial"""
+    return min(tile_size, size - index * tile_size)
+
+def tile_with_border(heights, row, column, tile_size, overlap):
+    """One tile, cropped to the field, plus `overlap` texels of its neighbours
+
+    Only the border wraps across rows (the field is the cylinder circumference)
+    and clamps at the ark ends; the tile itself never repeats texels, so edge
+    tiles and coarse LOD levels smaller than tile_size come out smaller.
+    """
+    height, width = heights.shape
+    row_start, column_start = row * tile_size, column * tile_size
+    row_end = row_start + tile_extent(height, row, tile_size)
+    column_end = column_start + tile_extent(width, column, tile_size)
+    rows = np.arange(row_start - overlap, row_end + overlap) % height
+    columns = np.clip(np.arange(column_start - overlap, column_end + overlap), 0, width - 1)
+    return heights[np.ix_(rows, columns)]
+
+
+# ========================= EXPORTER =========================
+
+class HeightmapTileExporter:
+    """Ark height field in the canvas U-strip layout, cut into engine tiles
+
+    Strip i (flats sorted by X) owns columns [i * resolution, (i + 1) * resolution)
+    and every strip spans the full circumference in `resolution` rows, exactly
+    like the painting canvas. Row 0 is theta = -pi (V = 0); tiles are written
+    with the top row at V = 1, as image formats expect.
+    """
+
+    def __init__(self, directory, resolution=1024, tile_size=DEFAULT_TILE_SIZE,
+                 overlap=DEFAULT_OVERLAP, tile_format='R16', workers=None):
+        if tile_format not in TILE_FORMATS:
+            raise ValueError(f"Unknown tile format: {tile_format}")
+        self.directory = directory
+        self.resolution = resolution
+        self.tile_size = tile_size
+        self.overlap = overlap
+        self.tile_format = tile_format
+        self.workers = workers or os.cpu_count() or 1
+
+    # -------------------- height field --------------------
+
+    def grid_positions(self, obj):
+        """Local (x, y, 0) positions of a resolution x resolution grid over the flat"""
+        length = float(obj.get("cylinder_length", 2.0))
+        circumference = 2 * np.pi * float(obj.get("cylinder_radius", 1.0))
+        steps = (np.arange(self.resolution) + 0.5) / self.resolution - 0.5
+        x, y = np.meshgrid(steps * length, steps * circumference)
+        return np.stack((x.ravel(), y.ravel(), np.zeros(x.size)), axis=1)
+
+    def evaluated_strip(self, obj, evaluator):
+        """Strip job: the headless evaluator sampled over the flat's own UV range"""
+        uvs = get_uv_layout_engine().read_uvs(obj.data)
+        if uvs is None or not len(uvs):
+            raise ValueError(f"{obj.name} has no UV layer")
+        u_min, u_max = float(uvs[:, 0].min()), float(uvs[:, 0].max())
+        positions = self.grid_positions(obj)
+
+        def job():
+            steps = (np.arange(self.resolution) + 0.5) / self.resolution
+            u, v = np.meshgrid(u_min + steps * (u_max - u_min), steps)
+            heights = evaluator.displacement(positions, np.stack((u.ravel(), v.ravel()), axis=1))
+            return heights.reshape(self.resolution, self.resolution)
+        return job
+
+    def mesh_strip(self, obj):
+        """Strip job: a baked grid mesh, bilinearly resampled to resolution x resolution"""
+        segments_x = int(obj.get("grid_segments_x", 0))
+        segments_y = int(obj.get("grid_segments_y", 0))
+        coords = mesh_arrays.read_coords(obj.data)
+        if not segments_x or len(coords) != (segments_x + 1) * (segments_y + 1):
+            raise ValueError(f"{obj.name} is not an unwrapped grid")
+        index = mesh_arrays.grid_vertex_index(coords, segments_x, segments_y,
+                                              float(obj.get("cylinder_length", 2.0)),
+                                              2 * np.pi * float(obj.get("cylinder_radius", 1.0)))
+        if index is None:
+            raise ValueError(f"{obj.name} vertices are not on its grid")
+        grid = np.empty(len(coords), dtype=np.float64)
+        grid[index] = coords[:, 2]
+        grid = grid.reshape(segments_y + 1, segments_x + 1)
+
+        def job():
+            steps = (np.arange(self.resolution) + 0.5) / self.resolution
+            fx, fy = steps * segments_x, steps * segments_y
+            x0 = np.minimum(fx.astype(np.int64), segments_x - 1)
+            y0 = np.minimum(fy.astype(np.int64), segments_y - 1)
+            tx, ty = (fx - x0)[None, :], (fy - y0)[:, None]
+            return ((1 - ty) * ((1 - tx) * grid[np.ix_(y0, x0)] + tx * grid[np.ix_(y0, x0 + 1)])
+                    + ty * ((1 - tx) * grid[np.ix_(y0 + 1, x0)] + tx * grid[np.ix_(y0 + 1, x0 + 1)]))
+        return job
+
+    def strip_jobs(self, flat_objects):
+        """Read every flat's inputs from bpy up front - returns NumPy-only callables
+
+        Live terrain goes through the evaluator (one per node group, so the
+        canvas is read once); baked flats come straight from their mesh.
+        """
+        evaluators = {}
+        jobs = []
+        for obj in flat_objects:
+            modifier = obj.modifiers.get("Unified_Terrain")
+            node_group = modifier.node_group if modifier is not None else None
+            if node_group is None:
+                jobs.append(self.mesh_strip(obj))
+                continue
+            if node_group.name not in evaluators:
+                evaluators[node_group.name] = terrain_evaluator.evaluator_for_node_group(node_group)
+            jobs.append(self.evaluated_strip(obj, evaluators[node_group.name]))
+        return jobs
+
+    def bake_heightfield(self, flat_objects):
+        """(resolution, N * resolution) memory-mapped height field in U-strip order"""
+        os.makedirs(self.directory, exist_ok=True)
+        jobs = self.strip_jobs(flat_objects)
+        heights = np.lib.format.open_memmap(
+            os.path.join(self.directory, HEIGHTFIELD_NAME), mode='w+', dtype=np.float32,
+            shape=(self.resolution, self.resolution * len(jobs)))
+
+        def bake(index):
+            heights[:, index * self.resolution:(index + 1) * self.resolution] = jobs[index]()
+
+        # Jobs only touch NumPy arrays, so strips evaluate in parallel threads
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            list(pool.map(bake, range(len(jobs))))
+        heights.flush()
+        return heights
+
+    # -------------------- tiles --------------------
+
+    def write_level(self, pool, heights, level, height_min, height_max):
+        """Submit every tile of one LOD level - returns (futures, tile grid size)"""
+        folder = os.path.join(self.directory, f"lod{level}")
+        os.makedirs(folder, exist_ok=True)
+        rows = -(-heights.shape[0] // self.tile_size)
+        columns = -(-heights.shape[1] // self.tile_size)
+        writer = TILE_WRITERS[self.tile_format]
+        extension = TILE_FORMATS[self.tile_format]
+
+        def write_tile(row, column):
+            tile = tile_with_border(heights, row, column, self.tile_size, self.overlap)
+            path = os.path.join(folder, f"tile_x{column:03d}_y{rows - 1 - row:03d}.{extension}")
+            writer(path, np.flipud(tile), height_min, height_max)
+
+        futures = [pool.submit(write_tile, row, column) for row in range(rows) for column in range(columns)]
+        return futures, (columns, rows)
+
+    def export(self, flat_objects):
+        """Bake, tile and write every LOD level - returns the manifest dict"""
+        flat_objects = sorted(flat_objects, key=lambda obj: obj.location.x)
+        heights = self.bake_heightfield(flat_objects)
+        height_min, height_max = float(heights.min()), float(heights.max())
+
+        levels = []
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            level, current = 0, np.asarray(heights)
+            while True:
+                futures, (columns, rows) = self.write_level(pool, current, level, height_min, height_max)
+                levels.append({'level': level, 'width': current.shape[1], 'height': current.shape[0],
+                               'tiles_x': columns, 'tiles_y': rows, 'folder': f"lod{level}",
+                               # Texels per tile without the border; the last column/row may be partial
+                               'tile_width': tile_extent(current.shape[1], 0, self.tile_size),
+                               'tile_height': tile_extent(current.shape[0], 0, self.tile_size),
+                               'last_tile_width': tile_extent(current.shape[1], columns - 1, self.tile_size),
+                               'last_tile_height': tile_extent(current.shape[0], rows - 1, self.tile_size)})
+                for future in futures:
+                    future.result()  # Surface write errors
+                if columns == 1 and rows == 1:
+                    break
+                level, current = level + 1, downsample(current)
+
+        manifest = {
+            'format': self.tile_format,
+            'tile_size': self.tile_size,
+            'overlap': self.overlap,
+            'tile_pixels': self.tile_size + 2 * self.overlap,  # Full tiles; see each level's tile extents
+            'resolution_per_strip': self.resolution,
+            'height_min': height_min,
+            'height_max': height_max,
+            'height_encoding': 'float metres' if self.tile_format == 'EXR'
+                               else 'uint16 linear over [height_min, height_max]',
+            'rows_wrap': True,
+            'levels': levels,
+            'strips': [{
+                'name': obj.name,
+                'columns': [index * self.resolution, (index + 1) * self.resolution],
+                'metres_per_texel_x': float(obj.get("cylinder_length", 2.0)) / self.resolution,
+                'metres_per_texel_y': 2 * np.pi * float(obj.get("cylinder_radius", 1.0)) / self.resolution,
+            } for index, obj in enumerate(flat_objects)],
+        }
+        with open(os.path.join(self.directory, MANIFEST_NAME), 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+        print(f"✅ Heightmap tiles written: {len(levels)} LOD levels, "
+              f"{sum(level['tiles_x'] * level['tiles_y'] for level in levels)} tiles -> {self.directory}")
+        return manifest
+
+
+def export_heightmap_tiles(directory, flat_objects, resolution=1024, tile_format='R16',
+                           tile_size=DEFAULT_TILE_SIZE, overlap=DEFAULT_OVERLAP):
+    """Export the ark height field as tiled heightmaps - returns the manifest dict"""
+    exporter = HeightmapTileExporter(directory, resolution, tile_size, overlap, tile_format)
+    return exporter.export(flat_objects)
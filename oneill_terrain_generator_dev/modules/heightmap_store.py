@@ -0,0 +1,138 @@
+"""
+O'Neill Terrain Generator - Compact Heightmap Store
+Keeps heightmaps as single-channel float16/float32 .npy files next to the .blend
+Expands to an RGBA bpy.types.Image only on demand for display or painting
+"""
+
+import os
+
+import bpy
+import numpy as np
+
+STORE_FOLDER = "oneill_heightmaps"
+
+HEIGHTMAP_DTYPES = {
+    'HALF': np.float16,
+    'FLOAT': np.float32,
+}
+
+
+class HeightmapStore:
+    """Single-channel heightmaps on disk, memory-mapped while in use
+
+    An RGBA float image costs 16 bytes per texel; a float16 height costs 2.
+    Arrays are opened with mmap so only the pages actually touched are resident.
+    """
+
+    def __init__(self, directory=None):
+        self._directory = directory
+
+    @property
+    def directory(self):
+        """Folder next to the saved .blend, or Blender's temp dir for unsaved files"""
+        if self._directory:
+            return self._directory
+        if bpy.data.filepath:
+            return bpy.path.abspath(f"//{STORE_FOLDER}")
+        return os.path.join(bpy.app.tempdir, STORE_FOLDER)
+
+    @property
+    def persistent(self):
+        """False for an unsaved .blend - Blender deletes its temp dir on exit"""
+        return bool(self._directory or bpy.data.filepath)
+
+    def path_for(self, name):
+        """File path for a heightmap name"""
+        return os.path.join(self.directory, f"{bpy.path.clean_name(name)}.npy")
+
+    def path_for_object(self, obj):
+        """The object's recorded heightmap_file, falling back to the default path for its name"""
+        stored = obj.get("heightmap_file")
+        if stored:
+            path = bpy.path.abspath(stored)
+            if os.path.exists(path):
+                return path
+        return self.path_for(obj["heightmap_image"])
+
+    def exists(self, name):
+        return os.path.exists(self.path_for(name))
+
+    def create(self, name, resolution, fill=0.5, precision='HALF'):
+        """Create a resolution x resolution heightmap file filled with a constant height"""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path_for(name)
+
+        heights = np.lib.format.open_memmap(
+            path, mode='w+', dtype=HEIGHTMAP_DTYPES[precision], shape=(resolution, resolution)
+        )
+        heights[:] = fill
+        heights.flush()
+        del heights
+        return path
+
+    def load(self, name, writable=False, path=None):
+        """Memory-map a stored heightmap as an (H, W) array, or None if missing"""
+        path = path or self.path_for(name)
+        if not os.path.exists(path):
+            return None
+        return np.load(path, mmap_mode='r+' if writable else 'r')
+
+    def save(self, name, heights, precision=None, path=None):
+        """Write an (H, W) height array, keeping the stored precision unless overridden"""
+        path = path or self.path_for(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if precision is None:
+            existing = self.load(name, path=path)
+            dtype = existing.dtype if existing is not None else HEIGHTMAP_DTYPES['HALF']
+            del existing
+        else:
+            dtype = HEIGHTMAP_DTYPES[precision]
+        np.save(path, np.asarray(heights, dtype=dtype))
+
+    def to_image(self, name, image_name=None, path=None):
+        """Expand a stored heightmap into a grey RGBA float image for display or painting"""
+        heights = self.load(name, path=path)
+        if heights is None:
+            print(f"❌ No stored heightmap: {name}")
+            return None
+
+        image_name = image_name or name
+        height, width = heights.shape
+        image = bpy.data.images.get(image_name)
+        if image and (image.size[0] != width or image.size[1] != height):
+            bpy.data.images.remove(image)
+            image = None
+        if image is None:
+            image = bpy.data.images.new(image_name, width=width, height=height, alpha=False, float_buffer=True)
+
+        rgba = np.empty((height, width, 4), dtype=np.float32)
+        rgba[..., :3] = heights[..., None]
+        rgba[..., 3] = 1.0
+        image.pixels.foreach_set(rgba.ravel())
+        image.update()
+        return image
+
+    def from_image(self, image, name=None, precision=None, path=None):
+        """Collapse an RGBA image back into the store (R channel holds the height)"""
+        width, height = image.size[0], image.size[1]
+        rgba = np.empty(width * height * 4, dtype=np.float32)
+        image.pixels.foreach_get(rgba)
+        path = path or self.path_for(name or image.name)
+        self.save(name or image.name, rgba.reshape(height, width, 4)[..., 0], precision, path)
+        return path
+
+    def remove(self, name):
+        path = self.path_for(name)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+# Global store instance for integration
+_heightmap_store = None
+
+def get_heightmap_store():
+    """Get global heightmap store instance"""
+    global _heightmap_store
+    if _heightmap_store is None:
+        _heightmap_store = HeightmapStore()
+    return _heightmap_store
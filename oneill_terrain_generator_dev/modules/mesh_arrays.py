@@ -0,0 +1,174 @@
+"""
+O'Neill Terrain Generator - Bulk Mesh Array Helpers
+NumPy readers/writers for Blender meshes via foreach_get/foreach_set
+Shared by unwrap, bounds, rewrap and export so no stage walks BMVerts in Python
+"""
+
+import bpy
+import numpy as np
+
+
+def read_coords(mesh):
+    """Local vertex coordinates as an (N, 3) float32 array"""
+    coords = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get('co', coords)
+    return coords.reshape(-1, 3)
+
+def write_coords(mesh, coords):
+    """Write (N, 3) vertex coordinates back in one call"""
+    mesh.vertices.foreach_set('co', np.ascontiguousarray(coords, dtype=np.float32).ravel())
+    mesh.update()
+
+def matrix_to_array(matrix):
+    """mathutils.Matrix -> (4, 4) float64 array"""
+    return np.array(matrix, dtype=np.float64)
+
+def transform_coords(coords, matrix):
+    """Apply a 4x4 affine matrix to (N, 3) coordinates"""
+    matrix = np.asarray(matrix, dtype=np.float64)
+    return coords @ matrix[:3, :3].T + matrix[:3, 3]
+
+def read_world_coords(obj):
+    """World-space vertex coordinates of a mesh object as an (N, 3) float64 array"""
+    return transform_coords(read_coords(obj.data), matrix_to_array(obj.matrix_world))
+
+def read_loop_vertex_indices(mesh):
+    """Vertex index of every loop as an (L,) int32 array"""
+    indices = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get('vertex_index', indices)
+    return indices
+
+def read_faces(mesh):
+    """Faces as an (F, K) int32 array when every polygon has K corners, else None"""
+    face_count = len(mesh.polygons)
+    if face_count == 0:
+        return None
+
+    sizes = np.empty(face_count, dtype=np.int32)
+    mesh.polygons.foreach_get('loop_total', sizes)
+    corners = int(sizes[0])
+    if (sizes != corners).any():
+        return None
+
+    starts = np.empty(face_count, dtype=np.int32)
+    mesh.polygons.foreach_get('loop_start', starts)
+    if (starts != np.arange(face_count, dtype=np.int32) * corners).any():
+        return None  # Loops not stored in polygon order
+
+    return read_loop_vertex_indices(mesh).reshape(-1, corners)
+
+def read_triangles(mesh):
+    """Triangulated faces as an (T, 3) int32 array of vertex indices"""
+    mesh.calc_loop_triangles()
+    triangles = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+    mesh.loop_triangles.foreach_get('vertices', triangles)
+    return triangles.reshape(-1, 3)
+
+
+def grid_plane_arrays(segments_x, segments_y, size_x, size_y):
+    """Vertex and quad arrays for a segments_x x segments_y plane centred on the origin
+
+    Vertex (i, j) has index j * (segments_x + 1) + i, so row j = 0 is the -Y edge
+    and column i = 0 the -X edge. Quads wind counter-clockwise (normals along +Z).
+    Returns (coords (V, 3) float32, quads (F, 4) int32).
+    """
+    columns = segments_x + 1
+    rows = segments_y + 1
+
+    xs = np.linspace(-size_x / 2, size_x / 2, columns, dtype=np.float32)
+    ys = np.linspace(-size_y / 2, size_y / 2, rows, dtype=np.float32)
+
+    coords = np.zeros((rows * columns, 3), dtype=np.float32)
+    coords[:, 0] = np.tile(xs, rows)
+    coords[:, 1] = np.repeat(ys, columns)
+
+    corner = (np.arange(segments_y)[:, None] * columns + np.arange(segments_x)[None, :]).ravel()
+    quads = np.stack((corner, corner + 1, corner + 1 + columns, corner + columns), axis=1)
+    return coords, quads.astype(np.int32)
+
+def upsample_grid(values, factor):
+    """Bilinearly subdivide a (rows, columns, K) grid of vertex values factor times per axis
+
+    Returns ((rows - 1) * factor + 1, (columns - 1) * factor + 1, K); the original
+    vertices are kept exactly. On a flat, evenly spaced grid this is where a
+    Subdivision Surface at level log2(factor) puts its vertices.
+    """
+    rows, columns = values.shape[:2]
+    fy = np.arange((rows - 1) * factor + 1) / factor
+    fx = np.arange((columns - 1) * factor + 1) / factor
+    y0 = np.minimum(fy.astype(np.int64), rows - 2)
+    x0 = np.minimum(fx.astype(np.int64), columns - 2)
+    ty = (fy - y0)[:, None, None]
+    tx = (fx - x0)[None, :, None]
+    return ((1 - ty) * ((1 - tx) * values[np.ix_(y0, x0)] + tx * values[np.ix_(y0, x0 + 1)])
+            + ty * ((1 - tx) * values[np.ix_(y0 + 1, x0)] + tx * values[np.ix_(y0 + 1, x0 + 1)]))
+
+def grid_boundary_indices(segments_x, segments_y):
+    """Vertex indices of the four edges of a grid_plane_arrays() grid
+
+    Returns a dict with 'y_min'/'y_max' rows and 'x_min'/'x_max' columns,
+    each ordered along the edge.
+    """
+    columns = segments_x + 1
+    rows = segments_y + 1
+    row_starts = np.arange(rows) * columns
+    return {
+        'y_min': np.arange(columns, dtype=np.int64),
+        'y_max': np.arange(columns, dtype=np.int64) + (rows - 1) * columns,
+        'x_min': row_starts.astype(np.int64),
+        'x_max': (row_starts + segments_x).astype(np.int64),
+    }
+
+def grid_vertex_index(coords, segments_x, segments_y, size_x, size_y):
+    """Row-major grid index of every vertex of a (possibly reordered) grid plane
+
+    Vertices are snapped to the nearest grid column/row from their X/Y, so a
+    subdivided grid (whose vertex order is not row-major) can be put back into
+    grid_plane_arrays() order with new_coords[index] = coords. Returns None if
+    the vertices are not exactly one per grid point.
+    """
+    columns = segments_x + 1
+    if len(coords) != columns * (segments_y + 1):
+        return None
+
+    column = np.rint((coords[:, 0] / size_x + 0.5) * segments_x).astype(np.int64)
+    row = np.rint((coords[:, 1] / size_y + 0.5) * segments_y).astype(np.int64)
+    if column.min() < 0 or column.max() > segments_x or row.min() < 0 or row.max() > segments_y:
+        return None
+
+    index = row * columns + column
+    if (np.bincount(index, minlength=len(coords)) != 1).any():
+        return None
+    return index
+
+def build_mesh(name, coords, faces, loop_uvs=None, uv_layer_name='UVMap'):
+    """Create a mesh datablock straight from NumPy arrays
+
+    faces is an (F, K) array of vertex indices (all faces share K corners);
+    loop_uvs, if given, is an (F * K, 2) array in loop order.
+    """
+    faces = np.ascontiguousarray(faces, dtype=np.int32)
+    face_count, corners = faces.shape
+    loop_count = face_count * corners
+
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(coords))
+    mesh.vertices.foreach_set('co', np.ascontiguousarray(coords, dtype=np.float32).ravel())
+
+    mesh.loops.add(loop_count)
+    mesh.loops.foreach_set('vertex_index', faces.ravel())
+
+    mesh.polygons.add(face_count)
+    mesh.polygons.foreach_set('loop_start', np.arange(0, loop_count, corners, dtype=np.int32))
+    if bpy.app.version < (4, 0, 0):
+        # Blender 4.0+ derives polygon sizes from loop_start offsets
+        mesh.polygons.foreach_set('loop_total', np.full(face_count, corners, dtype=np.int32))
+
+    mesh.update(calc_edges=True)
+
+    if loop_uvs is not None:
+        uv_layer = mesh.uv_layers.new(name=uv_layer_name)
+        uv_layer.data.foreach_set('uv', np.ascontiguousarray(loop_uvs, dtype=np.float32).ravel())
+
+    mesh.validate()
+    return mesh
@@ -0,0 +1,262 @@
+"""
+O'Neill Terrain Generator - Adaptive Preview LOD
+Chooses the Preview_Subdivision level of each flat object instead of a fixed level 2
+Driven by painted coverage (biome strip histograms), screen-space size and a vertex budget
+Viewport only - rewrap, export and render always use OUTPUT_LEVEL
+"""
+
+import math
+import time
+from contextlib import contextmanager
+
+import bpy
+import numpy as np
+
+try:
+    from .biome_classifier import FLAT_LABEL
+    from .biome_map import get_biome_map
+    from .canvas_buffer import CANVAS_NAME
+    from .canvas_change_tracker import get_change_tracker
+    from .tiled_canvas import get_tiled_canvas
+except ImportError:
+    from biome_classifier import FLAT_LABEL
+    from biome_map import get_biome_map
+    from canvas_buffer import CANVAS_NAME
+    from canvas_change_tracker import get_change_tracker
+    from tiled_canvas import get_tiled_canvas
+
+SUBSURF_NAME = "Preview_Subdivision"
+
+OUTPUT_LEVEL = 2         # Rewrap/export/render level - the Session 42 level, camera independent
+MAX_LEVEL = 2            # Strips being painted right now
+IDLE_MAX_LEVEL = 1       # Painted strips nobody is working on
+DEFAULT_VERTEX_BUDGET = 500000
+
+PAINTED_COVERAGE = 0.001   # Share of non-FLAT pixels before a strip counts as painted
+ACTIVE_SECONDS = 5.0       # A strip stays "being painted" this long after its last change
+TARGET_QUAD_PIXELS = 8.0   # Subdivide until a preview quad is about this many pixels wide
+
+
+class PreviewLODManager:
+    """Per-object subdivision levels for the painting preview
+
+    Unpainted and off-screen strips get level 0. Painted strips get a level from
+    their on-screen size, capped at IDLE_MAX_LEVEL unless they were painted in
+    the last ACTIVE_SECONDS. Levels are then lowered, least important object
+    first, until the estimated preview vertex count fits the budget.
+
+    Only the viewport levels change. render_levels stays at OUTPUT_LEVEL, and
+    output_levels() puts every object on OUTPUT_LEVEL while rewrapping or
+    exporting, so the result never depends on where the camera was.
+    """
+
+    def __init__(self, vertex_budget=DEFAULT_VERTEX_BUDGET):
+        self.vertex_budget = vertex_budget
+        self.last_painted = {}  # object name -> time.monotonic() of last stroke
+        self.levels = {}        # object name -> level last applied
+        self.painted = {}       # object name -> coverage last measured, kept for non-resident tiles
+
+    # -------------------- inputs --------------------
+
+    def canvas_groups(self, flat_objects):
+        """[(canvas image, objects left to right)] - one entry per canvas or tile"""
+        ordered = sorted(flat_objects, key=lambda obj: obj.location.x)
+        tiled = get_tiled_canvas()
+        if tiled:
+            return [(tiled.tile_image(tile_index), tiled.objects_in_tile(ordered, tile_index))
+                    for tile_index in range(tiled.tile_count)]
+        return [(bpy.data.images.get(CANVAS_NAME), ordered)]
+
+    def coverage(self, flat_objects):
+        """{object name: painted share of its canvas strip}
+
+        Tiles that are not resident keep their last measured coverage; a tile
+        never measured is read once and released again.
+        """
+        tiled = get_tiled_canvas()
+        result = {}
+        for canvas, objects in self.canvas_groups(flat_objects):
+            if canvas is None or not objects:
+                continue
+            if (tiled and not tiled.is_resident(canvas)
+                    and all(obj.name in self.painted for obj in objects)):
+                result.update((obj.name, self.painted[obj.name]) for obj in objects)
+                continue
+
+            biome_map = get_biome_map(canvas)
+            biome_map.refresh(canvas)
+            for obj, histogram in zip(objects, biome_map.strip_histograms(len(objects))):
+                total = histogram.sum()
+                result[obj.name] = 1.0 - histogram[FLAT_LABEL] / total if total else 0.0
+            if tiled:
+                tiled.settle(canvas)
+        self.painted.update(result)
+        return result
+
+    def mark_painted(self, canvas, changed_tiles, flat_objects):
+        """Stamp the strips touched by changed tiles as being painted now"""
+        if not len(changed_tiles):
+            return
+        objects = next((objects for image, objects in self.canvas_groups(flat_objects)
+                        if image is not None and image.name == canvas.name), None)
+        if not objects:
+            return
+
+        tracker = get_change_tracker(canvas)
+        width = canvas.size[0]
+        columns = np.asarray(changed_tiles)[:, 1] * tracker.tile_size
+        first = columns * len(objects) // width
+        last = np.minimum(columns + tracker.tile_size - 1, width - 1) * len(objects) // width
+
+        now = time.monotonic()
+        for start, end in zip(first, last):
+            for index in range(int(start), int(end) + 1):
+                self.last_painted[objects[index].name] = now
+
+    def screen_pixels(self, obj, view):
+        """Projected diagonal of the object's bounds in pixels (None without a 3D view)"""
+        if view is None:
+            return None
+        region, region_3d = view
+
+        corners = np.array([tuple(corner) for corner in obj.bound_box], dtype=np.float64)
+        matrix = np.array(region_3d.perspective_matrix, dtype=np.float64) @ np.array(obj.matrix_world, dtype=np.float64)
+        clip = np.c_[corners, np.ones(len(corners))] @ matrix.T
+
+        in_front = clip[:, 3] > 1e-6
+        if not in_front.any():
+            return 0.0
+        ndc = clip[in_front, :2] / clip[in_front, 3:4]
+        if (ndc.max(axis=0) < -1).any() or (ndc.min(axis=0) > 1).any():
+            return 0.0  # Entirely outside the view
+
+        ndc = np.clip(ndc, -1.0, 1.0)
+        extent = (ndc.max(axis=0) - ndc.min(axis=0)) * 0.5 * np.array([region.width, region.height])
+        return float(np.hypot(*extent))
+
+    def active_view(self):
+        """(region, region_3d) of the largest 3D viewport, or None when headless"""
+        screen = getattr(bpy.context, "screen", None)
+        if screen is None:
+            return None
+        best = None
+        for area in screen.areas:
+            if area.type != 'VIEW_3D':
+                continue
+            region = next((region for region in area.regions if region.type == 'WINDOW'), None)
+            if region is not None and (best is None or region.width * region.height > best[0].width * best[0].height):
+                best = (region, area.spaces.active.region_3d)
+        return best
+
+    # -------------------- level selection --------------------
+
+    def screen_level(self, obj, pixels):
+        """Level at which a preview quad is about TARGET_QUAD_PIXELS wide on screen"""
+        if pixels is None:
+            return MAX_LEVEL
+        segments = math.hypot(obj.get("grid_segments_x", 20), obj.get("grid_segments_y", 20))
+        pixels_per_quad = pixels / max(segments, 1.0)
+        if pixels_per_quad <= TARGET_QUAD_PIXELS:
+            return 0
+        return min(MAX_LEVEL, int(math.ceil(math.log2(pixels_per_quad / TARGET_QUAD_PIXELS))))
+
+    def plan_levels(self, flat_objects, vertex_budget=None):
+        """{object name: subdivision level} for the current canvas, view and budget"""
+        budget = vertex_budget or self.vertex_budget
+        coverage = self.coverage(flat_objects)
+        view = self.active_view()
+        now = time.monotonic()
+
+        levels = {}
+        priority = {}
+        base_vertices = {}
+        for obj in flat_objects:
+            base_vertices[obj.name] = len(obj.data.vertices)
+            painted = coverage.get(obj.name, 0.0)
+            pixels = self.screen_pixels(obj, view)
+
+            if painted < PAINTED_COVERAGE or pixels == 0.0:
+                levels[obj.name] = 0
+                priority[obj.name] = 0.0
+                continue
+
+            active = now - self.last_painted.get(obj.name, -math.inf) < ACTIVE_SECONDS
+            level = self.screen_level(obj, pixels)
+            levels[obj.name] = level if active else min(level, IDLE_MAX_LEVEL)
+            # Actively painted strips are dropped last; then bigger, more painted ones
+            priority[obj.name] = (2.0 if active else 1.0) + painted * (pixels or 1.0) * 1e-6
+
+        # Lower the least important levels first until the preview fits the budget
+        def vertex_count(name):
+            return base_vertices[name] * 4 ** levels[name]
+
+        total = sum(vertex_count(name) for name in levels)
+        for name in sorted(levels, key=lambda name: priority[name]):
+            while total > budget and levels[name] > 0:
+                total -= vertex_count(name)
+                levels[name] -= 1
+                total += vertex_count(name)
+            if total <= budget:
+                break
+
+        return levels
+
+    def apply(self, flat_objects, vertex_budget=None):
+        """Set each object's Preview_Subdivision level - only touches changed modifiers"""
+        levels = self.plan_levels(flat_objects, vertex_budget)
+        changed = 0
+        for obj in flat_objects:
+            modifier = obj.modifiers.get(SUBSURF_NAME)
+            if modifier is None:
+                continue
+            level = levels.get(obj.name, 0)
+            if modifier.levels != level or modifier.show_viewport != (level > 0):
+                modifier.levels = level
+                # Level 0 still costs a modifier evaluation - skip it entirely
+                modifier.show_viewport = level > 0
+                changed += 1
+            if modifier.render_levels != OUTPUT_LEVEL:
+                modifier.render_levels = OUTPUT_LEVEL
+        self.levels = levels
+        return changed
+
+    def stage(self, flat_objects, vertex_budget=None):
+        """Canvas pipeline stage: re-plan levels for the strips that were just painted"""
+        def update_preview_lod(canvas, changed_tiles):
+            self.mark_painted(canvas, changed_tiles, flat_objects)
+            self.apply(flat_objects, vertex_budget)
+            return False  # Never writes to the canvas
+        return update_preview_lod
+
+
+@contextmanager
+def output_levels(objects, level=OUTPUT_LEVEL):
+    """Evaluate objects at one fixed Preview_Subdivision level, then restore the preview LOD
+
+    Get the depsgraph inside the block - it is only re-evaluated on request.
+    """
+    saved = []
+    for obj in objects:
+        modifier = obj.modifiers.get(SUBSURF_NAME)
+        if modifier is None:
+            continue
+        saved.append((modifier, modifier.levels, modifier.show_viewport))
+        modifier.levels = level
+        modifier.show_viewport = level > 0
+    try:
+        yield
+    finally:
+        for modifier, levels, show_viewport in saved:
+            modifier.levels = levels
+            modifier.show_viewport = show_viewport
+
+
+# Global LOD manager instance for integration
+_preview_lod_manager = None
+
+def get_preview_lod_manager():
+    """Get global preview LOD manager instance"""
+    global _preview_lod_manager
+    if _preview_lod_manager is None:
+        _preview_lod_manager = PreviewLODManager()
+    return _preview_lod_manager
@@ -0,0 +1,177 @@
+"""
+O'Neill Terrain Generator - Geometric Rewrap Engine
+Maps evaluated flat terrain back onto its cylinder: (x, y, z) -> (x, theta = y / r, r - z)
+One foreach_get, one NumPy pass and one mesh build per flat object
+"""
+
+import bpy
+import numpy as np
+
+try:
+    from . import mesh_arrays
+    from .preview_lod import output_levels
+    from .uv_layout import get_uv_layout_engine
+except ImportError:
+    import mesh_arrays
+    from preview_lod import output_levels
+    from uv_layout import get_uv_layout_engine
+
+AXES = ('X', 'Y', 'Z')
+MAX_DETECTED_LEVEL = 4  # Highest subdivision level checked when recovering grid order
+
+
+def cylinder_coords(flat_coords, radius, alignment_axis='X'):
+    """(N, 3) flat coordinates -> (N, 3) coordinates on the cylinder interior
+
+    x runs along the cylinder axis, y / radius is the angle around it
+    (theta = 0 at the bottom) and terrain height z moves the surface inward
+    toward the axis. The mapping keeps handedness, so flat faces that face +Z
+    end up facing the axis.
+    """
+    flat_coords = np.asarray(flat_coords, dtype=np.float64)
+    theta = flat_coords[:, 1] / radius
+    distance = radius - flat_coords[:, 2]
+
+    axis = AXES.index(alignment_axis)
+    side, up = (axis + 1) % 3, (axis + 2) % 3  # Cyclic order keeps the frame right-handed
+
+    result = np.empty_like(flat_coords)
+    result[:, axis] = flat_coords[:, 0]
+    result[:, side] = distance * np.sin(theta)
+    result[:, up] = -distance * np.cos(theta)
+    return result
+
+
+class RewrapEngine:
+    """Builds one cylindrical terrain mesh per flat object from its evaluated mesh
+
+    The evaluated mesh includes the preview subdivision and geometry-node
+    displacement. Every object is evaluated at preview_lod.OUTPUT_LEVEL, not
+    at its camera-dependent preview level, so all segments share one
+    resolution. When it is still a regular grid its vertices are put back in
+    row-major grid order and the grid size is stored on the new object, so seam
+    stages can address boundary rows by index.
+    """
+
+    def __init__(self):
+        self.uv_engine = get_uv_layout_engine()
+
+    def read_evaluated(self, flat_obj, depsgraph):
+        """(coords, faces, loop_uvs) of the evaluated flat mesh in local space"""
+        evaluated = flat_obj.evaluated_get(depsgraph)
+        mesh = evaluated.to_mesh()
+        try:
+            coords = mesh_arrays.read_coords(mesh).astype(np.float64)
+            faces = mesh_arrays.read_faces(mesh)
+            loop_uvs = self.uv_engine.read_uvs(mesh) if faces is not None else None
+            if faces is None:
+                faces = mesh_arrays.read_triangles(mesh)
+        finally:
+            evaluated.to_mesh_clear()
+        return coords, faces, loop_uvs
+
+    def grid_order(self, flat_obj, coords):
+        """(index, segments_x, segments_y) to restore row-major grid order, or None"""
+        segments_x = flat_obj.get("grid_segments_x")
+        segments_y = flat_obj.get("grid_segments_y")
+        if not segments_x or not segments_y:
+            return None
+
+        length = float(flat_obj.get("cylinder_length", 2.0))
+        circumference = 2 * np.pi * float(flat_obj.get("cylinder_radius", 1.0))
+        for level in range(MAX_DETECTED_LEVEL + 1):
+            factor = 2 ** level
+            if len(coords) == (segments_x * factor + 1) * (segments_y * factor + 1):
+                index = mesh_arrays.grid_vertex_index(
+                    coords, segments_x * factor, segments_y * factor, length, circumference)
+                if index is None:
+                    return None
+                return index, segments_x * factor, segments_y * factor
+        return None
+
+    def cylinder_location(self, flat_obj):
+        """World centre of the source cylinder (its bounding-box centre)"""
+        source = bpy.data.objects.get(flat_obj.get("original_object", ""))
+        if source is None or source.type != 'MESH' or not len(source.data.vertices):
+            return (flat_obj.location.x, 0.0, 0.0)
+        world = mesh_arrays.read_world_coords(source)
+        return tuple(((world.min(axis=0) + world.max(axis=0)) / 2).tolist())
+
+    def rewrap_object(self, flat_obj, collection, depsgraph=None):
+        """Create (or refresh) the rewrapped cylinder object for one flat object"""
+        if depsgraph is None:
+            with output_levels([flat_obj]):
+                return self.rewrap_object(flat_obj, collection, bpy.context.evaluated_depsgraph_get())
+
+        radius = float(flat_obj.get("cylinder_radius", 1.0))
+        source = bpy.data.objects.get(flat_obj.get("original_object", ""))
+        alignment_axis = source.get("alignment_axis", 'X') if source else 'X'
+
+        coords, faces, loop_uvs = self.read_evaluated(flat_obj, depsgraph)
+
+        grid = self.grid_order(flat_obj, coords)
+        if grid is not None:
+            index, segments_x, segments_y = grid
+            ordered = np.empty_like(coords)
+            ordered[index] = coords
+            coords = ordered
+            faces = index[faces]
+
+        base_name = flat_obj.get("original_object") or flat_obj.name
+        name = f"{base_name}_rewrapped"
+        mesh = mesh_arrays.build_mesh(name, cylinder_coords(coords, radius, alignment_axis), faces, loop_uvs)
+
+        obj = bpy.data.objects.get(name)
+        if obj is None:
+            obj = bpy.data.objects.new(name, mesh)
+            collection.objects.link(obj)
+        else:
+            old_mesh = obj.data
+            obj.data = mesh
+            if old_mesh.users == 0:
+                bpy.data.meshes.remove(old_mesh)
+
+        obj.location = self.cylinder_location(flat_obj)
+        obj.rotation_euler = (0.0, 0.0, 0.0)
+        obj.scale = (1.0, 1.0, 1.0)
+
+        obj["oneill_rewrapped"] = True
+        obj["source_flat"] = flat_obj.name
+        obj["cylinder_radius"] = radius
+        obj["cylinder_length"] = float(flat_obj.get("cylinder_length", 2.0))
+        obj["alignment_axis"] = alignment_axis
+        if "seam_welded" in obj:
+            del obj["seam_welded"]  # Fresh mesh - seams are open again
+        if grid is not None:
+            obj["grid_segments_x"] = segments_x
+            obj["grid_segments_y"] = segments_y
+        elif "grid_segments_x" in obj:
+            del obj["grid_segments_x"]
+            del obj["grid_segments_y"]
+
+        return obj
+
+    def rewrap_objects(self, flat_objects, collection):
+        """Rewrap every flat object with one shared depsgraph - returns the new objects"""
+        rewrapped = []
+        with output_levels(flat_objects):
+            depsgraph = bpy.context.evaluated_depsgraph_get()
+            for flat_obj in sorted(flat_objects, key=lambda obj: obj.location.x):
+                try:
+                    rewrapped.append(self.rewrap_object(flat_obj, collection, depsgraph))
+                except Exception as e:
+                    print(f"❌ Failed to rewrap {flat_obj.name}: {e}")
+
+        print(f"✅ Rewrapped {len(rewrapped)}/{len(flat_objects)} flat objects onto cylinders")
+        return rewrapped
+
+
+# Global rewrap engine instance for integration
+_rewrap_engine = None
+
+def get_rewrap_engine():
+    """Get global rewrap engine instance"""
+    global _rewrap_engine
+    if _rewrap_engine is None:
+        _rewrap_engine = RewrapEngine()
+    return _rewrap_engine
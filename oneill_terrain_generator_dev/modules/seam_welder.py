@@ -0,0 +1,264 @@
+"""
+O'Neill Terrain Generator - Seam Welder
+Welds rewrapped cylinders at theta = 0/2pi and between neighbouring segments
+Boundary rows/columns come from the known grid topology - no KD-tree, O(boundary) work
+"""
+
+import math
+
+import bpy
+import numpy as np
+
+try:
+    from . import mesh_arrays
+    from .uv_layout import get_uv_layout_engine
+except ImportError:
+    import mesh_arrays
+    from uv_layout import get_uv_layout_engine
+
+SEGMENT_GAP_TOLERANCE = 1e-3  # Max distance between touching segment boundaries
+
+
+def weld_seam_arrays(coords, faces, segments_x, segments_y):
+    """Merge the y_max row of a row-major grid into its y_min row
+
+    Both rows sit at the same angle on the cylinder; the kept vertices take the
+    average of each pair. Returns new (coords, faces) - loop order (and so any
+    loop UVs) is unchanged.
+    """
+    boundary = mesh_arrays.grid_boundary_indices(segments_x, segments_y)
+    keep, drop = boundary['y_min'], boundary['y_max']
+
+    coords = np.array(coords, dtype=np.float64)
+    coords[keep] = (coords[keep] + coords[drop]) * 0.5
+
+    # y_max is the last row, so dropping it leaves every other index unchanged
+    remap = np.arange(len(coords), dtype=np.int64)
+    remap[drop] = keep
+    return coords[:drop[0]], remap[faces].astype(np.int32)
+
+def resample_column(column, rows):
+    """Points of a boundary polyline (len(column) - 1 segments) at rows + 1 evenly spaced angles
+
+    Integer arithmetic keeps the rows that share an angle with a column vertex
+    exactly on that vertex; the others land on the straight edge between two.
+    """
+    column = np.asarray(column, dtype=np.float64)
+    segments = len(column) - 1
+    numerator = np.arange(rows + 1, dtype=np.int64) * segments
+    index = np.minimum(numerator // rows, segments - 1)
+    fraction = ((numerator - index * rows) / rows)[:, None]
+    return column[index] * (1.0 - fraction) + column[index + 1] * fraction
+
+def coincident_rows(rows_a, rows_b):
+    """(indices into a, indices into b) of rows at the same angle on two resolutions"""
+    common = math.gcd(rows_a, rows_b)
+    steps = np.arange(common, dtype=np.int64)
+    return steps * (rows_a // common), steps * (rows_b // common)
+
+def welded_boundary_indices(segments_x, segments_y):
+    """x_min/x_max columns of a seam-welded grid (segments_y rows, last row merged)"""
+    row_starts = np.arange(segments_y, dtype=np.int64) * (segments_x + 1)
+    return {'x_min': row_starts, 'x_max': row_starts + segments_x}
+
+
+class SeamWelder:
+    """Welds the rewrapped segments of an ark
+
+    weld_ark() first averages the touching X boundary columns of neighbouring
+    segments so they coincide exactly, then merges each segment's seam rows.
+    Neighbours with a different circumferential resolution (another radius, or
+    a baked and an unbaked segment) are welded at the rows they share, and the
+    finer column is resampled onto the coarser one's edges so no crack opens.
+    With join=True the segments are concatenated into one mesh and the shared
+    boundary vertices are merged, leaving no duplicate vertices at all.
+
+    Anything left unwelded is recorded in self.failures for the caller to report.
+    """
+
+    def __init__(self, gap_tolerance=SEGMENT_GAP_TOLERANCE):
+        self.gap_tolerance = gap_tolerance
+        self.uv_engine = get_uv_layout_engine()
+        self.failures = []  # Messages from the last weld_ark()
+
+    def fail(self, message):
+        print(f"❌ {message}")
+        self.failures.append(message)
+        return False
+
+    @staticmethod
+    def grid_size(obj):
+        segments_x = obj.get("grid_segments_x")
+        segments_y = obj.get("grid_segments_y")
+        if not segments_x or not segments_y:
+            return None
+        return int(segments_x), int(segments_y)
+
+    def ordered_segments(self, objects):
+        """Grid-ordered rewrapped objects, sorted along their cylinder axis"""
+        segments = []
+        for obj in objects:
+            if self.grid_size(obj) is None:
+                self.fail(f"{obj.name} has no grid topology - seams not welded")
+                continue
+            if obj.get("seam_welded"):
+                print(f"⚠️ {obj.name} is already welded - rewrap it again to re-weld")
+                continue
+            segments.append(obj)
+
+        axis = ['X', 'Y', 'Z'].index(segments[0].get("alignment_axis", 'X')) if segments else 0
+        return sorted(segments, key=lambda obj: obj.location[axis])
+
+    def weld_segment_boundaries(self, left, right):
+        """Average left's x_max column with right's x_min column (world space)
+
+        At equal resolution every vertex pair is averaged. Otherwise only the
+        rows both columns share are averaged and the finer column is moved onto
+        the coarser column's edges.
+        """
+        left_x, left_y = self.grid_size(left)
+        right_x, right_y = self.grid_size(right)
+
+        left_column = mesh_arrays.grid_boundary_indices(left_x, left_y)['x_max']
+        right_column = mesh_arrays.grid_boundary_indices(right_x, right_y)['x_min']
+
+        left_coords = mesh_arrays.read_coords(left.data).astype(np.float64)
+        right_coords = mesh_arrays.read_coords(right.data).astype(np.float64)
+        left_matrix = mesh_arrays.matrix_to_array(left.matrix_world)
+        right_matrix = mesh_arrays.matrix_to_array(right.matrix_world)
+
+        left_world = mesh_arrays.transform_coords(left_coords[left_column], left_matrix)
+        right_world = mesh_arrays.transform_coords(right_coords[right_column], right_matrix)
+        # Compare the finer column with the coarser one sampled at its rows
+        coarse, fine = (left_world, right_world) if left_y <= right_y else (right_world, left_world)
+        coarse_rows, fine_rows = len(coarse) - 1, len(fine) - 1
+
+        # Heights may differ across the boundary; the axial positions must not
+        axis = ['X', 'Y', 'Z'].index(left.get("alignment_axis", 'X'))
+        gap = float(np.abs(fine[:, axis] - resample_column(coarse, fine_rows)[:, axis]).max())
+        if gap > self.gap_tolerance:
+            return self.fail(f"{left.name} / {right.name} do not touch (gap {gap:.4f}) - not welded")
+
+        # The seam row (last) shares its angle with row 0 - weld it like the others
+        coarse_shared, fine_shared = coincident_rows(coarse_rows, fine_rows)
+        coarse_shared = np.append(coarse_shared, coarse_rows)
+        fine_shared = np.append(fine_shared, fine_rows)
+        coarse = coarse.copy()
+        coarse[coarse_shared] = (coarse[coarse_shared] + fine[fine_shared]) * 0.5
+        # Settle the seam now so weld_seam() leaves the resampled rows on the coarse edges
+        coarse[0] = coarse[-1] = (coarse[0] + coarse[-1]) * 0.5
+        fine = resample_column(coarse, fine_rows)
+        left_world, right_world = (coarse, fine) if left_y <= right_y else (fine, coarse)
+
+        left_coords[left_column] = mesh_arrays.transform_coords(left_world, np.linalg.inv(left_matrix))
+        right_coords[right_column] = mesh_arrays.transform_coords(right_world, np.linalg.inv(right_matrix))
+        mesh_arrays.write_coords(left.data, left_coords)
+        mesh_arrays.write_coords(right.data, right_coords)
+        return True
+
+    def weld_seam(self, obj):
+        """Merge the theta = 0/2pi rows of one rewrapped object (rebuilds its mesh)"""
+        segments_x, segments_y = self.grid_size(obj)
+        mesh = obj.data
+        faces = mesh_arrays.read_faces(mesh)
+        if faces is None:
+            return self.fail(f"{obj.name} has mixed face sizes - seam not welded")
+
+        coords, faces = weld_seam_arrays(mesh_arrays.read_coords(mesh), faces, segments_x, segments_y)
+        self.replace_mesh(obj, mesh_arrays.build_mesh(mesh.name, coords, faces, self.uv_engine.read_uvs(mesh)))
+        obj["seam_welded"] = True
+        return True
+
+    def replace_mesh(self, obj, mesh):
+        """Swap in a rebuilt mesh, keeping the old datablock name when it is freed"""
+        old_mesh = obj.data
+        name = old_mesh.name
+        obj.data = mesh
+        if old_mesh.users == 0:
+            bpy.data.meshes.remove(old_mesh)
+            mesh.name = name
+
+    def join_segments(self, segments, name, collection, welded_pairs=()):
+        """One welded mesh for the whole ark - shared boundary vertices merged by index
+
+        Only neighbours listed in welded_pairs ((left name, right name) from
+        weld_ark) share vertices; at any other pair the columns stay apart, so
+        an unwelded gap is kept as an open boundary instead of being stitched.
+        """
+        all_coords, all_faces, all_uvs = [], [], []
+        offset = 0
+        previous, previous_column = None, None
+        origin = mesh_arrays.matrix_to_array(segments[0].matrix_world)[:3, 3]
+
+        for obj in segments:
+            if previous is None or (previous.name, obj.name) not in welded_pairs:
+                previous_column = None
+            segments_x, segments_y = self.grid_size(obj)
+            mesh = obj.data
+            coords = mesh_arrays.transform_coords(
+                mesh_arrays.read_coords(mesh), mesh_arrays.matrix_to_array(obj.matrix_world)) - origin
+            faces = mesh_arrays.read_faces(mesh).astype(np.int64)
+            uvs = self.uv_engine.read_uvs(mesh)
+            columns = welded_boundary_indices(segments_x, segments_y)
+
+            remap = np.arange(len(coords), dtype=np.int64) + offset
+            kept = np.ones(len(coords), dtype=bool)
+            if previous_column is not None:
+                # Reuse the previous segment's x_max vertices where this x_min column has a row at the same angle
+                shared, previous_shared = coincident_rows(len(columns['x_min']), len(previous_column))
+                kept[columns['x_min'][shared]] = False
+                remap[kept] = np.arange(kept.sum()) + offset
+                remap[columns['x_min'][shared]] = previous_column[previous_shared]
+
+            all_coords.append(coords[kept])
+            all_faces.append(remap[faces])
+            all_uvs.append(uvs if uvs is not None else np.zeros((faces.size, 2), dtype=np.float32))
+            previous, previous_column = obj, remap[columns['x_max']]
+            offset += int(kept.sum())
+
+        mesh = mesh_arrays.build_mesh(name, np.concatenate(all_coords), np.concatenate(all_faces),
+                                      np.concatenate(all_uvs))
+        obj = bpy.data.objects.get(name)
+        if obj is None:
+            obj = bpy.data.objects.new(name, mesh)
+            collection.objects.link(obj)
+        else:
+            self.replace_mesh(obj, mesh)
+        obj.location = tuple(origin.tolist())
+        obj["oneill_rewrapped_ark"] = True
+        return obj
+
+    def weld_ark(self, objects, join=False, collection=None, name="oneill_ark_terrain"):
+        """Weld segment boundaries and cylinder seams - returns the joined object if join"""
+        self.failures = []
+        segments = self.ordered_segments(objects)
+        if not segments:
+            return None
+
+        welded_pairs = {(left.name, right.name) for left, right in zip(segments, segments[1:])
+                        if self.weld_segment_boundaries(left, right)}
+        welded_seams = sum(self.weld_seam(obj) for obj in segments)
+        print(f"✅ Welded {welded_seams} cylinder seams and {len(welded_pairs)} segment boundaries")
+        if self.failures:
+            print(f"❌ {len(self.failures)} welds failed - the ark has open cracks")
+
+        if join:
+            segments = [obj for obj in segments if obj.get("seam_welded")]
+            # A segment dropped for a failed seam breaks the run: its neighbours were never welded to each other
+            joined = self.join_segments(segments, name, collection or bpy.context.scene.collection, welded_pairs)
+            for obj in segments:
+                obj.hide_viewport = True
+            print(f"✅ Joined {len(segments)} segments into {joined.name} ({len(joined.data.vertices)} vertices)")
+            return joined
+        return None
+
+
+# Global seam welder instance for integration
+_seam_welder = None
+
+def get_seam_welder():
+    """Get global seam welder instance"""
+    global _seam_welder
+    if _seam_welder is None:
+        _seam_welder = SeamWelder()
+    return _seam_welder
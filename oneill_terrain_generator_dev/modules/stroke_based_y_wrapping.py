@@ -7,6 +7,38 @@ Minimal dependencies - only uses core Blender functionality
 
 import bpy
 import time
+import numpy as np
+
+# Shared NumPy canvas buffer - one array for every subsystem touching the canvas
+try:
+    from .canvas_buffer import CANVAS_NAME, get_canvas_buffer, PAINT_THRESHOLD
+    from .canvas_change_tracker import get_change_tracker
+    from .terrain_pipeline import get_pipeline
+    from .tiled_canvas import get_tiled_canvas
+except ImportError:
+    from canvas_buffer import CANVAS_NAME, get_canvas_buffer, PAINT_THRESHOLD
+    from canvas_change_tracker import get_change_tracker
+    from terrain_pipeline import get_pipeline
+    from tiled_canvas import get_tiled_canvas
+
+PIPELINE_STAGE = "stroke_wrapper"
+
+def painting_canvases():
+    """Every image being painted - the tile images of a tiled canvas, else the single canvas
+    
+    Each tile spans the full circumference, so Y-wrapping works per tile unchanged.
+    """
+    tiled = get_tiled_canvas()
+    if tiled:
+        return tiled.tile_images()
+    canvas = bpy.data.images.get(CANVAS_NAME)
+    return [canvas] if canvas else []
+
+def settle_canvas(canvas):
+    """After a pass over every tile, free the buffers of tiles nobody is painting"""
+    tiled = get_tiled_canvas()
+    if tiled:
+        tiled.settle(canvas)
 
 class StrokeBasedYWrapping:
     """Unified stroke wrapping + preview monitor - eliminates race conditions"""
@@ -15,9 +47,7 @@ class StrokeBasedYWrapping:
         self.canvas = None
         self.canvas_width = 0
         self.canvas_height = 0
-        self.last_pixel_check = {}
         self.stroke_detection_active = False
-        self.timer = None
         self.wrap_history = []  # Track wrapped regions to avoid double-wrapping
         
         # UNIFIED MONITORING - Eliminates race conditions
@@ -27,7 +57,6 @@ class StrokeBasedYWrapping:
         # Natural stroke wrapping settings
         self.boundary_threshold = 5  # pixels from edge for wrap detection
         self.natural_wrapping_active = False
-        self.last_canvas_hash = None
         
     def setup_y_wrapping_for_canvas(self, canvas):
         """Set up stroke-based Y-wrapping for a canvas"""
@@ -35,12 +64,10 @@ class StrokeBasedYWrapping:
             print("❌ No canvas provided for Y-wrapping setup")
             return False
             
-        self.canvas = canvas
-        self.canvas_width = canvas.size[0]
-        self.canvas_height = canvas.size[1]
+        self._use_canvas(canvas)
         
-        # Store initial pixel state for change detection
-        self.last_pixel_check = self._get_canvas_checksum()
+        # Store initial tile state for change detection
+        self._sync_tile_tracker()
         
         print(f"✅ Y-wrapping setup for canvas: {self.canvas_width}x{self.canvas_height}")
         return True
@@ -54,12 +81,8 @@ class StrokeBasedYWrapping:
             print("❌ No canvas available for stroke monitoring")
             return False
         
-        # Use a much lighter monitoring approach - just detect changes
-        self.timer = bpy.app.timers.register(
-            self._check_for_stroke_changes,
-            first_interval=0.2,  # Check every 0.2 seconds
-            persistent=True
-        )
+        # Event-driven: runs as a stage of the shared canvas pipeline
+        self._attach_to_pipeline()
         
         self.stroke_detection_active = True
         print("✅ Stroke-based Y-wrapping monitoring started")
@@ -67,134 +90,91 @@ class StrokeBasedYWrapping:
     
     def stop_stroke_monitoring(self):
         """Stop stroke monitoring"""
-        if self.timer:
-            try:
-                bpy.app.timers.unregister(self.timer)
-            except:
-                pass
-            self.timer = None
+        get_pipeline().remove_stage(PIPELINE_STAGE)
         
         self.stroke_detection_active = False
         print("⏹️ Stroke monitoring stopped")
     
-    def _get_canvas_checksum(self):
-        """Get a lightweight checksum of canvas state"""
+    def _use_canvas(self, canvas):
+        """Point the wrapper at the canvas (or canvas tile) being processed"""
+        self.canvas = canvas
+        self.canvas_width = canvas.size[0]
+        self.canvas_height = canvas.size[1]
+    
+    def _sync_tile_tracker(self):
+        """Absorb the current canvas into the dirty-tile tracker and return its generation"""
         if not self.canvas:
-            return {}
+            return 0
             
         try:
-            pixels = self.canvas.pixels[:]
-            # Sample every 10th pixel for performance
-            sample_step = 10
-            checksum = {}
-            
-            for i in range(0, len(pixels), sample_step * 4):
-                if i + 3 < len(pixels):
-                    pixel_pos = i // 4
-                    r, g, b, a = pixels[i:i+4]
-                    if r > 0.01 or g > 0.01 or b > 0.01:  # Non-black pixel
-                        checksum[pixel_pos] = (r, g, b, a)
-            
-            return checksum
+            tracker = get_change_tracker(self.canvas)
+            tracker.update(get_canvas_buffer(self.canvas).read())
+            return tracker.generation
             
         except Exception as e:
-            print(f"⚠️ Checksum calculation error: {e}")
-            return {}
+            print(f"⚠️ Tile tracker sync error: {e}")
+            return 0
     
-    def _check_for_stroke_changes(self):
-        """Lightweight check for canvas changes and apply Y-wrapping"""
-        try:
-            if not self.canvas:
-                return None  # Stop monitoring
-            
-            # SESSION 59: Enhanced natural stroke wrapping detection
-            if self.natural_wrapping_active:
-                return self._natural_stroke_boundary_detection()
-            
-            # Original method for compatibility
-            # Get current canvas state
-            current_checksum = self._get_canvas_checksum()
-            
-            # Find new painted pixels
-            new_pixels = {}
-            for pos, pixel in current_checksum.items():
-                if pos not in self.last_pixel_check:
-                    new_pixels[pos] = pixel
-            
-            # If we found new paint strokes, check for Y-wrapping
-            if new_pixels:
-                self._apply_natural_y_wrapping(new_pixels)
-                self.last_pixel_check = current_checksum
-            
-            # Continue monitoring
-            return 0.2
-            
-        except Exception as e:
-            print(f"❌ Stroke monitoring error: {e}")
-            return None  # Stop on error
+    def _attach_to_pipeline(self):
+        """Bind the shared pipeline to the painted canvas (or every tile) and run as its wrapping stage"""
+        pipeline = get_pipeline()
+        if not pipeline.is_bound(self.canvas):
+            canvases = painting_canvases()
+            if self.canvas.name in [canvas.name for canvas in canvases]:
+                pipeline.bind_tiles(canvases)
+            else:
+                pipeline.bind(self.canvas)
+        pipeline.add_stage(PIPELINE_STAGE, self._on_canvas_changed)
+    
+    def _on_canvas_changed(self, canvas, changed_tiles):
+        """Pipeline stage - apply Y-wrapping to the tiles touched since the last event
+        
+        Returns True if the canvas was written (the pipeline then absorbs the writes).
+        """
+        if not self.canvas:
+            return False
+        
+        # Events arrive per canvas tile on a tiled canvas
+        if canvas.name != self.canvas.name:
+            self._use_canvas(canvas)
+        
+        # SESSION 59: Enhanced natural stroke wrapping detection
+        if self.natural_wrapping_active:
+            return self._natural_stroke_boundary_detection(changed_tiles) > 0
+        
+        # Original method for compatibility
+        # Only tiles touched since the last poll are scanned for new paint
+        new_pixels = get_change_tracker(self.canvas).pixel_mask(changed_tiles)
+        return self._apply_natural_y_wrapping(new_pixels) > 0
     
     def _apply_natural_y_wrapping(self, new_pixels):
-        """Apply natural Y-axis wrapping for new paint strokes"""
-        if not new_pixels:
-            return
+        """Apply natural Y-axis wrapping for new paint strokes
+        
+        new_pixels is an (H, W) mask of the pixels touched since the last poll.
+        Bottom wrap-zone content is copied to the top rows and top rows to the
+        bottom zone, in whole row bands via the vectorised Y-wrap engine.
+        """
+        if new_pixels is None or not new_pixels.any():
+            return 0
             
         try:
-            # Get canvas dimensions
-            width = self.canvas_width
-            height = self.canvas_height
+            # The monitor just refreshed the shared buffer for this event
+            buffer = get_canvas_buffer(self.canvas)
+            pixels = buffer.pixels
             
-            # Calculate Y-wrapping parameters
-            # Use same 5% overlap as UV mapping
-            overlap_ratio = 0.05
-            main_height = int(height / (1.0 + overlap_ratio))  # ~597 pixels
-            wrap_zone_height = height - main_height  # ~31 pixels
-            
-            pixels = list(self.canvas.pixels[:])
-            wrapped_pixels = []
-            
-            for pixel_pos, (r, g, b, a) in new_pixels.items():
-                x = pixel_pos % width
-                y = pixel_pos // width
-                
-                # Check if this pixel needs Y-wrapping
-                wrap_target = None
-                
-                # Case 1: Bottom edge content wraps to top
-                if y >= main_height:
-                    # Pixel is in bottom wrap zone, copy to top
-                    offset_from_bottom = y - main_height
-                    target_y = offset_from_bottom
-                    wrap_target = (x, target_y)
-                
-                # Case 2: Top edge content wraps to bottom
-                elif y < wrap_zone_height:
-                    # Pixel is in top wrap zone, copy to bottom
-                    target_y = main_height + y
-                    wrap_target = (x, target_y)
-                
-                # Apply wrapping if target found
-                if wrap_target:
-                    target_x, target_y = wrap_target
-                    
-                    # Bounds check
-                    if 0 <= target_x < width and 0 <= target_y < height:
-                        target_index = (target_y * width + target_x) * 4
-                        
-                        if target_index + 3 < len(pixels):
-                            # Only wrap if target area is not already painted
-                            target_pixel = pixels[target_index:target_index+4]
-                            if target_pixel[0] < 0.01 and target_pixel[1] < 0.01 and target_pixel[2] < 0.01:
-                                pixels[target_index:target_index+4] = [r, g, b, a]
-                                wrapped_pixels.append((target_x, target_y))
+            # Use same 5% overlap as UV mapping (~597 main rows, ~31 wrap rows)
+            wrapped_count = get_pipeline().wrap_engine.wrap_zones(pixels, source_mask=new_pixels)
             
             # Apply wrapped pixels to canvas if any were created
-            if wrapped_pixels:
-                self.canvas.pixels = pixels
-                self.canvas.update()
-                print(f"✅ Applied Y-wrapping to {len(wrapped_pixels)} pixels")
+            if wrapped_count:
+                buffer.mark_dirty()
+                buffer.commit()
+                print(f"✅ Applied Y-wrapping to {wrapped_count} pixels")
+            return wrapped_count
                 
         except Exception as e:
             print(f"❌ Y-wrapping application error: {e}")
+            return 0
     
     def apply_manual_y_wrap(self):
         """Manually apply Y-wrapping to current canvas content"""
@@ -203,60 +183,16 @@ class StrokeBasedYWrapping:
             return False
             
         try:
-            width = self.canvas_width
-            height = self.canvas_height
-            pixels = list(self.canvas.pixels[:])
-            
-            # Calculate wrap zone
-            overlap_ratio = 0.05
-            main_height = int(height / (1.0 + overlap_ratio))
-            wrap_zone_height = height - main_height
-            
-            wrapped_count = 0
+            buffer = get_canvas_buffer(self.canvas)
+            pixels = buffer.read()
             
-            # Copy bottom content to top
-            for y in range(wrap_zone_height):
-                source_y = main_height + y  # Bottom zone
-                target_y = y  # Top zone
-                
-                for x in range(width):
-                    source_index = (source_y * width + x) * 4
-                    target_index = (target_y * width + x) * 4
-                    
-                    if (source_index + 3 < len(pixels) and target_index + 3 < len(pixels)):
-                        source_pixel = pixels[source_index:source_index+4]
-                        
-                        # Only copy if source has painted content
-                        if source_pixel[0] > 0.01 or source_pixel[1] > 0.01 or source_pixel[2] > 0.01:
-                            # And target is empty
-                            target_pixel = pixels[target_index:target_index+4]
-                            if target_pixel[0] < 0.01 and target_pixel[1] < 0.01 and target_pixel[2] < 0.01:
-                                pixels[target_index:target_index+4] = source_pixel
-                                wrapped_count += 1
-            
-            # Copy top content to bottom
-            for y in range(wrap_zone_height):
-                source_y = y  # Top zone
-                target_y = main_height + y  # Bottom zone
-                
-                for x in range(width):
-                    source_index = (source_y * width + x) * 4
-                    target_index = (target_y * width + x) * 4
-                    
-                    if (source_index + 3 < len(pixels) and target_index + 3 < len(pixels)):
-                        source_pixel = pixels[source_index:source_index+4]
-                        
-                        # Only copy if source has painted content
-                        if source_pixel[0] > 0.01 or source_pixel[1] > 0.01 or source_pixel[2] > 0.01:
-                            # And target is empty
-                            target_pixel = pixels[target_index:target_index+4]
-                            if target_pixel[0] < 0.01 and target_pixel[1] < 0.01 and target_pixel[2] < 0.01:
-                                pixels[target_index:target_index+4] = source_pixel
-                                wrapped_count += 1
+            # Copy bottom zone content to top, then top content to bottom zone
+            # Only painted sources are copied, and only into empty targets
+            wrapped_count = get_pipeline().wrap_engine.wrap_zones(pixels)
             
             if wrapped_count > 0:
-                self.canvas.pixels = pixels
-                self.canvas.update()
+                buffer.mark_dirty()
+                buffer.commit()
                 print(f"✅ Manual Y-wrapping applied: {wrapped_count} pixels wrapped")
                 return True
             else:
@@ -278,23 +214,18 @@ class StrokeBasedYWrapping:
         self.processing_lock = False
         
         # SESSION 61: Clean boundary regions for 100% canvas utilization
-        self._eliminate_boundary_regions()
+        primary = self.canvas
+        for canvas in painting_canvases() or [primary]:
+            self._use_canvas(canvas)
+            self._eliminate_boundary_regions()
+            if canvas is not primary:
+                settle_canvas(canvas)
+        self._use_canvas(primary)
             
         self.natural_wrapping_active = True
-        self.last_canvas_hash = self._get_quick_canvas_hash()
         
-        # Use lighter monitoring frequency for real-time response
-        if self.timer:
-            try:
-                bpy.app.timers.unregister(self.timer)
-            except:
-                pass
-            
-        self.timer = bpy.app.timers.register(
-            self._check_for_stroke_changes,
-            first_interval=0.1,  # 10 FPS for responsive wrapping
-            persistent=True
-        )
+        # One event-driven pipeline stage instead of a persistent 10 FPS timer
+        self._attach_to_pipeline()
         
         self.stroke_detection_active = True
         print("🎨 UNIFIED NATURAL STROKE WRAPPING ACTIVE")
@@ -304,64 +235,39 @@ class StrokeBasedYWrapping:
         print(f"   🔗 Unified monitoring: Stroke wrapping → Preview updates")
         return True
     
-    def _get_quick_canvas_hash(self):
-        """Quick hash for change detection optimized for boundary regions"""
-        try:
-            pixels = self.canvas.pixels[:]
-            sample_data = []
-            
-            width = self.canvas_width
-            height = self.canvas_height
-            
-            # Sample top boundary region only
-            for y in range(min(self.boundary_threshold, height)):
-                for x in range(0, width, 20):  # Every 20th pixel for efficiency
-                    idx = (y * width + x) * 4
-                    if idx + 2 < len(pixels):
-                        sample_data.append(int(pixels[idx] * 255))  # R channel
-            
-            # Sample bottom boundary region only  
-            for y in range(max(0, height - self.boundary_threshold), height):
-                for x in range(0, width, 20):
-                    idx = (y * width + x) * 4
-                    if idx + 2 < len(pixels):
-                        sample_data.append(int(pixels[idx] * 255))  # R channel
-            
-            return hash(tuple(sample_data))
-            
-        except Exception as e:
-            print(f"⚠️ Hash calculation error: {e}")
-            return 0
-    
-    def _natural_stroke_boundary_detection(self):
-        """SESSION 61: Unified monitoring with race condition elimination"""
+    def _natural_stroke_boundary_detection(self, changed_tiles):
+        """SESSION 61: Boundary stroke wrapping for one change event - returns pixels wrapped
+        
+        Preview updates are chained after this stage by the pipeline.
+        """
         try:
             # RACE CONDITION PREVENTION: Processing lock
             if self.processing_lock:
-                return 0.1  # Skip cycle if already processing
-            
-            # Quick change detection
-            current_hash = self._get_quick_canvas_hash()
-            if current_hash == self.last_canvas_hash:
-                return 0.1  # No changes, continue monitoring
+                return 0  # Skip cycle if already processing
             
             # Set processing lock to prevent race conditions
             self.processing_lock = True
             
             try:
                 # PHASE 1: Stroke wrapping (Priority processing)
-                wrapped_strokes = self._detect_and_wrap_boundary_strokes()
+                # Only tile rows overlapping [0, threshold) or [h - threshold, h) can cross a Y-boundary
+                tracker = get_change_tracker(self.canvas)
+                threshold = min(self.boundary_threshold, self.canvas_height)
+                low_rows_end = (threshold - 1) // tracker.tile_size
+                high_rows_start = (self.canvas_height - threshold) // tracker.tile_size
+                touches_boundary = ((changed_tiles[:, 0] <= low_rows_end) |
+                                    (changed_tiles[:, 0] >= high_rows_start)).any()
+                wrapped_strokes = 0
+                if touches_boundary:
+                    changed_mask = tracker.pixel_mask(changed_tiles)
+                    wrapped_strokes = self._detect_and_wrap_boundary_strokes(changed_mask)
                 
                 if wrapped_strokes > 0:
                     print(f"✨ Natural stroke wrapping: {wrapped_strokes} boundary crossings wrapped!")
                     # Force canvas update for immediate visual feedback
                     self.canvas.update()
                 
-                # PHASE 2: Live preview updates (Secondary processing) 
-                if self.unified_monitoring:
-                    self._trigger_preview_update()
-                
-                # PHASE 3: UI refresh
+                # PHASE 2: UI refresh
                 try:
                     for area in bpy.context.screen.areas:
                         if area.type in {'VIEW_3D', 'IMAGE_EDITOR'}:
@@ -369,77 +275,37 @@ class StrokeBasedYWrapping:
                 except:
                     pass  # Don't fail on UI refresh errors
                 
+                return wrapped_strokes
+                
             finally:
                 # Always release processing lock
                 self.processing_lock = False
             
-            self.last_canvas_hash = current_hash
-            return 0.1  # Continue monitoring at 10 FPS
-            
         except Exception as e:
             self.processing_lock = False  # Release lock on error
             print(f"❌ Unified monitoring error: {e}")
-            return 0.2  # Continue with slower monitoring on error
+            return 0
     
-    def _detect_and_wrap_boundary_strokes(self):
-        """Revolutionary algorithm: Detect strokes near Y-boundaries and apply natural wrapping"""
+    def _detect_and_wrap_boundary_strokes(self, source_mask=None):
+        """Revolutionary algorithm: Detect strokes near Y-boundaries and apply natural wrapping
+        
+        Stroke at Y=0 wraps to Y=height-1, Y=1 to Y=height-2, etc. (and back).
+        Runs over the full boundary bands at full resolution; source_mask optionally
+        limits the scan to recently changed pixels.
+        """
         try:
-            pixels = list(self.canvas.pixels[:])
-            width = self.canvas_width
-            height = self.canvas_height
-            wrapped_count = 0
-            
-            # REVOLUTIONARY NATURAL WRAPPING ALGORITHM
-            
-            # Phase 1: Scan top boundary for strokes that should wrap to bottom
-            for y in range(min(self.boundary_threshold, height)):
-                for x in range(0, width, 2):  # Every other pixel for efficiency
-                    idx = (y * width + x) * 4
-                    if idx + 3 < len(pixels):
-                        r, g, b, a = pixels[idx:idx+4]
-                        
-                        # Found painted pixel near top boundary
-                        if r > 0.01 or g > 0.01 or b > 0.01:
-                            # Calculate natural wrap position at bottom
-                            # Stroke at Y=0 wraps to Y=height-1, Y=1 to Y=height-2, etc.
-                            wrap_y = height - 1 - y
-                            wrap_idx = (wrap_y * width + x) * 4
-                            
-                            # Apply wrap if target is unpainted and within bounds
-                            if (wrap_idx + 3 < len(pixels) and wrap_y < height):
-                                target_r, target_g, target_b = pixels[wrap_idx:wrap_idx+3]
-                                
-                                # Only wrap to unpainted areas (non-interfering)
-                                if target_r < 0.01 and target_g < 0.01 and target_b < 0.01:
-                                    pixels[wrap_idx:wrap_idx+4] = [r, g, b, a]
-                                    wrapped_count += 1
+            buffer = get_canvas_buffer(self.canvas)
+            pixels = buffer.pixels
             
-            # Phase 2: Scan bottom boundary for strokes that should wrap to top
-            for y in range(max(0, height - self.boundary_threshold), height):
-                for x in range(0, width, 2):
-                    idx = (y * width + x) * 4
-                    if idx + 3 < len(pixels):
-                        r, g, b, a = pixels[idx:idx+4]
-                        
-                        # Found painted pixel near bottom boundary
-                        if r > 0.01 or g > 0.01 or b > 0.01:
-                            # Calculate natural wrap position at top
-                            # Stroke at Y=height-1 wraps to Y=0, Y=height-2 to Y=1, etc.
-                            wrap_y = (height - 1) - y
-                            wrap_idx = (wrap_y * width + x) * 4
-                            
-                            # Apply wrap if target is unpainted and within bounds
-                            if (wrap_idx + 3 < len(pixels) and wrap_y >= 0):
-                                target_r, target_g, target_b = pixels[wrap_idx:wrap_idx+3]
-                                
-                                # Only wrap to unpainted areas (non-interfering)
-                                if target_r < 0.01 and target_g < 0.01 and target_b < 0.01:
-                                    pixels[wrap_idx:wrap_idx+4] = [r, g, b, a]
-                                    wrapped_count += 1
+            # Only wrap to unpainted areas (non-interfering)
+            wrapped_count = get_pipeline().wrap_engine.mirror_boundaries(
+                pixels, self.boundary_threshold, source_mask=source_mask
+            )
             
             # Apply all wrapped pixels at once for efficiency
             if wrapped_count > 0:
-                self.canvas.pixels = pixels
+                buffer.mark_dirty()
+                buffer.commit()
             
             return wrapped_count
             
@@ -447,51 +313,23 @@ class StrokeBasedYWrapping:
             print(f"❌ Boundary stroke detection error: {e}")
             return 0
     
-    def _trigger_preview_update(self):
-        """SESSION 61: Trigger WorkingAutoPreviewSystem update without conflicts"""
-        try:
-            # Import and use WorkingAutoPreviewSystem for preview updates
-            from oneill_terrain_generator_dev.main_terrain_system import WorkingAutoPreviewSystem
-            
-            preview_system = WorkingAutoPreviewSystem()
-            
-            # Only trigger if auto preview is active
-            if hasattr(preview_system, 'auto_preview_active') and preview_system.auto_preview_active:
-                # Use existing monitor_canvas_changes method
-                preview_system.monitor_canvas_changes()
-                
-        except ImportError:
-            # WorkingAutoPreviewSystem not available - skip preview updates
-            pass
-        except Exception as e:
-            # Don't let preview errors break stroke wrapping
-            print(f"⚠️ Preview update error (non-critical): {e}")
-    
     def _eliminate_boundary_regions(self):
         """SESSION 61: Eliminate 5% boundary regions for 100% canvas utilization"""
         try:
             # Clear any gray boundary regions that prevent 100% canvas use
-            pixels = list(self.canvas.pixels[:])
-            width = self.canvas_width
-            height = self.canvas_height
+            buffer = get_canvas_buffer(self.canvas)
+            pixels = buffer.read()
             
             # Convert all gray boundary pixels to pure black (unpainted)
-            boundary_cleared = 0
-            
-            for y in range(height):
-                for x in range(width):
-                    idx = (y * width + x) * 4
-                    if idx + 3 < len(pixels):
-                        r, g, b, a = pixels[idx:idx+4]
-                        
-                        # Clear gray boundary artifacts (typical value 0.18-0.25)
-                        if 0.15 < r < 0.3 and 0.15 < g < 0.3 and 0.15 < b < 0.3:
-                            pixels[idx:idx+4] = [0.0, 0.0, 0.0, 1.0]  # Pure black
-                            boundary_cleared += 1
+            # Clear gray boundary artifacts (typical value 0.18-0.25)
+            rgb = pixels[..., :3]
+            gray = ((rgb > 0.15) & (rgb < 0.3)).all(axis=-1)
+            boundary_cleared = int(np.count_nonzero(gray))
             
             if boundary_cleared > 0:
-                self.canvas.pixels = pixels
-                self.canvas.update()
+                pixels[gray] = (0.0, 0.0, 0.0, 1.0)  # Pure black
+                buffer.mark_dirty()
+                buffer.commit()
                 print(f"✨ Boundary regions eliminated: {boundary_cleared} pixels cleared for 100% canvas use")
             
         except Exception as e:
@@ -523,16 +361,21 @@ def stop_y_wrapping_monitoring():
     wrapper.stop_stroke_monitoring()
 
 def apply_manual_y_wrap():
-    """Apply manual Y-wrapping to current canvas"""
+    """Apply manual Y-wrapping to every painted canvas (or canvas tile) - True if any wrapped"""
     wrapper = get_stroke_wrapper()
-    return wrapper.apply_manual_y_wrap()
+    wrapped = False
+    for canvas in painting_canvases():
+        wrapper.setup_y_wrapping_for_canvas(canvas)
+        wrapped = wrapper.apply_manual_y_wrap() or wrapped
+        settle_canvas(canvas)
+    return wrapped
 
 def start_natural_stroke_wrapping():
     """SESSION 59: Start revolutionary natural stroke wrapping"""
     wrapper = get_stroke_wrapper()
-    canvas = bpy.data.images.get("oneill_terrain_canvas")
-    if canvas and not wrapper.canvas:
-        wrapper.setup_y_wrapping_for_canvas(canvas)
+    canvases = painting_canvases()
+    if canvases and (not wrapper.canvas or wrapper.canvas.name not in [canvas.name for canvas in canvases]):
+        wrapper.setup_y_wrapping_for_canvas(canvases[0])
     return wrapper.start_natural_stroke_wrapping()
 
 def stop_natural_stroke_wrapping():
@@ -549,16 +392,11 @@ class ONEILL_OT_ApplyYWrapping(bpy.types.Operator):
     bl_options = {'REGISTER', 'UNDO'}
     
     def execute(self, context):
-        canvas = bpy.data.images.get("oneill_terrain_canvas")
-        if not canvas:
+        if not painting_canvases():
             self.report({'ERROR'}, "No canvas found")
             return {'CANCELLED'}
         
-        wrapper = get_stroke_wrapper()
-        if not wrapper.canvas:
-            wrapper.setup_y_wrapping_for_canvas(canvas)
-        
-        success = wrapper.apply_manual_y_wrap()
+        success = apply_manual_y_wrap()
         
         if success:
             self.report({'INFO'}, "Y-axis wrapping applied successfully")
@@ -574,8 +412,7 @@ class ONEILL_OT_StartNaturalStrokeWrapping(bpy.types.Operator):
     bl_options = {'REGISTER', 'UNDO'}
     
     def execute(self, context):
-        canvas = bpy.data.images.get("oneill_terrain_canvas")
-        if not canvas:
+        if not painting_canvases():
             self.report({'ERROR'}, "No canvas found - start terrain painting first")
             return {'CANCELLED'}
         
@@ -0,0 +1,379 @@
+"""
+O'Neill Terrain Generator - Headless Terrain Evaluator
+Pure NumPy mirror of the Unified_Multi_Biome_Terrain.001 node group
+UVMap -> Image Texture -> Separate Z -> Color Ramp x Noise -> Set Position (offset Z)
+
+Importable without Blender: bpy is only touched by the *_object / node-group helpers.
+"""
+
+import numpy as np
+
+# Noise Texture node defaults (Blender 3.x/4.x)
+DEFAULT_NOISE = {
+    'scale': 5.0,
+    'detail': 2.0,
+    'roughness': 0.5,
+    'lacunarity': 2.0,
+    'normalize': True,
+}
+
+# Color Ramp node default: black at 0, white at 1, linear
+DEFAULT_RAMP = {
+    'positions': (0.0, 1.0),
+    'colors': ((0.0, 0.0, 0.0, 1.0), (1.0, 1.0, 1.0, 1.0)),
+    'interpolation': 'LINEAR',
+}
+
+# Scene-linear Rec.709 luminance - implicit color -> float conversion
+LUMINANCE = np.array([0.2126, 0.7152, 0.0722])
+
+PERLIN_SCALE = 0.9820  # Blender's noise_scale3 for 3D Perlin
+MAX_DETAIL = 15.0      # Noise Texture clamps Detail to [0, 15]
+PERIOD_TOLERANCE = 1e-6  # How far from a whole number a lattice period may be
+
+_snapped_periods = set()  # (period, lacunarity) already warned about
+
+
+# ========================= GRADIENT NOISE =========================
+
+def _rot(x, k):
+    return (x << np.uint32(k)) | (x >> np.uint32(32 - k))
+
+def hash_uint3(kx, ky, kz):
+    """Bob Jenkins lookup3 final mix - Blender's hash_uint3 on uint32 arrays"""
+    a = np.full(np.shape(kx), 0xdeadbeef + (3 << 2) + 13, dtype=np.uint32)
+    b = a.copy()
+    c = a.copy()
+    c += kz
+    b += ky
+    a += kx
+
+    c ^= b; c -= _rot(b, 14)
+    a ^= c; a -= _rot(c, 11)
+    b ^= a; b -= _rot(a, 25)
+    c ^= b; c -= _rot(b, 16)
+    a ^= c; a -= _rot(c, 4)
+    b ^= a; b -= _rot(a, 14)
+    c ^= b; c -= _rot(b, 24)
+    return c
+
+def _grad3(hash_value, x, y, z):
+    h = hash_value & np.uint32(15)
+    u = np.where(h < 8, x, y)
+    vt = np.where((h == 12) | (h == 14), x, z)
+    v = np.where(h < 4, y, vt)
+    return np.where(h & np.uint32(1), -u, u) + np.where(h & np.uint32(2), -v, v)
+
+def _fade(t):
+    return t * t * t * (t * (t * 6.0 - 15.0) + 10.0)
+
+def _lattice(cell, period):
+    """Lattice index as uint32, wrapped to the period when the noise must tile"""
+    if period is not None:
+        cell = np.mod(cell, period)
+    return cell.astype(np.int64).astype(np.uint32)
+
+def perlin_noise_3d(points, period=None):
+    """Signed 3D gradient noise in about [-1, 1] for (N, 3) points
+
+    Matches Blender's perlin_noise/snoise_3d. With an integer period (scalar or
+    per axis) the lattice wraps, so the noise tiles every `period` units.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    cells = np.floor(points)
+    fx, fy, fz = (points - cells).T
+    cx, cy, cz = cells.T
+
+    if period is not None:
+        period = np.broadcast_to(np.asarray(period, dtype=np.float64), (3,))
+        px, py, pz = period
+    else:
+        px = py = pz = None
+
+    x0, x1 = _lattice(cx, px), _lattice(cx + 1, px)
+    y0, y1 = _lattice(cy, py), _lattice(cy + 1, py)
+    z0, z1 = _lattice(cz, pz), _lattice(cz + 1, pz)
+
+    u, v, w = _fade(fx), _fade(fy), _fade(fz)
+
+    def corner(xi, yi, zi, dx, dy, dz):
+        return _grad3(hash_uint3(xi, yi, zi), dx, dy, dz)
+
+    # tri_mix: x first, then y, then z
+    front = ((1 - v) * ((1 - u) * corner(x0, y0, z0, fx, fy, fz) + u * corner(x1, y0, z0, fx - 1, fy, fz))
+             + v * ((1 - u) * corner(x0, y1, z0, fx, fy - 1, fz) + u * corner(x1, y1, z0, fx - 1, fy - 1, fz)))
+    back = ((1 - v) * ((1 - u) * corner(x0, y0, z1, fx, fy, fz - 1) + u * corner(x1, y0, z1, fx - 1, fy, fz - 1))
+            + v * ((1 - u) * corner(x0, y1, z1, fx, fy - 1, fz - 1) + u * corner(x1, y1, z1, fx - 1, fy - 1, fz - 1)))
+    return PERLIN_SCALE * ((1 - w) * front + w * back)
+
+def tiling_octaves(period, frequencies, lacunarity):
+    """(frequencies, lattice periods) that make every octave tile with `period`
+
+    Octave k samples the lattice at period * frequency cells, which is only a
+    whole number when the lacunarity is. Those periods are snapped to the
+    nearest whole number (at least 1) and the octave's frequency follows, per
+    axis, so the sum still tiles every `period` units; the snap is a small
+    lacunarity change from Blender, reported once per setting.
+    """
+    period = np.broadcast_to(np.asarray(period, dtype=np.float64), (3,))
+    if np.any(period < 1.0) or np.abs(period - np.round(period)).max() > PERIOD_TOLERANCE:
+        raise ValueError(f"Noise period must be a whole number of lattice cells, got {period.tolist()}")
+    period = np.round(period)
+
+    exact = [period * frequency for frequency in frequencies]
+    snapped = [np.maximum(np.round(octave_period), 1.0) for octave_period in exact]
+    if max(np.abs(a - b).max() for a, b in zip(exact, snapped)) > PERIOD_TOLERANCE:
+        key = (tuple(period.tolist()), float(lacunarity))
+        if key not in _snapped_periods:
+            _snapped_periods.add(key)
+            print(f"⚠️ Lacunarity {lacunarity} gives non-integer octave periods for period "
+                  f"{period.tolist()} - snapped to {[p.tolist() for p in snapped]} to keep the noise tileable")
+    return [octave_period / period for octave_period in snapped], snapped
+
+def fbm_noise(points, detail=2.0, roughness=0.5, lacunarity=2.0, normalize=True, period=None):
+    """Fractal Brownian motion over perlin_noise_3d - Noise Texture 'Fac' output
+
+    With a period (whole lattice cells, scalar or per axis) the result tiles:
+    fbm_noise(x) == fbm_noise(x + period) - see tiling_octaves().
+    """
+    points = np.asarray(points, dtype=np.float64)
+    detail = min(max(float(detail), 0.0), MAX_DETAIL)
+    roughness = max(float(roughness), 0.0)
+    remainder = detail - np.floor(detail)
+    amplitude = 1.0
+    max_amplitude = 0.0
+    total = np.zeros(len(points))
+
+    frequencies, frequency = [], 1.0
+    for _ in range(int(detail) + 1 + (remainder > 0.0)):
+        frequencies.append(frequency)
+        frequency *= lacunarity
+    if period is None:
+        periods = [None] * len(frequencies)
+    else:
+        frequencies, periods = tiling_octaves(period, frequencies, lacunarity)
+
+    for octave in range(int(detail) + 1):
+        total += amplitude * perlin_noise_3d(points * frequencies[octave], periods[octave])
+        max_amplitude += amplitude
+        amplitude *= roughness
+
+    if remainder == 0.0:
+        return 0.5 * total / max_amplitude + 0.5 if normalize else total
+
+    extra = total + amplitude * perlin_noise_3d(points * frequencies[-1], periods[-1])
+    if normalize:
+        low = 0.5 * total / max_amplitude + 0.5
+        high = 0.5 * extra / (max_amplitude + amplitude) + 0.5
+    else:
+        low, high = total, extra
+    return (1.0 - remainder) * low + remainder * high
+
+
+# ========================= NODE STAGES =========================
+
+def srgb_to_linear(values):
+    """sRGB transfer function -> scene linear (what the node sees for byte images)"""
+    values = np.asarray(values, dtype=np.float64)
+    return np.where(values <= 0.04045, values / 12.92, ((values + 0.055) / 1.055) ** 2.4)
+
+def linear_canvas(pixels, dtype=np.float64):
+    """(H, W, 4) sRGB-encoded pixels -> scene-linear copy (alpha untouched)"""
+    pixels = np.asarray(pixels)
+    result = np.empty(pixels.shape, dtype=dtype)
+    result[..., :3] = srgb_to_linear(pixels[..., :3])
+    result[..., 3:] = pixels[..., 3:]
+    return result
+
+def sample_image_linear(pixels, uvs):
+    """Bilinear REPEAT lookup of an (H, W, C) image at (N, 2) UVs - Image Texture node"""
+    height, width = pixels.shape[:2]
+    px = np.asarray(uvs[:, 0], dtype=np.float64) * width - 0.5
+    py = np.asarray(uvs[:, 1], dtype=np.float64) * height - 0.5
+
+    x0 = np.floor(px)
+    y0 = np.floor(py)
+    fx = (px - x0)[:, None]
+    fy = (py - y0)[:, None]
+
+    xi0 = np.mod(x0, width).astype(np.int64)
+    yi0 = np.mod(y0, height).astype(np.int64)
+    xi1 = (xi0 + 1) % width
+    yi1 = (yi0 + 1) % height
+
+    return ((1 - fy) * ((1 - fx) * pixels[yi0, xi0] + fx * pixels[yi0, xi1])
+            + fy * ((1 - fx) * pixels[yi1, xi0] + fx * pixels[yi1, xi1]))
+
+def evaluate_color_ramp(fac, positions, colors, interpolation='LINEAR'):
+    """Color Ramp node: (N,) factors -> (N, 4) colours (clamped to the end stops)"""
+    positions = np.asarray(positions, dtype=np.float64)
+    colors = np.asarray(colors, dtype=np.float64)
+    fac = np.asarray(fac, dtype=np.float64)
+
+    if interpolation == 'CONSTANT':
+        index = np.clip(np.searchsorted(positions, fac, side='right') - 1, 0, len(positions) - 1)
+        return colors[index]
+
+    return np.stack([np.interp(fac, positions, colors[:, channel]) for channel in range(colors.shape[1])], axis=1)
+
+def point_uvs(loop_uvs, loop_vertex_indices, vertex_count):
+    """Face-corner UVs -> per-vertex UVs by averaging corners (Named Attribute on points)"""
+    counts = np.bincount(loop_vertex_indices, minlength=vertex_count).astype(np.float64)
+    counts[counts == 0] = 1.0
+    u = np.bincount(loop_vertex_indices, weights=loop_uvs[:, 0], minlength=vertex_count)
+    v = np.bincount(loop_vertex_indices, weights=loop_uvs[:, 1], minlength=vertex_count)
+    return np.stack((u / counts, v / counts), axis=1)
+
+
+class TerrainEvaluator:
+    """NumPy evaluation of the Session 42 displacement node group
+
+    offset_z = noise_fac(position) * luminance(color_ramp(canvas(uv).b))
+    canvas_pixels is the (H, W, 4) canvas as stored in image.pixels; byte images
+    are sRGB-encoded there, so srgb=True linearises them like the node does.
+    Pass a noise period to make the noise tile (e.g. across the cylinder seam);
+    leave it None for parity with Blender.
+    """
+
+    def __init__(self, canvas_pixels, srgb=True, ramp=None, noise=None, period=None):
+        # Linear canvases are used as given (no copy) - e.g. a shared-memory view
+        self.canvas = linear_canvas(canvas_pixels) if srgb else np.asarray(canvas_pixels)
+        self.ramp = dict(DEFAULT_RAMP, **(ramp or {}))
+        self.noise = dict(DEFAULT_NOISE, **(noise or {}))
+        self.period = period
+
+    def canvas_fac(self, uvs):
+        """Separate XYZ 'Z' of the sampled canvas colour (the blue channel)"""
+        return sample_image_linear(self.canvas, uvs)[:, 2]
+
+    def ramp_value(self, fac):
+        colors = evaluate_color_ramp(fac, self.ramp['positions'], self.ramp['colors'], self.ramp['interpolation'])
+        return colors[:, :3] @ LUMINANCE
+
+    def noise_fac(self, positions):
+        noise = self.noise
+        return fbm_noise(np.asarray(positions, dtype=np.float64) * noise['scale'], noise['detail'],
+                         noise['roughness'], noise['lacunarity'], noise['normalize'], self.period)
+
+    def displacement(self, positions, uvs):
+        """(N,) Z offsets for (N, 3) positions and (N, 2) per-point UVs"""
+        return self.noise_fac(positions) * self.ramp_value(self.canvas_fac(uvs))
+
+    def evaluate(self, positions, uvs):
+        """Displaced (N, 3) positions - Set Position with Offset (0, 0, dz)"""
+        result = np.array(positions, dtype=np.float64)
+        result[:, 2] += self.displacement(positions, uvs)
+        return result
+
+    @classmethod
+    def from_node_group(cls, node_group, canvas_pixels, srgb=True, period=None):
+        """Build an evaluator with the ramp/noise settings of a live node group"""
+        return cls(canvas_pixels, srgb=srgb, ramp=ramp_params(node_group),
+                   noise=noise_params(node_group), period=period)
+
+
+# ========================= BLENDER HELPERS =========================
+
+def ramp_params(node_group):
+    """Color Ramp stops of the node group (defaults if the node is missing)"""
+    node = node_group.nodes.get("Color Ramp")
+    if node is None:
+        return dict(DEFAULT_RAMP)
+    elements = node.color_ramp.elements
+    return {
+        'positions': tuple(element.position for element in elements),
+        'colors': tuple(tuple(element.color) for element in elements),
+        'interpolation': node.color_ramp.interpolation,
+    }
+
+def noise_params(node_group):
+    """Noise Texture inputs of the node group (defaults if the node is missing)"""
+    node = node_group.nodes.get("Noise Texture")
+    params = dict(DEFAULT_NOISE)
+    if node is None:
+        return params
+
+    for key, socket in (('scale', 'Scale'), ('detail', 'Detail'),
+                        ('roughness', 'Roughness'), ('lacunarity', 'Lacunarity')):
+        if socket in node.inputs:
+            params[key] = float(node.inputs[socket].default_value)
+    params['normalize'] = bool(getattr(node, 'normalize', True))
+
+    if 'Distortion' in node.inputs and node.inputs['Distortion'].default_value != 0.0:
+        print("⚠️ Noise distortion is not mirrored by the headless evaluator - ignored")
+    return params
+
+def image_is_srgb(image):
+    """True when image.pixels holds sRGB-encoded values (byte buffer, sRGB colourspace)"""
+    return not image.is_float and image.colorspace_settings.name == 'sRGB'
+
+def read_object_inputs(obj):
+    """(positions (N, 3), per-point UVs (N, 2)) of an object's base mesh"""
+    # Imported lazily so the evaluator itself stays usable outside Blender
+    try:
+        from . import mesh_arrays
+        from .uv_layout import get_uv_layout_engine
+    except ImportError:
+        import mesh_arrays
+        from uv_layout import get_uv_layout_engine
+
+    mesh = obj.data
+    positions = mesh_arrays.read_coords(mesh).astype(np.float64)
+    loop_uvs = get_uv_layout_engine().read_uvs(mesh)
+    if loop_uvs is None:
+        raise ValueError(f"{obj.name} has no UV layer")
+    return positions, point_uvs(loop_uvs, mesh_arrays.read_loop_vertex_indices(mesh), len(positions))
+
+def evaluator_for_node_group(node_group, period=None):
+    """Evaluator reading the canvas connected to the node group's sampler"""
+    try:
+        from .canvas_buffer import snapshot_canvas
+    except ImportError:
+        from canvas_buffer import snapshot_canvas
+
+    sampler = node_group.nodes.get("Unified_Canvas_Sampler")
+    image = sampler.inputs['Image'].default_value if sampler else None
+    if image is None:
+        raise ValueError(f"No canvas connected to {node_group.name}")
+    return TerrainEvaluator.from_node_group(node_group, snapshot_canvas(image), image_is_srgb(image), period)
+
+def verify_against_node_group(obj, tolerance=1e-3):
+    """Parity check: evaluator vs the object's Unified_Terrain modifier on its base mesh
+
+    Modifiers other than Unified_Terrain (e.g. Preview_Subdivision) are hidden
+    for the comparison so both sides see the same points. Returns max |dz| error.
+    """
+    import bpy
+
+    modifier = obj.modifiers.get("Unified_Terrain")
+    if modifier is None or modifier.node_group is None:
+        print(f"❌ {obj.name} has no Unified_Terrain modifier")
+        return None
+
+    hidden = [mod for mod in obj.modifiers if mod != modifier and mod.show_viewport]
+    for mod in hidden:
+        mod.show_viewport = False
+    try:
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+        depsgraph.update()
+        evaluated = obj.evaluated_get(depsgraph).data
+        expected = np.empty(len(evaluated.vertices) * 3, dtype=np.float32)
+        evaluated.vertices.foreach_get('co', expected)
+        expected = expected.reshape(-1, 3)
+    finally:
+        for mod in hidden:
+            mod.show_viewport = True
+
+    positions, uvs = read_object_inputs(obj)
+    if len(expected) != len(positions):
+        print(f"❌ Vertex count mismatch on {obj.name}: {len(expected)} vs {len(positions)}")
+        return None
+
+    result = evaluator_for_node_group(modifier.node_group).evaluate(positions, uvs)
+    error = float(np.abs(result[:, 2] - expected[:, 2]).max()) if len(result) else 0.0
+
+    if error <= tolerance:
+        print(f"✅ Headless evaluator matches node group on {obj.name} (max error {error:.2e})")
+    else:
+        print(f"❌ Headless evaluator differs on {obj.name} (max error {error:.2e})")
+    return error
@@ -0,0 +1,190 @@
+"""
+O'Neill Terrain Generator - Canvas Pipeline Coordinator
+Long-lived owner of the canvas buffer, change tracker, Y-wrap engine and preview updater
+Created once at add-on register(); stages run in order on each canvas change event
+"""
+
+try:
+    from .canvas_buffer import get_canvas_buffer
+    from .canvas_change_tracker import get_change_tracker
+    from .canvas_monitor import get_canvas_monitor
+    from .y_wrap_engine import get_y_wrap_engine
+except ImportError:
+    from canvas_buffer import get_canvas_buffer
+    from canvas_change_tracker import get_change_tracker
+    from canvas_monitor import get_canvas_monitor
+    from y_wrap_engine import get_y_wrap_engine
+
+MONITOR_KEY = "terrain_pipeline"
+
+
+class CanvasPipeline:
+    """Chains canvas stages on change events - nothing is imported or built per tick
+
+    A stage is callback(canvas, changed_tiles) returning True if it wrote to the
+    canvas; those writes are absorbed into the tracker before the next stage so
+    they are never mistaken for new strokes. The preview updater always runs last.
+    The pipeline only subscribes to the canvas monitor while it has work to do.
+
+    On a tiled canvas every tile image gets its own subscription, so stages run
+    per painted tile with that tile's buffer and tracker - clean tiles are never
+    read - and the preview check only covers the painted tile's objects.
+    """
+
+    def __init__(self, preview_system=None):
+        self.preview_system = preview_system
+        self.wrap_engine = get_y_wrap_engine()
+        self.canvas = None
+        self.canvases = {}  # image name -> image for every bound canvas (one, or every tile)
+        self.canvas_objects = {}  # image name -> flat objects previewed on its changes
+        self.tracker = None
+        self.stages = []  # [(name, callback)] in execution order
+        self.processing = False
+
+    def bind(self, canvas):
+        """Attach to a canvas - the tracker is the shared per-image instance, buffers are read per event"""
+        if canvas is None:
+            return False
+        return self.bind_tiles([canvas])
+
+    def bind_tiles(self, canvases, objects_by_canvas=None):
+        """Attach to every tile image of a tiled canvas (the first is the primary canvas)
+
+        objects_by_canvas maps image name -> the flat objects living on that tile;
+        preview checks after a change then only look at those objects.
+        """
+        canvases = [canvas for canvas in canvases if canvas is not None]
+        if not canvases:
+            return False
+
+        names = [canvas.name for canvas in canvases]
+        if list(self.canvases) != names:
+            self._unsubscribe_all()
+
+        self.canvas = canvases[0]
+        self.canvases = dict(zip(names, canvases))
+        self.canvas_objects = dict(objects_by_canvas or {})
+        self.tracker = get_change_tracker(self.canvas)
+        self._sync_subscription()
+        return True
+
+    def is_bound(self, canvas):
+        return canvas is not None and canvas.name in self.canvases
+
+    def add_stage(self, name, callback):
+        """Append a stage (replacing any stage with the same name in place)"""
+        for index, (stage_name, _) in enumerate(self.stages):
+            if stage_name == name:
+                self.stages[index] = (name, callback)
+                break
+        else:
+            self.stages.append((name, callback))
+        self._sync_subscription()
+
+    def remove_stage(self, name):
+        self.stages = [(stage_name, callback) for stage_name, callback in self.stages if stage_name != name]
+        self._sync_subscription()
+
+    def has_stage(self, name):
+        return any(stage_name == name for stage_name, _ in self.stages)
+
+    def activate_preview(self, flat_objects):
+        """Start preview health-checks for the given objects on every change event"""
+        if self.preview_system is None:
+            return False
+        self.preview_system.setup_auto_preview_monitoring(flat_objects)
+        self._sync_subscription()
+        return True
+
+    def deactivate_preview(self):
+        if self.preview_system is not None:
+            self.preview_system.auto_preview_active = False
+        self._sync_subscription()
+
+    @property
+    def preview_active(self):
+        return bool(self.preview_system and self.preview_system.auto_preview_active)
+
+    @staticmethod
+    def _monitor_key(name):
+        return f"{MONITOR_KEY}:{name}"
+
+    def _unsubscribe_all(self):
+        monitor = get_canvas_monitor()
+        for name in self.canvases:
+            monitor.unsubscribe(self._monitor_key(name))
+
+    def _sync_subscription(self):
+        """Subscribe only while bound and there is at least one stage or an active preview"""
+        monitor = get_canvas_monitor()
+        wanted = bool(self.canvases) and bool(self.stages or self.preview_active)
+        for name, canvas in self.canvases.items():
+            key = self._monitor_key(name)
+            if wanted and not monitor.is_subscribed(key):
+                monitor.subscribe(key, canvas, self._on_canvas_changed)
+            elif not wanted and monitor.is_subscribed(key):
+                monitor.unsubscribe(key)
+
+    def _on_canvas_changed(self, canvas, changed_tiles):
+        """Canvas monitor callback - run every stage, then the preview updater"""
+        if self.processing:
+            return True  # Re-entrant event while a stage is writing
+        if canvas.name not in self.canvases:
+            return False
+
+        buffer = get_canvas_buffer(canvas)
+        tracker = get_change_tracker(canvas)
+        self.processing = True
+        try:
+            for name, callback in list(self.stages):
+                try:
+                    if callback(canvas, changed_tiles):
+                        # Stage wrote to the canvas - not a new stroke
+                        tracker.update(buffer.pixels)
+                except Exception as e:
+                    print(f"⚠️ Pipeline stage '{name}' error (non-critical): {e}")
+
+            if self.preview_active:
+                try:
+                    self.preview_system.monitor_canvas_changes(self.canvas_objects.get(canvas.name))
+                except Exception as e:
+                    print(f"⚠️ Preview update error (non-critical): {e}")
+        finally:
+            self.processing = False
+
+        return bool(self.stages) or self.preview_active
+
+    def release(self):
+        """Drop the canvas binding and all stages"""
+        self._unsubscribe_all()
+        self.stages = []
+        self.canvas = None
+        self.canvases = {}
+        self.canvas_objects = {}
+        self.tracker = None
+
+
+# Global pipeline instance - created by register_pipeline() at add-on registration
+_pipeline = None
+
+def register_pipeline(preview_system=None):
+    """Create the add-on's single pipeline (called once from register())"""
+    global _pipeline
+    if _pipeline is not None:
+        _pipeline.release()
+    _pipeline = CanvasPipeline(preview_system)
+    return _pipeline
+
+def get_pipeline():
+    """Get the add-on's pipeline (created on demand when running outside register())"""
+    global _pipeline
+    if _pipeline is None:
+        _pipeline = CanvasPipeline()
+    return _pipeline
+
+def unregister_pipeline():
+    """Release the pipeline at add-on unregistration"""
+    global _pipeline
+    if _pipeline is not None:
+        _pipeline.release()
+        _pipeline = None
@@ -0,0 +1,245 @@
+"""
+O'Neill Terrain Generator - Tiled Virtual Canvas (UDIM-style)
+One tile image per group of flat objects, addressed like UDIM tiles 1001, 1002, ...
+Biome, preview and wrap stages touch only the tiles being painted
+Tile buffers are created when a tile is first painted and freed once it goes idle
+"""
+
+import time
+
+import bpy
+
+try:
+    from .canvas_buffer import CANVAS_NAME, has_canvas_buffer, release_canvas_buffer
+    from .canvas_change_tracker import get_change_tracker
+    from .canvas_monitor import get_canvas_monitor
+    from .biome_map import get_biome_map, release_biome_map
+    from .uv_layout import get_uv_layout_engine
+except ImportError:
+    from canvas_buffer import CANVAS_NAME, has_canvas_buffer, release_canvas_buffer
+    from canvas_change_tracker import get_change_tracker
+    from canvas_monitor import get_canvas_monitor
+    from biome_map import get_biome_map, release_biome_map
+    from uv_layout import get_uv_layout_engine
+
+UDIM_BASE = 1001
+BIOME_STAGE = "tile_biomes"
+TILE_IDLE_SECONDS = 10.0  # A tile keeps its buffers this long after it stops being a paint target
+
+
+def paint_targets():
+    """Names of the images that can be painted right now
+
+    Image painting needs the image open in an Image Editor or set as the
+    texture-paint canvas; no other tile can receive a stroke.
+    """
+    names = set()
+    window_manager = bpy.context.window_manager
+    for window in (window_manager.windows if window_manager else ()):
+        for area in window.screen.areas:
+            if area.type == 'IMAGE_EDITOR' and area.spaces.active.image is not None:
+                names.add(area.spaces.active.image.name)
+
+    scene = bpy.context.scene
+    canvas = scene.tool_settings.image_paint.canvas if scene else None
+    if canvas is not None:
+        names.add(canvas.name)
+    return names
+
+
+class TiledCanvas:
+    """UDIM-style canvas made of separate tile images sharing one UV address space
+
+    Tile t holds objects [t * per_tile, (t + 1) * per_tile) left to right and covers
+    U in [t, t + 1) - the same convention as UDIM tiles 1001 + t. Each tile image
+    has its own shared buffer, change tracker and biome map (all keyed by image
+    name), so only tiles that are actually painted ever get read or processed.
+    The canvas pipeline subscribes per tile image (bind_pipeline).
+
+    Buffers are resident only for paint targets and tiles left less than
+    TILE_IDLE_SECONDS ago, at most plan.resident_tiles of them (least recently
+    painted evicted first) - the set the planner's memory budget is sized for.
+    A released tile keeps its tracker digests, so strokes made while it was
+    not resident are still reported when it is read again.
+    """
+
+    def __init__(self, plan, base_name=CANVAS_NAME):
+        self.plan = plan
+        self.base_name = base_name
+        self.objects_per_tile = plan.objects_per_tile
+        self.tile_count = plan.tile_count
+        self.flat_objects = []
+        self.biomes = {}  # object name -> dominant biome of its strip, per painted tile
+        self.max_resident = max(1, plan.resident_tiles)
+        self.last_active = {}  # tile image name -> time.monotonic() it was last a paint target
+
+    def tile_number(self, tile_index):
+        return UDIM_BASE + tile_index
+
+    def tile_name(self, tile_index):
+        return f"{self.base_name}.{self.tile_number(tile_index)}"
+
+    def tile_of_object(self, object_index):
+        """(tile_index, slot_in_tile) for the object_index-th flat object (by X)"""
+        return divmod(object_index, self.objects_per_tile)
+
+    def objects_in_tile(self, flat_objects, tile_index):
+        """Flat objects (sorted by X) that live in a tile"""
+        sorted_objects = sorted(flat_objects, key=lambda obj: obj.location.x)
+        start = tile_index * self.objects_per_tile
+        return sorted_objects[start:start + self.objects_per_tile]
+
+    def tile_image(self, tile_index):
+        return bpy.data.images.get(self.tile_name(tile_index))
+
+    def tile_images(self):
+        """Existing tile images in tile order (missing tiles skipped)"""
+        images = (self.tile_image(index) for index in range(self.tile_count))
+        return [image for image in images if image is not None]
+
+    def ensure_tiles(self):
+        """Create (or recreate at the planned size) every tile image"""
+        width, height = self.plan.tile_width, self.plan.height
+        images = []
+        for tile_index in range(self.tile_count):
+            name = self.tile_name(tile_index)
+            image = bpy.data.images.get(name)
+            if image and (image.size[0] != width or image.size[1] != height):
+                bpy.data.images.remove(image)
+                image = None
+            if image is None:
+                image = bpy.data.images.new(name, width=width, height=height, alpha=False)
+            images.append(image)
+
+        print(f"✅ Tiled canvas: {self.tile_count} tiles of {width}x{height} "
+              f"({self.objects_per_tile} objects per tile)")
+        return images
+
+    def remove_tiles(self):
+        for image in self.tile_images():
+            self.release_tile(image)
+            bpy.data.images.remove(image)
+        self.biomes.clear()
+
+    # -------------------- residency --------------------
+
+    def is_resident(self, image):
+        return image is not None and image.name in self.last_active
+
+    def should_read(self, image):
+        """Canvas monitor read gate - may this dirty tile be read (and keep its buffers)?
+
+        Images that are not tiles of this canvas are always read.
+        """
+        if self.tile_index_of(image) is None:
+            return True
+
+        now = time.monotonic()
+        targets = paint_targets()
+        for name in targets:
+            if name in self.last_active or self.tile_index_of_name(name) is not None:
+                self.last_active[name] = now
+        self.evict(now)
+        return image.name in self.last_active
+
+    def evict(self, now=None):
+        """Release idle tiles, then the least recently painted beyond max_resident"""
+        now = time.monotonic() if now is None else now
+        for name, last in list(self.last_active.items()):
+            if now - last > TILE_IDLE_SECONDS:
+                self.release_tile(bpy.data.images.get(name), name)
+
+        by_age = sorted(self.last_active, key=self.last_active.get, reverse=True)
+        for name in by_age[self.max_resident:]:
+            self.release_tile(bpy.data.images.get(name), name)
+
+    def release_tile(self, image, name=None):
+        """Free a tile's buffer, tracker scratch and labels - its digests are kept"""
+        self.last_active.pop(name or image.name, None)
+        if image is None:
+            return
+        release_canvas_buffer(image)
+        get_change_tracker(image).compact()
+        release_biome_map(image)
+
+    def settle(self, image):
+        """Release a tile that was read for a one-off pass but is not resident"""
+        if image is not None and not self.is_resident(image) and has_canvas_buffer(image):
+            self.release_tile(image)
+
+    def layout_uvs(self, flat_objects, normalize=True):
+        """Place each object's UVs in its slot of its tile, offset by the tile index in U"""
+        return get_uv_layout_engine().apply_tiled_layout(flat_objects, self.objects_per_tile, normalize)
+
+    def tile_index_of(self, image):
+        """Tile index of one of this canvas's tile images, or None for any other image"""
+        return self.tile_index_of_name(image.name)
+
+    def tile_index_of_name(self, name):
+        prefix = f"{self.base_name}."
+        if not name.startswith(prefix) or not name[len(prefix):].isdigit():
+            return None
+        tile_index = int(name[len(prefix):]) - UDIM_BASE
+        return tile_index if 0 <= tile_index < self.tile_count else None
+
+    def objects_by_tile_image(self, flat_objects):
+        """{tile image name: flat objects on that tile} - what a change to each tile can affect"""
+        return {self.tile_name(tile_index): self.objects_in_tile(flat_objects, tile_index)
+                for tile_index in range(self.tile_count)}
+
+    def bind_pipeline(self, pipeline, flat_objects):
+        """Subscribe the pipeline to every tile image and add the per-tile biome stage
+
+        The canvas monitor reads only dirty tile images that pass should_read,
+        so wrap, biome and preview stages run for the painted tile alone, with
+        its own buffer.
+        """
+        self.flat_objects = sorted(flat_objects, key=lambda obj: obj.location.x)
+        pipeline.bind_tiles(self.tile_images(), self.objects_by_tile_image(self.flat_objects))
+        pipeline.add_stage(BIOME_STAGE, self.biome_stage)
+
+    def biome_stage(self, image, changed_tiles):
+        """Pipeline stage - refresh the painted tile's labels and its objects' dominant biomes"""
+        tile_index = self.tile_index_of(image)
+        if tile_index is not None:
+            self.biomes.update(self.dominant_biomes([tile_index]))
+        return False  # Reads the canvas only
+
+    def dominant_biomes(self, tile_indices=None):
+        """{object name: biome} for the given tiles (default: every existing tile)
+
+        Tiles that are not resident are read one at a time and released again.
+        """
+        if tile_indices is None:
+            tile_indices = range(self.tile_count)
+
+        biomes = {}
+        for tile_index in tile_indices:
+            image = self.tile_image(tile_index)
+            objects = self.objects_in_tile(self.flat_objects, tile_index)
+            if image is None or not objects:
+                continue
+            biome_map = get_biome_map(image)
+            biome_map.refresh(image)
+            for obj, biome in zip(objects, biome_map.dominant_biomes(self.objects_per_tile)):
+                biomes[obj.name] = biome
+            self.settle(image)
+        return biomes
+
+
+# Global tiled canvas for integration (None while painting a single canvas)
+_tiled_canvas = None
+
+def get_tiled_canvas():
+    """Get the active tiled canvas, or None in single-image mode"""
+    return _tiled_canvas
+
+def set_tiled_canvas(tiled_canvas):
+    """Install (or clear with None) the active tiled canvas and its monitor read gate"""
+    global _tiled_canvas
+    if _tiled_canvas is not None and _tiled_canvas is not tiled_canvas:
+        for name in list(_tiled_canvas.last_active):
+            _tiled_canvas.release_tile(bpy.data.images.get(name), name)
+    _tiled_canvas = tiled_canvas
+    get_canvas_monitor().read_gate = tiled_canvas.should_read if tiled_canvas else None
+    return tiled_canvas
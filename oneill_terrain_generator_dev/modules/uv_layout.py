@@ -0,0 +1,137 @@
+"""
+O'Neill Terrain Generator - Bulk UV Layout Engine
+Places each flat object's UV strip into its [i/N, (i+1)/N] slot of the unified canvas
+Reads and writes every loop UV at once with foreach_get/foreach_set and NumPy
+"""
+
+import numpy as np
+
+UV_LAYER_NAME = "UVMap"
+
+
+class UVLayoutEngine:
+    """Single UV remapping kernel shared by every UV-fix path"""
+
+    def __init__(self, uv_layer_name=UV_LAYER_NAME):
+        self.uv_layer_name = uv_layer_name
+
+    def read_uvs(self, mesh):
+        """Return all loop UVs as an (N, 2) float32 array, or None if the layer is missing"""
+        if not mesh.uv_layers:
+            return None
+
+        uv_layer = mesh.uv_layers[self.uv_layer_name]
+        uvs = np.empty(len(uv_layer.data) * 2, dtype=np.float32)
+        uv_layer.data.foreach_get('uv', uvs)
+        return uvs.reshape(-1, 2)
+
+    def write_uvs(self, mesh, uvs):
+        """Write an (N, 2) array back to the UV layer in one call"""
+        uv_layer = mesh.uv_layers[self.uv_layer_name]
+        uv_layer.data.foreach_set('uv', np.ascontiguousarray(uvs, dtype=np.float32).ravel())
+        mesh.update()
+
+    def slot_bounds(self, slot_index, slot_count):
+        """U range (u_start, u_end) of a slot - each object gets exactly 1/slot_count of the width"""
+        return slot_index / slot_count, (slot_index + 1) / slot_count
+
+    def compute_strip_layout(self, uvs, slot_index, slot_count, normalize=True):
+        """Map local UVs into a canvas slot - returns a new (N, 2) array
+
+        With normalize=True the current U/V range is stretched to 0-1 first
+        (a degenerate range maps to 0.0); otherwise UVs are assumed to be 0-1 already.
+        V always spans the full 0.0-1.0 canvas height (no tiling padding).
+        """
+        u_start, u_end = self.slot_bounds(slot_index, slot_count)
+        local = uvs.astype(np.float64)
+
+        if normalize and len(local):
+            minimum = local.min(axis=0)
+            extent = local.max(axis=0) - minimum
+            safe_extent = np.where(extent > 0, extent, 1.0)
+            local = np.where(extent > 0, (local - minimum) / safe_extent, 0.0)
+
+        result = np.empty_like(local)
+        result[:, 0] = u_start + local[:, 0] * (u_end - u_start)
+        result[:, 1] = local[:, 1]
+        return result.astype(np.float32)
+
+    def layout_object(self, obj, slot_index, slot_count, normalize=True):
+        """Remap one object's UVs into its canvas slot - returns True on success"""
+        uvs = self.read_uvs(obj.data)
+        if uvs is None:
+            print(f"⚠️ No UV layer found on {obj.name}")
+            return False
+
+        self.write_uvs(obj.data, self.compute_strip_layout(uvs, slot_index, slot_count, normalize))
+        return True
+
+    def apply_canvas_layout(self, flat_objects, normalize=True, verbose=True):
+        """Lay out all flat objects left-to-right (by X position) across the canvas
+
+        Returns the number of objects remapped.
+        """
+        # Sort objects by X position to match the unified canvas layout
+        sorted_objects = sorted(flat_objects, key=lambda obj: obj.location.x)
+        total_objects = len(sorted_objects)
+        remapped = 0
+
+        for i, obj in enumerate(sorted_objects):
+            try:
+                if verbose:
+                    u_start, u_end = self.slot_bounds(i, total_objects)
+                    print(f"  Object {i+1} ({obj.name}): U=[{u_start:.6f}, {u_end:.6f}]")
+
+                if self.layout_object(obj, i, total_objects, normalize):
+                    remapped += 1
+                    if verbose:
+                        print(f"✅ Fixed UV mapping for {obj.name} (portion {i+1}/{total_objects})")
+
+            except Exception as e:
+                print(f"❌ Failed to fix UV mapping for {obj.name}: {e}")
+
+        return remapped
+
+    def apply_tiled_layout(self, flat_objects, objects_per_tile, normalize=True, verbose=True):
+        """Lay out flat objects across UDIM-style tiles of objects_per_tile slots each
+
+        Object i goes to slot i % objects_per_tile of tile i // objects_per_tile and
+        its U is shifted by the tile index, so tile t covers U in [t, t + 1).
+        Returns the number of objects remapped.
+        """
+        sorted_objects = sorted(flat_objects, key=lambda obj: obj.location.x)
+        remapped = 0
+
+        for i, obj in enumerate(sorted_objects):
+            tile_index, slot = divmod(i, objects_per_tile)
+            try:
+                uvs = self.read_uvs(obj.data)
+                if uvs is None:
+                    print(f"⚠️ No UV layer found on {obj.name}")
+                    continue
+
+                layout = self.compute_strip_layout(uvs, slot, objects_per_tile, normalize)
+                layout[:, 0] += tile_index
+                self.write_uvs(obj.data, layout)
+                remapped += 1
+
+                if verbose:
+                    u_start, u_end = self.slot_bounds(slot, objects_per_tile)
+                    print(f"  Object {i+1} ({obj.name}): tile {1001 + tile_index}, "
+                          f"U=[{tile_index + u_start:.6f}, {tile_index + u_end:.6f}]")
+
+            except Exception as e:
+                print(f"❌ Failed to fix UV mapping for {obj.name}: {e}")
+
+        return remapped
+
+
+# Global engine instance for integration
+_uv_layout_engine = None
+
+def get_uv_layout_engine():
+    """Get global UV layout engine instance"""
+    global _uv_layout_engine
+    if _uv_layout_engine is None:
+        _uv_layout_engine = UVLayoutEngine()
+    return _uv_layout_engine
@@ -0,0 +1,94 @@
+"""
+O'Neill Terrain Generator - Vectorised Y-Wrap Engine
+Top/bottom boundary-band wrapping as masked NumPy operations over whole row bands
+Works in place on the shared (H, W, 4) canvas buffer at full resolution
+"""
+
+import numpy as np
+
+try:
+    from .canvas_buffer import PAINT_THRESHOLD
+except ImportError:
+    from canvas_buffer import PAINT_THRESHOLD
+
+
+class YWrapEngine:
+    """Copies painted pixels across the cylinder seam without per-pixel Python loops
+
+    Two wrapping styles are supported, matching the stroke wrapper:
+    - wrap_zones(): bottom tiling zone <-> top rows (y -> y - main_height and back)
+    - mirror_boundaries(): row y <-> row height-1-y for a band at each edge
+    Both only write into unpainted target pixels, so existing paint is never overwritten.
+    """
+
+    def __init__(self, overlap_ratio=0.05, paint_threshold=PAINT_THRESHOLD):
+        self.overlap_ratio = overlap_ratio  # Same 5% overlap as the UV mapping
+        self.paint_threshold = paint_threshold
+
+    def zone_rows(self, height):
+        """Return (main_height, wrap_zone_height) for a canvas height"""
+        main_height = int(height / (1.0 + self.overlap_ratio))
+        return main_height, height - main_height
+
+    def painted(self, pixels):
+        """Boolean mask of non-black pixels for any (..., 4) array"""
+        return (pixels[..., :3] > self.paint_threshold).any(axis=-1)
+
+    def copy_band(self, pixels, source_rows, target_rows, source_mask=None):
+        """Copy painted source pixels into unpainted target pixels - returns pixel count
+
+        source_rows/target_rows are row slices of equal length; source_mask is an
+        optional (H, W) mask restricting which source pixels may be copied.
+        """
+        source = pixels[source_rows]
+        target = pixels[target_rows]  # Basic slice - writes land in pixels
+
+        write = self.painted(source) & ~self.painted(target)
+        if source_mask is not None:
+            write &= source_mask[source_rows]
+
+        count = int(np.count_nonzero(write))
+        if count:
+            target[write] = source[write]
+        return count
+
+    def wrap_zones(self, pixels, source_mask=None):
+        """Bottom tiling zone -> top rows, then top rows -> bottom tiling zone"""
+        height = pixels.shape[0]
+        main_height, wrap_zone_height = self.zone_rows(height)
+        if wrap_zone_height <= 0:
+            return 0
+
+        top = slice(0, wrap_zone_height)
+        bottom = slice(main_height, main_height + wrap_zone_height)
+
+        wrapped = self.copy_band(pixels, bottom, top, source_mask)
+        wrapped += self.copy_band(pixels, top, bottom, source_mask)
+        return wrapped
+
+    def mirror_boundaries(self, pixels, rows, source_mask=None):
+        """Mirror a band of rows across the seam: y -> height-1-y in both directions"""
+        height = pixels.shape[0]
+        rows = min(rows, height // 2)  # Bands must not overlap
+        if rows <= 0:
+            return 0
+
+        top = slice(0, rows)
+        mirrored = slice(height - 1, height - 1 - rows, -1)  # Row height-1-y for y in top
+
+        # Phase 1: top boundary strokes wrap to the bottom
+        wrapped = self.copy_band(pixels, top, mirrored, source_mask)
+        # Phase 2: bottom boundary strokes wrap to the top
+        wrapped += self.copy_band(pixels, mirrored, top, source_mask)
+        return wrapped
+
+
+# Global engine instance for integration
+_y_wrap_engine = None
+
+def get_y_wrap_engine():
+    """Get global Y-wrap engine instance"""
+    global _y_wrap_engine
+    if _y_wrap_engine is None:
+        _y_wrap_engine = YWrapEngine()
+    return _y_wrap_engine
@@ -16,7 +16,11 @@ def create_session_42_working_node_group():
     
     # Create new geometry node group
     node_group = bpy.data.node_groups.new(node_group_name, 'GeometryNodeTree')
-    
+
+    # New node groups start without sockets - Group Input/Output need a Geometry socket
+    node_group.interface.new_socket('Geometry', in_out='INPUT', socket_type='NodeSocketGeometry')
+    node_group.interface.new_socket('Geometry', in_out='OUTPUT', socket_type='NodeSocketGeometry')
+
     # Create nodes in exact order from SESSION 42
     group_input = node_group.nodes.new('NodeGroupInput')
     group_input.name = "Group Input"